@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Query
+from pydantic import BaseModel, Field
+
+from api.milvus import fetch_collections_info
+from core.clusters import (ClusterProfile, ClusterRegistry, InventoryScraper, DEFAULT_SCRAPE_TIMEOUT,
+                           DEFAULT_SNAPSHOT_MAX_AGE)
+from core.pool import pool
+
+router = APIRouter(prefix="/api/milvus")
+
+registry = ClusterRegistry()
+
+
+def scrape_cluster(profile: ClusterProfile) -> List[Dict]:
+    password, token = profile.credentials()
+    with pool.client(profile.host, profile.port, profile.user, password, token) as client:
+        names = client.list_collections()
+        infos = fetch_collections_info(client, profile.host, profile.port, names, executor=scraper.fetch_executor)
+        return [info.model_dump() for info in infos]
+
+
+scraper = InventoryScraper(scrape_cluster)
+
+
+class ClusterProfileRequest(BaseModel):
+    name: str
+    host: str
+    port: int = 19530
+    user: str = ""
+    password: str = ""
+    token: str = ""
+    tags: List[str] = []
+    password_env: str = Field("", description="Environment variable holding the password (not stored)")
+    token_env: str = Field("", description="Environment variable holding the token (not stored)")
+
+
+@router.get("/clusters")
+def list_clusters(tag: Optional[str] = Query(None)):
+    return {"status": "success", "clusters": [p.to_dict() for p in registry.list(tag=tag)]}
+
+
+@router.post("/clusters")
+def add_cluster(request: ClusterProfileRequest):
+    try:
+        registry.add(ClusterProfile(**request.model_dump()))
+        scraper.forget(request.name)
+        return {"status": "success", "message": f"Cluster '{request.name}' saved."}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+@router.delete("/clusters/{name}")
+def remove_cluster(name: str):
+    if registry.remove(name) is None:
+        return {"status": "error", "message": f"Cluster '{name}' not found"}
+    scraper.forget(name)
+    return {"status": "success", "message": f"Cluster '{name}' removed."}
+
+
+class ClusterInventory(BaseModel):
+    name: str
+    host: str
+    port: int
+    status: str
+    error: str = ""
+    age_s: Optional[float] = None
+    elapsed_ms: Optional[float] = None
+    collections: int = 0
+    entity_count: int = 0
+    loaded: int = 0
+
+
+class InventoryRow(BaseModel):
+    cluster: str
+    name: str
+    description: str
+    loaded: int
+    entity_count: int
+    index_type: str
+
+
+class InventoryResponse(BaseModel):
+    status: str
+    partial: bool = False
+    clusters: List[ClusterInventory] = []
+    collections: List[InventoryRow] = []
+    message: str = ""
+
+
+@router.get("/inventory", response_model=InventoryResponse)
+def inventory(
+    clusters: Optional[List[str]] = Query(None, description="Cluster names (default: all registered)"),
+    tag: Optional[str] = Query(None),
+    timeout: float = Query(DEFAULT_SCRAPE_TIMEOUT, gt=0, le=120, description="Seconds to wait for each scrape"),
+    max_age: float = Query(DEFAULT_SNAPSHOT_MAX_AGE, ge=0, description="Reuse snapshots younger than this"),
+):
+    """Collections of every registered cluster in one table, scraped in parallel.
+
+    Clusters that fail or time out are reported per cluster with their last snapshot (if any)
+    instead of failing the whole request.
+    """
+    profiles = registry.list(names=clusters, tag=tag)
+    if not profiles:
+        return InventoryResponse(status="error", message="No matching clusters registered")
+
+    results = scraper.collect(profiles, timeout=timeout, max_age=max_age)
+    summaries, rows = [], []
+    for p in profiles:
+        r = results[p.name]
+        summaries.append(ClusterInventory(
+            name=p.name,
+            host=p.host,
+            port=p.port,
+            status=r["status"],
+            error=r["error"],
+            age_s=r["age_s"],
+            elapsed_ms=r["elapsed_ms"],
+            collections=len(r["rows"]),
+            entity_count=sum(max(0, row["entity_count"]) for row in r["rows"]),
+            loaded=sum(1 for row in r["rows"] if row["loaded"] == 3)
+        ))
+        rows += [InventoryRow(cluster=p.name, **row) for row in r["rows"]]
+
+    rows.sort(key=lambda row: (row.cluster, row.name))
+    return InventoryResponse(
+        status="success",
+        partial=any(s.status in ("error", "timeout") for s in summaries),
+        clusters=summaries,
+        collections=rows
+    )
@@ -0,0 +1,53 @@
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+
+from core.jobs import job_manager
+
+router = APIRouter(prefix="/api/milvus")
+
+SSE_KEEPALIVE_SECONDS = 15
+
+
+@router.get("/jobs")
+def list_jobs(
+    state: Optional[str] = Query(None),
+    kind: Optional[str] = Query(None)
+):
+    return {
+        "status": "success",
+        "stats": job_manager.stats(),
+        "jobs": [job.to_dict() for job in job_manager.list(state=state, kind=kind)]
+    }
+
+
+@router.get("/jobs/stream")
+async def stream_jobs(request: Request):
+    """Server-Sent Events feed of job state changes (`job` events carrying the full job)."""
+    queue = job_manager.subscribe()
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: job\ndata: {json.dumps(event)}\n\n"
+        finally:
+            job_manager.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        return {"status": "error", "message": f"Job '{job_id}' not found"}
+    return {"status": "success", "job": job.to_dict()}
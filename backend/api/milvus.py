@@ -1,14 +1,58 @@
+import asyncio
+import fnmatch
 import json
-import traceback
-from contextlib import contextmanager
+import os
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 
-from fastapi import APIRouter, Query, Body
-from pydantic import BaseModel
-from pymilvus import connections, utility, MilvusClient, Collection, DataType, FieldSchema, CollectionSchema
+from fastapi import APIRouter, Query, Body, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from pymilvus import utility, MilvusClient, Collection, DataType, FieldSchema, CollectionSchema
 from pymilvus.exceptions import MilvusException
 
+from core.cache import metadata_cache
+from core.jobs import Job, job_manager
+from core.listing import filter_names, paginate, parse_sort, sort_names
+from core.log import fields, get_logger, propagate, span
+from core.poller import CollectionSnapshotPoller
+from core.pkrange import DEFAULT_MAX_QUERIES, QUERY_WINDOW, find_extreme_pk
+from core.pool import pool, alias_of, compaction_plans
+from core.ratelimit import RateLimiter
+from core.scheduler import CANCELLED, CompactionScheduler
+from core.segments import recommend_compaction, segment_to_dict, summarize_segments
+
 router = APIRouter(prefix="/api/milvus")
+logger = get_logger("milvus")
+
+DEFAULT_FETCH_CONCURRENCY = int(os.getenv("MILVUS_FETCH_CONCURRENCY", "16"))
+MAX_FETCH_CONCURRENCY = 64
+
+# Metadata cache TTLs (seconds). Index info gets a shorter TTL since indexes are often
+# created from outside the panel.
+DESCRIBE_TTL = 300
+INDEX_TTL = 60
+FIELDS_TTL = 600
+# Collection rows used to sort /collections on entity_count, loaded, etc.; the page itself is always fetched fresh
+SORT_KEY_TTL = float(os.getenv("MILVUS_SORT_KEY_TTL", "30"))
+MAX_PAGE_SIZE = 1000
+
+SSE_KEEPALIVE_SECONDS = 15
+
+JOB_POLL_INTERVAL = 2
+# Load/compaction jobs fail once they have waited this long (seconds)
+JOB_TIMEOUT = float(os.getenv("MILVUS_JOB_TIMEOUT", "3600"))
+# Compaction state is polled with exponential backoff between these bounds (seconds)
+COMPACTION_POLL_MIN = 1
+COMPACTION_POLL_MAX = 30
+
+# pymilvus LoadState values
+LOAD_STATE_NOT_EXIST = 0
+LOAD_STATE_NOT_LOADED = 1
+LOAD_STATE_LOADING = 2
+LOAD_STATE_LOADED = 3
 
 class PingResponse(BaseModel):
     status: str
@@ -21,12 +65,9 @@ def ping_milvus(
     host: str = Query("localhost"),
     port: int = Query(19530)
 ):
-    print(f"Ping Milvus - Host: {host}; Port: {port}")
+    logger.debug("ping", extra=fields(host=host, port=port))
     try:
-        # Create a temporary connection
-        connections.connect(alias="ping-check", host=host, port=port)
-        healthy = connections.has_connection("ping-check")
-        connections.disconnect("ping-check")
+        healthy = pool.ping(host, port)
 
         return PingResponse(
             status="success" if healthy else "failure",
@@ -52,6 +93,11 @@ def ping_milvus(
         )
 
 
+@router.get("/cache/stats")
+def cache_stats():
+    return {"status": "success", "cache": metadata_cache.stats()}
+
+
 class CollectionInfo(BaseModel):
     name: str
     description: str
@@ -62,18 +108,50 @@ class CollectionInfo(BaseModel):
 class CollectionResponse(BaseModel):
     status: str
     collections: List[CollectionInfo]
+    total: Optional[int] = None
+    offset: int = 0
+    limit: Optional[int] = None
+    next_cursor: Optional[str] = None
+    message: str = ""
+
+
+def cache_key(host: str, port, kind: str, name: str, *extra) -> tuple:
+    return (host, int(port), kind, name, *extra)
 
 
-def build_milvus_client(host: str, port: int) -> MilvusClient:
-    return MilvusClient(uri=f"http://{host}:{port}")
+def cached_describe_collection(client: MilvusClient, host: str, port, name: str) -> Dict:
+    return metadata_cache.get_or_fetch(
+        cache_key(host, port, "describe", name),
+        lambda: client.describe_collection(collection_name=name),
+        ttl=DESCRIBE_TTL
+    )
+
+
+def cached_describe_index(client: MilvusClient, host: str, port, name: str, index_name: str = "embedding") -> Dict:
+    return metadata_cache.get_or_fetch(
+        cache_key(host, port, "index", name, index_name),
+        lambda: client.describe_index(collection_name=name, index_name=index_name),
+        ttl=INDEX_TTL
+    )
+
 
+def invalidate_collection(host: str, port, *names: str):
+    for name in names:
+        metadata_cache.invalidate(host, port, name)
+    # Let stream subscribers see the change without waiting for the next poll
+    poller.request_refresh(host, port)
 
-def fetch_collection_info(client: MilvusClient, name: str) -> CollectionInfo:
+
+def fetch_collection_info(client: MilvusClient, host: str, port: int, name: str) -> CollectionInfo:
+    with span("fetch_collection_info", collection=name):
+        return _fetch_collection_info(client, host, port, name)
+
+
+def _fetch_collection_info(client: MilvusClient, host: str, port: int, name: str) -> CollectionInfo:
     entity_count = client.get_collection_stats(collection_name=name).get('row_count', -1)
-    c_desc = client.describe_collection(collection_name=name)
+    c_desc = cached_describe_collection(client, host, port, name)
     loaded = int(client.get_load_state(collection_name=name)["state"])
-    print(f"===> Collection Loading State: {loaded}")
-    i_desc = client.describe_index(collection_name=name, index_name="embedding")
+    i_desc = cached_describe_index(client, host, port, name)
     return CollectionInfo(
         name=name,
         description=c_desc.get("description", ""),
@@ -83,121 +161,368 @@ def fetch_collection_info(client: MilvusClient, name: str) -> CollectionInfo:
     )
 
 
-@contextmanager
-def milvus_connection(alias: str, host: str, port: int):
+def try_fetch_collection_info(client: MilvusClient, host: str, port: int, name: str) -> Optional[CollectionInfo]:
+    try:
+        return fetch_collection_info(client, host, port, name)
+    except Exception as e:
+        logger.warning("failed to fetch collection info", exc_info=True, extra=fields(collection=name))
+        return None
+
+
+def fetch_collections_info(client: MilvusClient, host: str, port: int, names: List[str],
+                           concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+                           executor: Optional[Executor] = None) -> List[CollectionInfo]:
+    """Fetch info for many collections in parallel; collections that fail are left out.
+
+    Runs on `executor` when given (shared by many callers), else on `concurrency` threads of its own.
+    """
+    if not names:
+        return []
+    fetch = propagate(lambda name: try_fetch_collection_info(client, host, port, name))
+    if executor is not None:
+        return [info for info in executor.map(fetch, names) if info is not None]
+    workers = max(1, min(concurrency, len(names)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="collection-info") as own:
+        return [info for info in own.map(fetch, names) if info is not None]
+
+
+def cached_collection_info(client: MilvusClient, host: str, port: int, name: str) -> Optional[CollectionInfo]:
     try:
-        connections.connect(alias=alias, host=host, port=port)
-        yield
-    finally:
-        connections.disconnect(alias)
+        return metadata_cache.get_or_fetch(
+            cache_key(host, port, "info", name),
+            lambda: fetch_collection_info(client, host, port, name),
+            ttl=SORT_KEY_TTL
+        )
+    except Exception:
+        logger.warning("failed to fetch collection info", exc_info=True, extra=fields(collection=name))
+        return None
+
+
+def collection_sort_values(client: MilvusClient, host: str, port: int, names: List[str], field: str,
+                           concurrency: int) -> Dict[str, object]:
+    """`field` of every collection from the short-lived info cache; None where the fetch failed."""
+    if not names:
+        return {}
+    workers = max(1, min(concurrency, len(names)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="collection-info") as executor:
+        infos = executor.map(propagate(lambda name: cached_collection_info(client, host, port, name)), names)
+        return {name: getattr(info, field) if info is not None else None for name, info in zip(names, infos)}
 
 
 @router.get("/collections", response_model=CollectionResponse)
 def list_collections(
     host: str = Query("localhost"),
     port: int = Query(19530),
-    alias: str = Query("default")
+    concurrency: int = Query(DEFAULT_FETCH_CONCURRENCY, ge=1, le=MAX_FETCH_CONCURRENCY),
+    prefix: Optional[str] = Query(None, description="Only names starting with this"),
+    regex: Optional[str] = Query(None, description="Only names matching this regular expression"),
+    sort: str = Query("name", description="name, description, index_type, entity_count or loaded; '-' for descending"),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (default: everything)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page")
 ):
+    """Collections with full info, filtered, sorted and paginated on the server.
+
+    Filtering and sorting by name only need the collection list; other sort keys come from
+    briefly cached collection rows. Details are fetched for the returned page only.
+    """
     try:
-        client = build_milvus_client(host, port)
-        with milvus_connection(alias, host, port):
-            names = client.list_collections()
-            collections = []
+        field, descending = parse_sort(sort)
+        with pool.client(host, port) as client:
+            names = filter_names(client.list_collections(), prefix=prefix, regex=regex)
+            values = {}
+            if field != "name":
+                values = collection_sort_values(client, host, port, names, field, concurrency)
+            keys = sort_names(names, field, descending, values.get)
+            page = paginate(keys, descending, offset=offset, limit=limit, cursor=cursor)
+            rows = {info.name: info for info in fetch_collections_info(client, host, port, page["names"],
+                                                                       concurrency)}
+
+        return CollectionResponse(
+            status="success",
+            collections=[rows[n] for n in page["names"] if n in rows],
+            total=len(names),
+            offset=offset,
+            limit=limit,
+            next_cursor=page["next_cursor"]
+        )
+    except ValueError as e:
+        return CollectionResponse(status="error", collections=[], message=str(e))
+    except Exception as e:
+        logger.exception("failed to list collections", extra=fields(host=host, port=port))
+        return CollectionResponse(status="error", collections=[], message=str(e))
+
+
+def fetch_snapshot(host: str, port: int) -> List[Dict]:
+    with pool.client(host, port) as client:
+        names = client.list_collections()
+        return [info.model_dump() for info in fetch_collections_info(client, host, port, names,
+                                                                      DEFAULT_FETCH_CONCURRENCY)]
+
+
+poller = CollectionSnapshotPoller(fetch_snapshot)
 
-            for name in names:
+
+@router.get("/collections/stream")
+async def stream_collections(
+    request: Request,
+    host: str = Query("localhost"),
+    port: int = Query(19530)
+):
+    """Server-Sent Events feed of the collection list.
+
+    The first event is a full `snapshot`; later `diff` events carry added/changed rows and
+    removed names. `error` events report a failed refresh.
+    """
+    queue = poller.subscribe(host, port)
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
                 try:
-                    info = fetch_collection_info(client, name)
-                    collections.append(info)
-                except Exception as e:
-                    print(f"Failed to fetch collection info for {name}: {e}")
-                    traceback.print_exc()
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            poller.unsubscribe(host, port, queue)
 
-        return CollectionResponse(status="success", collections=collections)
-    except Exception as e:
-        traceback.print_exc()
-        return CollectionResponse(status="error", collections=[])
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.get("/collections/stream/stats")
+def stream_stats():
+    return {"status": "success", "poller": poller.stats()}
+
+
+class IndexStatus(BaseModel):
+    index_name: str
+    field: str = ""
+    total_rows: int = 0
+    indexed_rows: int = 0
+    pending_index_rows: int = 0
+    progress: float = 1.0
+    state: str = ""
+    error: str = ""
+
+
+class CollectionIndexingStatus(BaseModel):
+    name: str
+    indexing: bool = False
+    indexes: List[IndexStatus] = []
+    error: str = ""
 
 
 class IndexingResponse(BaseModel):
     status: str = "success"
     indexing: bool = False
     message: str = ""
+    collections: List[CollectionIndexingStatus] = []
+
+
+def probe_index(client: MilvusClient, name: str, ixn: Dict) -> IndexStatus:
+    status = IndexStatus(index_name=ixn["index_name"], field=ixn.get("field", ""))
+    try:
+        progress = utility.index_building_progress(collection_name=name, index_name=ixn["index_name"],
+                                                   using=alias_of(client))
+    except MilvusException as e:
+        # Index may have been dropped since the index list was cached
+        status.error = str(e)
+        return status
+    status.total_rows = progress.get("total_rows", 0)
+    status.indexed_rows = progress.get("indexed_rows", 0)
+    status.pending_index_rows = progress.get("pending_index_rows", 0)
+    status.state = str(progress.get("state", ""))
+    if status.total_rows:
+        status.progress = round(status.indexed_rows / status.total_rows, 4)
+    return status
+
+
+def probe_collection_indexing(client: MilvusClient, host: str, port: int, name: str,
+                              stop: Optional[threading.Event] = None) -> CollectionIndexingStatus:
+    """Build progress of every index of a collection. Stops after the first pending index
+    once `stop` is given (any-mode), and skips work entirely if `stop` is already set."""
+    result = CollectionIndexingStatus(name=name)
+    if stop is not None and stop.is_set():
+        return result
+    try:
+        indexes = cached_indexes(client, host, port, name)
+    except Exception as e:
+        result.error = str(e)
+        return result
+    for ixn in indexes.values():
+        if stop is not None and stop.is_set():
+            break
+        status = probe_index(client, name, ixn)
+        result.indexes.append(status)
+        if status.pending_index_rows:
+            result.indexing = True
+            if stop is not None:
+                stop.set()
+                break
+    return result
 
 
 @router.get("/indexing", response_model=IndexingResponse)
 def is_indexing(
     host: str = Query("localhost"),
     port: int = Query(19530),
-    alias: str = Query("default")
+    full: bool = Query(False, description="Return per-collection and per-index progress instead of "
+                                          "stopping at the first pending index"),
+    concurrency: int = Query(DEFAULT_FETCH_CONCURRENCY, ge=1, le=MAX_FETCH_CONCURRENCY)
 ):
     try:
-        client = build_milvus_client(host, port)
-        with milvus_connection(alias, host, port):
+        with pool.client(host, port) as client:
             names = client.list_collections()
-            collections = []
+            if not names:
+                return IndexingResponse(indexing=False)
 
-            for name in names:
-                coll = Collection(name=name)
-                desc = client.describe_collection(name)
-                indexes = get_indexes(coll)
-                for ixn in indexes.values():
-                    progress = utility.index_building_progress(collection_name=name,
-                                                               index_name=ixn['index_name'])
-                    if progress.get("pending_index_rows"):
-                        return IndexingResponse(indexing=True)
+            stop = None if full else threading.Event()
+            executor = ThreadPoolExecutor(max_workers=min(concurrency, len(names)), thread_name_prefix="indexing")
+            try:
+                futures = [executor.submit(propagate(probe_collection_indexing), client, host, port, name, stop)
+                           for name in names]
+                collections = []
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result.indexing and not full:
+                        return IndexingResponse(indexing=True, collections=[result])
+                    collections.append(result)
+            finally:
+                # Running probes share the leased client: stop them (they check `stop` before every RPC),
+                # drop the ones that haven't started and wait before the lease is returned
+                if stop is not None:
+                    stop.set()
+                executor.shutdown(wait=True, cancel_futures=True)
+
+            collections.sort(key=lambda c: c.name)
+            return IndexingResponse(
+                indexing=any(c.indexing for c in collections),
+                collections=collections if full else []
+            )
     except Exception as e:
-        print(f"Failed to check indexing: {e}")
-        traceback.print_exc()
+        logger.exception("failed to check indexing", extra=fields(host=host, port=port))
         return IndexingResponse(status="error", message=str(e))
-    return IndexingResponse(indexing=False)
+
+
+def wait_until_loaded(client: MilvusClient, name: str, sleep, report=None, timeout: float = JOB_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    polls = 0
+    while True:
+        load_state = client.get_load_state(collection_name=name)
+        state = int(load_state["state"])
+        if state == LOAD_STATE_LOADED:
+            return
+        if state == LOAD_STATE_NOT_EXIST:
+            raise RuntimeError(f"Collection '{name}' does not exist")
+        # The load has been started, so NotLoad afterwards means it was released (or failed)
+        if state == LOAD_STATE_NOT_LOADED and polls:
+            raise RuntimeError(f"Collection '{name}' was released while loading")
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Collection '{name}' not loaded after {timeout:.0f}s")
+        if report:
+            report(progress=load_state.get("progress", 0), load_state=state)
+        polls += 1
+        sleep(JOB_POLL_INTERVAL)
+
+
+def wait_until_compacted(client: MilvusClient, compaction_id: int, sleep, report=None,
+                         timeout: float = JOB_TIMEOUT) -> str:
+    deadline = time.monotonic() + timeout
+    delay = COMPACTION_POLL_MIN
+    polls = 0
+    while True:
+        state = client.get_compaction_state(compaction_id)
+        if report:
+            report(compaction_state=state)
+        if state == "Completed":
+            return state
+        # Milvus reports UndefiedState for unknown or expired compaction ids
+        if state != "Executing" and polls:
+            raise RuntimeError(f"Compaction {compaction_id} is in state {state}")
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Compaction {compaction_id} not completed after {timeout:.0f}s")
+        polls += 1
+        sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, COMPACTION_POLL_MAX)
+
+
+def compaction_segment_counts(client: MilvusClient, compaction_id: int) -> Dict:
+    """Segments merged by a finished compaction: every plan turns its sources into one target."""
+    plans = compaction_plans(client, compaction_id)
+    before = sum(len(p.sources) for p in plans)
+    after = sum(1 for p in plans if p.target)
+    return {"segments_before": before, "segments_after": after, "segments_saved": before - after}
+
+
+def run_load_job(job: Job, report) -> Dict:
+    with pool.client(job.host, job.port) as client:
+        client.load_collection(job.target, _async=True)
+        wait_until_loaded(client, job.target, job_manager.sleep, report)
+    invalidate_collection(job.host, job.port, job.target)
+    return {"load_state": LOAD_STATE_LOADED}
+
+
+def run_release_job(job: Job, report) -> Dict:
+    with pool.client(job.host, job.port) as client:
+        client.release_collection(job.target)
+    invalidate_collection(job.host, job.port, job.target)
+    return {"load_state": LOAD_STATE_NOT_LOADED}
+
+
+def run_compact_job(job: Job, report) -> Dict:
+    with pool.client(job.host, job.port) as client:
+        started = time.perf_counter()
+        compaction_id = client.compact(job.target)
+        report(compaction_id=compaction_id)
+        state = wait_until_compacted(client, compaction_id, job_manager.sleep, report)
+        result = {"compaction_id": compaction_id, "compaction_state": state,
+                  "duration_s": round(time.perf_counter() - started, 3)}
+        try:
+            result.update(compaction_segment_counts(client, compaction_id))
+        except MilvusException as e:
+            logger.warning("failed to get compaction plans", extra=fields(collection=job.target, error=str(e)))
+    invalidate_collection(job.host, job.port, job.target)
+    return result
+
+
+JOB_RUNNERS = {
+    "load": run_load_job,
+    "release": run_release_job,
+    "compact": run_compact_job,
+}
+
+
+def submit_job(kind: str, name: str, host: str, port: int) -> Dict:
+    job = job_manager.submit(kind, name, host, port, JOB_RUNNERS[kind])
+    return {"status": "success", "message": f"Started {kind} of collection '{name}'.", "job_id": job.id}
 
 
 @router.post("/collections/load")
 def load_collection(
     name: str = Query(...),
     host: str = Query("localhost"),
-    port: int = Query(19530),
-    alias: str = Query("default")
+    port: int = Query(19530)
 ):
-    try:
-        print(f"About to load {name} collection")
-        client = build_milvus_client(host, port)
-        with milvus_connection(alias, host, port):
-            client.load_collection(name)
-            # collection = Collection(name, using=alias)
-            # collection.load()
-        print(f"Collection {name} loaded")
-        return {"status": "success", "message": f"Collection '{name}' is loaded."}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+    return submit_job("load", name, host, port)
 
 
 @router.post("/collections/release")
 def release_collection(
     name: str = Query(...),
     host: str = Query("localhost"),
-    port: int = Query(19530),
-    alias: str = Query("default")
+    port: int = Query(19530)
 ):
-    try:
-        print(f"About to release {name} collection")
-        client = build_milvus_client(host, port)
-        with milvus_connection(alias, host, port):
-            client.release_collection(name)
-            # collection = Collection(name, using=alias)
-            # collection.release()
-        print(f"Collection {name} released")
-        return {"status": "success", "message": f"Collection '{name}' released."}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+    return submit_job("release", name, host, port)
 
 
 @router.post("/collection/rename")
 def rename_collection(
     payload: Dict = Body(...),
     host: str = Query("localhost"),
-    port: int = Query(19530),
-    alias: str = Query("default")
+    port: int = Query(19530)
 ):
     old_name = payload.get("old_name")
     new_name = payload.get("new_name")
@@ -206,9 +531,9 @@ def rename_collection(
         return {"status": "error", "message": "Missing 'old_name' or 'new_name'"}
 
     try:
-        client = build_milvus_client(host, port)
-        with milvus_connection(alias, host, port):
+        with pool.client(host, port) as client:
             client.rename_collection(old_name=old_name, new_name=new_name)
+        invalidate_collection(host, port, old_name, new_name)
         return {"status": "success", "message": f"Collection '{old_name}' renamed to '{new_name}'."}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -218,33 +543,148 @@ def rename_collection(
 def drop_collection(
     name: str = Query(...),
     host: str = Query("localhost"),
-    port: int = Query(19530),
-    alias: str = Query("default")
+    port: int = Query(19530)
 ):
     try:
-        client = build_milvus_client(host, port)
-        with milvus_connection(alias, host, port):
+        with pool.client(host, port) as client:
             client.drop_collection(name)
+        invalidate_collection(host, port, name)
         return {"status": "success", "message": f"Collection '{name}' dropped."}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
 @router.post("/collections/compact")
-def drop_collection(
+def compact_collection(
     name: str = Query(...),
     host: str = Query("localhost"),
-    port: int = Query(19530),
-    alias: str = Query("default")
+    port: int = Query(19530)
+):
+    return submit_job("compact", name, host, port)
+
+
+BULK_ACTIONS = ("load", "release", "compact", "drop")
+
+
+class BulkActionRequest(BaseModel):
+    action: str
+    names: List[str] = []
+    pattern: Optional[str] = None
+    concurrency: int = Field(4, ge=1, le=MAX_FETCH_CONCURRENCY)
+    rate_limit: Optional[float] = Field(None, gt=0, description="Max actions started per second")
+    wait: bool = Field(False, description="Run loads, releases and compactions as background jobs and "
+                                          "return their ids; follow them on /jobs/stream")
+    dry_run: bool = False
+    stop_on_error: bool = False
+
+
+class BulkItemResult(BaseModel):
+    name: str
+    status: str
+    message: str = ""
+    elapsed_ms: float = 0.0
+    job_id: str = ""
+    detail: Dict = {}
+
+
+class BulkActionResponse(BaseModel):
+    status: str
+    action: str
+    message: str = ""
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    job_ids: List[str] = []
+    results: List[BulkItemResult] = []
+
+
+def perform_action(client: MilvusClient, action: str, name: str) -> Dict:
+    if action == "load":
+        client.load_collection(name, _async=True)
+        return {}
+    if action == "release":
+        client.release_collection(name)
+        return {}
+    if action == "compact":
+        return {"compaction_id": client.compact(name)}
+    if action == "drop":
+        client.drop_collection(name)
+        return {}
+    raise ValueError(f"Unsupported action: {action}")
+
+
+def resolve_bulk_targets(client: MilvusClient, request: BulkActionRequest) -> List[str]:
+    names = list(dict.fromkeys(request.names))
+    if request.pattern:
+        names += [n for n in sorted(client.list_collections())
+                  if fnmatch.fnmatchcase(n, request.pattern) and n not in names]
+    return names
+
+
+@router.post("/collections/bulk", response_model=BulkActionResponse)
+def bulk_action(
+    request: BulkActionRequest,
+    host: str = Query("localhost"),
+    port: int = Query(19530)
 ):
-    print(f"Compact collection called: '{name}")
+    if request.action not in BULK_ACTIONS:
+        return BulkActionResponse(status="error", action=request.action,
+                                  message=f"Unsupported action: {request.action}")
+    if not request.names and not request.pattern:
+        return BulkActionResponse(status="error", action=request.action, message="Missing 'names' or 'pattern'")
+
     try:
-        client = build_milvus_client(host, port)
-        with milvus_connection(alias, host, port):
-            client.compact(name)
-        return {"status": "success", "message": f"Collection compaction started for '{name}'."}
+        with pool.client(host, port) as client:
+            names = resolve_bulk_targets(client, request)
+            if request.dry_run:
+                return BulkActionResponse(status="success", action=request.action, skipped=len(names),
+                                          results=[BulkItemResult(name=n, status="dry_run") for n in names])
+
+            limiter = RateLimiter(request.rate_limit)
+            stop = threading.Event()
+            as_jobs = request.wait and request.action in JOB_RUNNERS
+
+            def run(name: str) -> BulkItemResult:
+                if stop.is_set():
+                    return BulkItemResult(name=name, status="skipped", message="Stopped after an earlier error")
+                limiter.acquire()
+                if stop.is_set():
+                    return BulkItemResult(name=name, status="skipped", message="Stopped after an earlier error")
+                started = time.perf_counter()
+                try:
+                    if as_jobs:
+                        # Polling is left to the job workers so this request never blocks on it
+                        job = job_manager.submit(request.action, name, host, port, JOB_RUNNERS[request.action])
+                        result = BulkItemResult(name=name, status="success", job_id=job.id)
+                    else:
+                        detail = perform_action(client, request.action, name)
+                        result = BulkItemResult(name=name, status="success", detail=detail)
+                except Exception as e:
+                    if request.stop_on_error:
+                        stop.set()
+                    result = BulkItemResult(name=name, status="error", message=str(e))
+                finally:
+                    invalidate_collection(host, port, name)
+                result.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+                return result
+
+            workers = max(1, min(request.concurrency, len(names)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk") as executor:
+                results = list(executor.map(propagate(run), names))
+
+        counts = {s: sum(1 for r in results if r.status == s) for s in ("success", "error", "skipped")}
+        return BulkActionResponse(
+            status="success" if not counts["error"] else "error",
+            action=request.action,
+            succeeded=counts["success"],
+            failed=counts["error"],
+            skipped=counts["skipped"],
+            job_ids=[r.job_id for r in results if r.job_id],
+            results=results
+        )
     except Exception as e:
-        return {"status": "error", "message": str(e)}
+        logger.exception("bulk action failed", extra=fields(action=request.action))
+        return BulkActionResponse(status="error", action=request.action, message=str(e))
 
 
 class CollectionDetailsResponse(BaseModel):
@@ -301,60 +741,70 @@ def get_indexes(coll: Collection):
     return {idx.field_name: idx.to_dict() for idx in coll.indexes}
 
 
+def cached_indexes(client: MilvusClient, host: str, port, name: str) -> Dict[str, Dict]:
+    # Copies: callers annotate the per-index dicts with build progress
+    indexes = metadata_cache.get_or_fetch(
+        cache_key(host, port, "indexes", name),
+        lambda: get_indexes(Collection(name=name, using=alias_of(client))),
+        ttl=INDEX_TTL
+    )
+    return {field: dict(ixn) for field, ixn in indexes.items()}
+
+
+def cached_fields_data(client: MilvusClient, host: str, port, name: str) -> List[Dict]:
+    return metadata_cache.get_or_fetch(
+        cache_key(host, port, "fields", name),
+        lambda: get_fields_data(Collection(name=name, using=alias_of(client)).schema.fields),
+        ttl=FIELDS_TTL
+    )
+
+
 @router.get("/collections/{name}/details", response_model=CollectionDetailsResponse)
 def get_collection_details(
     name: str,
     host: str = Query("localhost"),
-    port: int = Query(19530),
-    alias: str = Query("default")
+    port: int = Query(19530)
 ):
     try:
-        client = build_milvus_client(host, port)
-
-        with milvus_connection(alias, host, port):
-            coll = Collection(name=name)
-            # print(f"==> --> COLLECTION NAME: {coll.name}")
-            desc = client.describe_collection(name)
+        with pool.client(host, port) as client:
+            desc = cached_describe_collection(client, host, port, name)
             try:
-                indexes = get_indexes(coll)
+                indexes = cached_indexes(client, host, port, name)
                 for ixn in indexes.values():
-                    progress = utility.index_building_progress(collection_name=name, index_name=ixn['index_name'])
+                    progress = utility.index_building_progress(collection_name=name, index_name=ixn['index_name'],
+                                                               using=alias_of(client))
                     if not progress.get("pending_index_rows"):
                         continue
                     field = ixn.get('field')
                     if field:
                         indexes[field].update({'progress': progress})
             except MilvusException as e:
-                print(f"[INFO] ====> Skipping progress for dropped index {ixn['index_name']}: {e}")
-
-            schema_fields = get_fields_data(coll.schema.fields)
-
+                logger.info("skipping progress for dropped index", extra=fields(collection=name,
+                                                                                index=ixn['index_name']))
 
+            schema_fields = cached_fields_data(client, host, port, name)
 
             try:
                 load_state = int(client.get_load_state(collection_name=name)["state"])
             except:
                 load_state = -1
-            # print(f"=====>> DESC {desc}")
             return CollectionDetailsResponse(
                 status="success",
                 collection_id=desc["collection_id"],
                 name=name,
-                description=coll.description,
+                description=desc.get("description", ""),
                 schema=schema_fields,
                 index_type=next(iter(indexes.values())).get("index_param", {}).get("index_type", "") if indexes else "",
-                entity_count=coll.num_entities,
+                entity_count=client.get_collection_stats(collection_name=name).get("row_count", -1),
                 load_state=load_state,
                 index_info=list(indexes.values()),
 
-                shard_num=coll.num_shards,
-                auto_id=coll.schema.auto_id
+                shard_num=desc.get("num_shards", -1),
+                auto_id=desc.get("auto_id", False)
             )
 
     except MilvusException as e:
-        print(f"___________________________________________________")
-        traceback.print_exc()
-        print(f"___________________________________________________")
+        logger.exception("failed to get collection details", extra=fields(collection=name))
         return CollectionDetailsResponse(
             status="error",
             name=name,
@@ -366,9 +816,7 @@ def get_collection_details(
             auto_id=False
         )
     except Exception as e:
-        print(f"___________________________________________________")
-        traceback.print_exc()
-        print(f"___________________________________________________")
+        logger.exception("failed to get collection details", extra=fields(collection=name))
         return CollectionDetailsResponse(
             status="error",
             name=name,
@@ -381,12 +829,215 @@ def get_collection_details(
         )
 
 
+class PkRangeResponse(BaseModel):
+    status: str
+    name: str
+    primary_field: str = ""
+    min: Optional[int] = None
+    max: Optional[int] = None
+    partitions: Dict[str, Dict] = {}
+    queries: int = 0
+    elapsed_ms: float = 0.0
+    message: str = ""
+
+
+def primary_field_of(desc: Dict) -> Dict:
+    return next((f for f in desc.get("fields", []) if f.get("is_primary")), {})
+
+
+@router.get("/collections/{name}/pk-range", response_model=PkRangeResponse)
+def get_pk_range(
+    name: str,
+    host: str = Query("localhost"),
+    port: int = Query(19530),
+    concurrency: int = Query(8, ge=1, le=MAX_FETCH_CONCURRENCY),
+    max_queries: int = Query(DEFAULT_MAX_QUERIES, ge=1, le=1024,
+                             description="Give up on a partition's min or max after this many queries")
+):
+    """Min and max primary key, probed per partition in parallel with range queries.
+
+    Each min or max takes about a dozen queries for dense keys and up to ~2 * log2(max / 16384)
+    for sparse ones; `queries` in the response is the total.
+    """
+    started = time.perf_counter()
+    try:
+        with pool.client(host, port) as client:
+            pk_field = primary_field_of(cached_describe_collection(client, host, port, name))
+            if int(pk_field.get("type", -1)) != DataType.INT64:
+                return PkRangeResponse(status="error", name=name,
+                                       message="Only collections with an INT64 primary key are supported")
+            pk = pk_field["name"]
+            partitions = client.list_partitions(collection_name=name)
+            queries = [0]
+            queries_lock = threading.Lock()
+
+            def partition_range(partition: str):
+                def query_ids(expr: str) -> List[int]:
+                    with queries_lock:
+                        queries[0] += 1
+                    rows = client.query(collection_name=name, filter=expr, output_fields=[pk],
+                                        limit=QUERY_WINDOW, partition_names=[partition])
+                    return [r[pk] for r in rows]
+                return partition, {"min": find_extreme_pk(query_ids, pk, largest=False, max_queries=max_queries),
+                                   "max": find_extreme_pk(query_ids, pk, max_queries=max_queries)}
+
+            workers = max(1, min(concurrency, len(partitions)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pk-range") as executor:
+                per_partition = dict(executor.map(propagate(partition_range), partitions))
+
+        mins = [r["min"] for r in per_partition.values() if r["min"] is not None]
+        maxs = [r["max"] for r in per_partition.values() if r["max"] is not None]
+        return PkRangeResponse(
+            status="success",
+            name=name,
+            primary_field=pk,
+            min=min(mins) if mins else None,
+            max=max(maxs) if maxs else None,
+            partitions=per_partition,
+            queries=queries[0],
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2)
+        )
+    except Exception as e:
+        logger.exception("failed to find primary key range", extra=fields(collection=name))
+        return PkRangeResponse(status="error", name=name, message=str(e))
+
+
+class CollectionSegmentStats(BaseModel):
+    name: str
+    loaded: bool
+    segments: int = 0
+    l0_segments: int = 0
+    rows: int = 0
+    live_rows: Optional[int] = None
+    deleted_rows: Optional[int] = None
+    deleted_ratio: float = 0.0
+    small_segments: int = 0
+    small_segment_ratio: float = 0.0
+    memory_bytes: int = 0
+    row_distribution: Dict = {}
+    partitions: Dict[str, Dict] = {}
+    nodes: Dict[str, int] = {}
+    compact: bool = False
+    score: float = 0.0
+    reasons: List[str] = []
+    message: str = ""
+
+
+class SegmentAnalyticsResponse(BaseModel):
+    status: str
+    collections: List[CollectionSegmentStats] = []
+    recommendations: List[str] = []
+    nodes: Dict[str, int] = {}
+    message: str = ""
+
+
+def collection_segment_stats(client: MilvusClient, name: str) -> CollectionSegmentStats:
+    try:
+        if int(client.get_load_state(collection_name=name)["state"]) != LOAD_STATE_LOADED:
+            # Segment info comes from the query nodes, so only loaded collections have any
+            return CollectionSegmentStats(name=name, loaded=False, message="Collection is not loaded")
+        infos = utility.get_query_segment_info(name, using=alias_of(client))
+        live_rows = client.query(collection_name=name, filter="", output_fields=["count(*)"])[0]["count(*)"]
+        summary = summarize_segments([segment_to_dict(i) for i in infos], live_rows=live_rows)
+        return CollectionSegmentStats(name=name, loaded=True, **summary, **recommend_compaction(summary))
+    except Exception as e:
+        logger.warning("failed to get segment info", extra=fields(collection=name, error=str(e)))
+        return CollectionSegmentStats(name=name, loaded=False, message=str(e))
+
+
+@router.get("/segments", response_model=SegmentAnalyticsResponse)
+def segment_analytics(
+    host: str = Query("localhost"),
+    port: int = Query(19530),
+    names: Optional[List[str]] = Query(None, description="Collections to analyse (default: all)"),
+    concurrency: int = Query(DEFAULT_FETCH_CONCURRENCY, ge=1, le=MAX_FETCH_CONCURRENCY)
+):
+    """Per-collection segment statistics, ranked by how much compaction would help."""
+    try:
+        with pool.client(host, port) as client:
+            names = names or client.list_collections()
+            if not names:
+                return SegmentAnalyticsResponse(status="success")
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(names)),
+                                    thread_name_prefix="segments") as executor:
+                collections = list(executor.map(propagate(lambda n: collection_segment_stats(client, n)), names))
+
+        collections.sort(key=lambda c: (-c.score, c.name))
+        nodes = {}
+        for c in collections:
+            for node, size in c.nodes.items():
+                nodes[node] = nodes.get(node, 0) + size
+        return SegmentAnalyticsResponse(
+            status="success",
+            collections=collections,
+            recommendations=[c.name for c in collections if c.compact],
+            nodes=nodes
+        )
+    except Exception as e:
+        logger.exception("segment analytics failed", extra=fields(host=host, port=port))
+        return SegmentAnalyticsResponse(status="error", message=str(e))
+
+
+compaction_scheduler = CompactionScheduler(
+    lambda entry: job_manager.submit("compact", entry.target, entry.host, entry.port, run_compact_job),
+    job_manager.get
+)
+
+
+class ScheduleCompactionRequest(BaseModel):
+    names: List[str] = []
+    pattern: Optional[str] = None
+    recommended: bool = Field(False, description="Also queue the collections recommended by /segments, "
+                                                 "most fragmented first")
+
+
+@router.post("/compaction/schedule")
+def schedule_compaction(
+    request: ScheduleCompactionRequest,
+    host: str = Query("localhost"),
+    port: int = Query(19530)
+):
+    if not request.names and not request.pattern and not request.recommended:
+        return {"status": "error", "message": "Missing 'names', 'pattern' or 'recommended'"}
+    try:
+        with pool.client(host, port) as client:
+            names = resolve_bulk_targets(client, request)
+        if request.recommended:
+            analytics = segment_analytics(host, port, None, DEFAULT_FETCH_CONCURRENCY)
+            if analytics.status != "success":
+                return {"status": "error", "message": analytics.message}
+            names += [n for n in analytics.recommendations if n not in names]
+        entries = compaction_scheduler.schedule(host, port, names)
+        return {"status": "success", "scheduled": [e.to_dict() for e in entries]}
+    except Exception as e:
+        logger.exception("failed to schedule compactions", extra=fields(host=host, port=port))
+        return {"status": "error", "message": str(e)}
+
+
+@router.get("/compaction/schedule")
+def list_scheduled_compactions(state: Optional[str] = Query(None)):
+    return {
+        "status": "success",
+        "stats": compaction_scheduler.stats(),
+        "compactions": [e.to_dict() for e in compaction_scheduler.list(state=state)]
+    }
+
+
+@router.delete("/compaction/schedule/{entry_id}")
+def cancel_scheduled_compaction(entry_id: str):
+    entry = compaction_scheduler.cancel(entry_id)
+    if entry is None:
+        return {"status": "error", "message": f"Scheduled compaction '{entry_id}' not found"}
+    if entry.state != CANCELLED:
+        return {"status": "error", "message": f"Compaction of '{entry.target}' is already {entry.state}"}
+    return {"status": "success", "compaction": entry.to_dict()}
+
+
 @router.post("/index/drop")
 def drop_index(
     payload: Dict = Body(...),
     host: str = Query("localhost"),
-    port: int = Query(19530),
-    alias: str = Query("default")
+    port: int = Query(19530)
 ):
     collection_name = payload.get("collection_name")
     field_name = payload.get("field_name")
@@ -395,16 +1046,16 @@ def drop_index(
         return {"status": "error", "message": "Missing 'collection_name' or 'field_name'"}
 
     try:
-        with milvus_connection(alias, host, port):
-            if not utility.has_collection(collection_name):
+        with pool.client(host, port) as client:
+            if not utility.has_collection(collection_name, using=alias_of(client)):
                 return {"status": "error", "message": f"Collection '{collection_name}' not found"}
-            collection = Collection(collection_name)
+            collection = Collection(collection_name, using=alias_of(client))
             collection.drop_index(index_name=field_name)
+        invalidate_collection(host, port, collection_name)
 
         return {"status": "success", "message": f"Index on field '{field_name}' dropped."}
     except Exception as e:
-        print(f"Failed to drop index for field '{field_name}' in collection '{collection_name}': {e}")
-        traceback.print_exc()
+        logger.exception("failed to drop index", extra=fields(collection=collection_name, field=field_name))
         return {"status": "error", "message": str(e)}
 
 
@@ -413,6 +1064,7 @@ class FieldDefinition(BaseModel):
     type: str
     dim: Optional[int] = None
     max_length: Optional[int] = None
+    max_capacity: Optional[int] = None
     is_primary: Optional[bool] = False
     auto_id: Optional[bool] = False
     element_type: Optional[str] = None
@@ -427,11 +1079,12 @@ class CreateCollectionRequest(BaseModel):
 @router.post("/collection/create")
 def create_collection(request: CreateCollectionRequest, host: str = "localhost", port: str = "19530"):
     try:
-        connections.connect(host=host, port=port)
-
         fields = []
         for f in request.fields:
             type_map = {
+                "int8": DataType.INT8,
+                "int16": DataType.INT16,
+                "int32": DataType.INT32,
                 "int64": DataType.INT64,
                 "float": DataType.FLOAT,
                 "double": DataType.DOUBLE,
@@ -451,6 +1104,8 @@ def create_collection(request: CreateCollectionRequest, host: str = "localhost",
                 kwargs["dim"] = f.dim
             if f.max_length is not None:
                 kwargs["max_length"] = f.max_length
+            if f.max_capacity is not None:
+                kwargs["max_capacity"] = f.max_capacity
             if f.element_type is not None:
                 kwargs["element_type"] = getattr(DataType, f.element_type.upper(), None)
                 if kwargs["element_type"] is None:
@@ -466,7 +1121,9 @@ def create_collection(request: CreateCollectionRequest, host: str = "localhost",
             fields.append(field)
 
         schema = CollectionSchema(fields=fields, description=request.description or "")
-        collection = Collection(name=request.name, schema=schema)
+        with pool.client(host, port) as client:
+            Collection(name=request.name, schema=schema, using=alias_of(client))
+        invalidate_collection(host, port, request.name)
         return {"status": "success", "message": f"Collection '{request.name}' created"}
 
     except Exception as e:
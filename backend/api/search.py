@@ -0,0 +1,179 @@
+import base64
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from fastapi import APIRouter, Query
+from pydantic import BaseModel, Field
+from pymilvus import DataType, MilvusClient
+from pymilvus.client.search_result import Hit
+
+from api.milvus import MAX_FETCH_CONCURRENCY, cached_describe_collection, cached_indexes
+from core.log import fields, get_logger, propagate, span
+from core.pool import pool
+
+router = APIRouter(prefix="/api/milvus")
+logger = get_logger("search")
+
+# Milvus caps nq and topk per search request at 16384
+MAX_SEARCH_NQ = 16384
+MAX_SEARCH_LIMIT = 16384
+# Query vectors per Milvus search call; larger requests are split and searched in parallel
+SEARCH_BATCH_NQ = int(os.getenv("MILVUS_SEARCH_BATCH_NQ", "256"))
+DEFAULT_SEARCH_CONCURRENCY = 4
+
+
+class SearchRequest(BaseModel):
+    collection: str
+    vectors: Optional[List[List[float]]] = None
+    vectors_b64: Optional[str] = Field(None, description="Little-endian float32 query vectors, row after row")
+    anns_field: Optional[str] = Field(None, description="Default: the collection's float vector field")
+    limit: int = Field(10, ge=1, le=MAX_SEARCH_LIMIT)
+    filter: str = ""
+    output_fields: List[str] = []
+    partition_names: Optional[List[str]] = None
+    metric_type: Optional[str] = Field(None, description="Default: the metric the field's index was built with")
+    search_params: Dict[str, Any] = Field({}, description='Index search params, e.g. {"ef": 64}')
+    format: str = Field("json", pattern="^(json|binary)$",
+                        description="binary: ids and distances as base64 int64/float32 nq x limit arrays")
+
+
+class SearchResponse(BaseModel):
+    status: str
+    nq: int = 0
+    limit: int = 0
+    anns_field: str = ""
+    metric_type: str = ""
+    elapsed_ms: float = 0.0
+    counts: List[int] = []
+    ids: Optional[List[List[Any]]] = None
+    distances: Optional[List[List[float]]] = None
+    entities: Optional[List[List[Dict]]] = None
+    ids_b64: Optional[str] = None
+    distances_b64: Optional[str] = None
+    message: str = ""
+
+
+def resolve_search_field(client: MilvusClient, host: str, port: int, name: str,
+                         anns_field: Optional[str]) -> Dict:
+    """Vector field name, dim and index metric from the cached schema and index descriptions."""
+    desc = cached_describe_collection(client, host, port, name)
+    vector_fields = [f for f in desc.get("fields", []) if int(f.get("type", -1)) == DataType.FLOAT_VECTOR]
+    if anns_field:
+        vector_fields = [f for f in vector_fields if f["name"] == anns_field]
+    if not vector_fields:
+        raise ValueError(f"Collection '{name}' has no float vector field"
+                         + (f" named '{anns_field}'" if anns_field else ""))
+    field = vector_fields[0]
+    index = cached_indexes(client, host, port, name).get(field["name"], {})
+    return {
+        "name": field["name"],
+        "dim": int(field.get("params", {}).get("dim", 0)),
+        "metric_type": index.get("index_param", {}).get("metric_type", ""),
+    }
+
+
+def decode_vectors(request: SearchRequest, dim: int) -> np.ndarray:
+    if request.vectors_b64:
+        raw = np.frombuffer(base64.b64decode(request.vectors_b64), dtype="<f4")
+        if not dim or raw.size % dim:
+            raise ValueError(f"vectors_b64 holds {raw.size} floats, not a multiple of dim {dim}")
+        vectors = raw.reshape(-1, dim)
+    elif request.vectors:
+        vectors = np.asarray(request.vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != dim:
+            raise ValueError(f"Query vectors must all have dim {dim}")
+    else:
+        raise ValueError("Either vectors or vectors_b64 is required")
+    if not 0 < len(vectors) <= MAX_SEARCH_NQ:
+        raise ValueError(f"Between 1 and {MAX_SEARCH_NQ} query vectors are allowed, got {len(vectors)}")
+    return vectors
+
+
+def pack_results(results: List[List[Hit]], limit: int, binary: bool, with_entities: bool) -> Dict:
+    """Columnar results: per-query id/distance lists, or padded nq x limit arrays in base64."""
+    packed = {"counts": [len(hits) for hits in results]}
+    # Hits are keyed by the primary key field's name; `id` reads it whatever the field is called
+    ids = [[hit.id for hit in hits] for hits in results]
+    if with_entities:
+        packed["entities"] = [[hit.get("entity", {}) for hit in hits] for hits in results]
+    if not binary:
+        packed["ids"] = ids
+        packed["distances"] = [[hit.distance for hit in hits] for hits in results]
+        return packed
+
+    distances = np.full((len(results), limit), np.nan, dtype="<f4")
+    for i, hits in enumerate(results):
+        distances[i, :len(hits)] = [hit.distance for hit in hits]
+    packed["distances_b64"] = base64.b64encode(distances.tobytes()).decode()
+    if all(isinstance(i, int) for row in ids for i in row):
+        id_array = np.full((len(results), limit), -1, dtype="<i8")
+        for i, row in enumerate(ids):
+            id_array[i, :len(row)] = row
+        packed["ids_b64"] = base64.b64encode(id_array.tobytes()).decode()
+    else:
+        # VarChar primary keys have no fixed-width encoding
+        packed["ids"] = ids
+    return packed
+
+
+@router.post("/search", response_model=SearchResponse)
+def search(
+    request: SearchRequest,
+    host: str = Query("localhost"),
+    port: int = Query(19530),
+    concurrency: int = Query(DEFAULT_SEARCH_CONCURRENCY, ge=1, le=MAX_FETCH_CONCURRENCY)
+):
+    """Top-k search for a batch of query vectors.
+
+    Requests are split into calls of MILVUS_SEARCH_BATCH_NQ vectors that run in parallel;
+    results come back in query order.
+    """
+    started = time.perf_counter()
+    try:
+        with pool.client(host, port) as client:
+            field = resolve_search_field(client, host, port, request.collection, request.anns_field)
+            vectors = decode_vectors(request, field["dim"])
+            metric_type = request.metric_type or field["metric_type"]
+            search_params = {"params": request.search_params}
+            if metric_type:
+                search_params["metric_type"] = metric_type
+
+            def search_batch(start: int) -> List[List[Dict]]:
+                with span("search.batch", start=start):
+                    return client.search(
+                        collection_name=request.collection,
+                        data=list(vectors[start:start + SEARCH_BATCH_NQ]),
+                        anns_field=field["name"],
+                        limit=request.limit,
+                        filter=request.filter,
+                        output_fields=request.output_fields,
+                        search_params=search_params,
+                        partition_names=request.partition_names
+                    )
+
+            starts = range(0, len(vectors), SEARCH_BATCH_NQ)
+            if len(starts) == 1:
+                batches = [search_batch(0)]
+            else:
+                with ThreadPoolExecutor(max_workers=min(concurrency, len(starts)),
+                                        thread_name_prefix="search") as executor:
+                    batches = list(executor.map(propagate(search_batch), starts))
+
+        results = [list(hits) for batch in batches for hits in batch]
+        return SearchResponse(
+            status="success",
+            nq=len(vectors),
+            limit=request.limit,
+            anns_field=field["name"],
+            metric_type=metric_type,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+            **pack_results(results, request.limit, request.format == "binary", bool(request.output_fields))
+        )
+    except ValueError as e:
+        return SearchResponse(status="error", message=str(e))
+    except Exception as e:
+        logger.exception("search failed", extra=fields(collection=request.collection))
+        return SearchResponse(status="error", message=str(e))
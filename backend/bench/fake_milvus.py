@@ -0,0 +1,362 @@
+"""In-process stand-in for the part of pymilvus the backend uses, for benchmarks without a cluster.
+
+`FakeCluster` holds N simulated collections; every call made through `FakeMilvusClient`,
+`FakeCollection` or `FakeUtility` counts as one RPC, sleeps for the configured latency and
+fails with the configured probability. `install(cluster)` routes the backend's pool, routes
+and utility calls to it.
+"""
+import itertools
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from unittest import mock
+
+from pymilvus import CollectionSchema, DataType, FieldSchema
+from pymilvus.client.search_result import Hit
+from pymilvus.client.types import LoadState
+from pymilvus.exceptions import MilvusException
+
+INDEX_TYPES = ("HNSW", "IVF_FLAT", "AUTOINDEX", "DISKANN")
+SEGMENT_ROWS = 100_000
+DIM = 128
+# Not "id", so code that assumes a primary key name fails here as it would on a real cluster
+PK_FIELD = "pk"
+VECTOR_FIELD = "embedding"
+RANGE_FILTER = re.compile(r"^\s*(\w+)\s*(>=|<=)\s*(-?\d+)\s*$")
+
+
+class FakeCollectionState:
+    def __init__(self, cluster: "FakeCluster", name: str, rng: random.Random):
+        self.id = next(cluster.ids)
+        self.name = name
+        self.description = f"simulated collection {name}"
+        self.rows = rng.randint(0, 2_000_000)
+        self.partitions = ["_default"] + [f"p{i}" for i in range(rng.randint(0, 3))]
+        self.load_state = LoadState.Loaded if rng.random() < cluster.loaded_ratio else LoadState.NotLoad
+        self.loaded_at = 0.0
+        self.schema = CollectionSchema([
+            FieldSchema(PK_FIELD, DataType.INT64, is_primary=True),
+            FieldSchema(VECTOR_FIELD, DataType.FLOAT_VECTOR, dim=DIM),
+            FieldSchema("content", DataType.VARCHAR, max_length=4096),
+        ], description=self.description)
+        pending = self.rows // 10 if rng.random() < cluster.indexing_ratio else 0
+        self.indexes = {VECTOR_FIELD: {"index_type": rng.choice(INDEX_TYPES), "metric_type": "L2",
+                                       "pending_index_rows": pending}}
+
+    def partition_rows(self) -> Dict[str, range]:
+        """Primary keys of each partition: consecutive ranges splitting 0..rows."""
+        step = -(-self.rows // len(self.partitions)) if self.rows else 0
+        return {p: range(i * step, min(self.rows, (i + 1) * step)) for i, p in enumerate(self.partitions)}
+
+
+class FakeCluster:
+    def __init__(self, collections: int = 100, latency_ms: float = 1.0, jitter: float = 0.5,
+                 failure_rate: float = 0.0, load_seconds: float = 0.0, compaction_seconds: float = 0.0,
+                 loaded_ratio: float = 0.8, indexing_ratio: float = 0.05, seed: int = 0, prefix: str = "bench_"):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.load_seconds = load_seconds
+        self.compaction_seconds = compaction_seconds
+        self.loaded_ratio = loaded_ratio
+        self.indexing_ratio = indexing_ratio
+        self.ids = itertools.count(1000)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.collections: Dict[str, FakeCollectionState] = {}
+        self.compactions: Dict[int, tuple] = {}
+        self.rpc_counts: Counter = Counter()
+        self.inflight = 0
+        self.peak_inflight = 0
+        width = len(str(max(collections - 1, 0)))
+        for i in range(collections):
+            name = f"{prefix}{i:0{width}d}"
+            self.collections[name] = FakeCollectionState(self, name, self.rng)
+
+    @contextmanager
+    def rpc(self, method: str):
+        """One simulated RPC: counted, delayed by latency_ms (+/- jitter) and possibly failed."""
+        with self.lock:
+            self.rpc_counts[method] += 1
+            self.inflight += 1
+            self.peak_inflight = max(self.peak_inflight, self.inflight)
+            fail = self.rng.random() < self.failure_rate
+            delay = self.latency_ms / 1000 * (1 + self.jitter * (2 * self.rng.random() - 1))
+        try:
+            if delay > 0:
+                time.sleep(delay)
+            if fail:
+                raise MilvusException(code=1, message=f"simulated failure of {method}")
+            yield
+        finally:
+            with self.lock:
+                self.inflight -= 1
+
+    def get(self, name: str) -> FakeCollectionState:
+        state = self.collections.get(name)
+        if state is None:
+            raise MilvusException(code=100, message=f"collection not found[collection={name}]")
+        return state
+
+    def total_rpcs(self) -> int:
+        with self.lock:
+            return sum(self.rpc_counts.values())
+
+    def reset_counters(self):
+        with self.lock:
+            self.rpc_counts.clear()
+            self.peak_inflight = self.inflight
+
+
+# Clients register their alias here so Collection(..., using=alias) and utility calls find the cluster
+_aliases: Dict[str, FakeCluster] = {}
+_alias_ids = itertools.count()
+
+
+def cluster_of(using: str) -> FakeCluster:
+    return _aliases[using]
+
+
+class FakeMilvusClient:
+    def __init__(self, cluster: FakeCluster, uri: str = "", **kwargs):
+        self.cluster = cluster
+        self._using = f"fake-{next(_alias_ids)}"
+        _aliases[self._using] = cluster
+
+    def close(self):
+        _aliases.pop(self._using, None)
+
+    def list_collections(self, **kwargs) -> List[str]:
+        with self.cluster.rpc("ShowCollections"):
+            return list(self.cluster.collections)
+
+    def has_collection(self, collection_name: str, **kwargs) -> bool:
+        with self.cluster.rpc("HasCollection"):
+            return collection_name in self.cluster.collections
+
+    def describe_collection(self, collection_name: str, **kwargs) -> Dict:
+        with self.cluster.rpc("DescribeCollection"):
+            state = self.cluster.get(collection_name)
+            return {
+                "collection_name": state.name,
+                "collection_id": state.id,
+                "description": state.description,
+                "fields": [{"name": f.name, "description": f.description, "type": f.dtype, "params": f.params,
+                            "is_primary": f.is_primary, "auto_id": f.auto_id} for f in state.schema.fields],
+                "num_shards": 1,
+                "auto_id": False,
+                "enable_dynamic_field": False,
+            }
+
+    def get_collection_stats(self, collection_name: str, **kwargs) -> Dict:
+        with self.cluster.rpc("GetCollectionStatistics"):
+            return {"row_count": self.cluster.get(collection_name).rows}
+
+    def get_load_state(self, collection_name: str, **kwargs) -> Dict:
+        with self.cluster.rpc("GetLoadState"):
+            state = self.cluster.collections.get(collection_name)
+            if state is None:
+                return {"state": LoadState.NotExist}
+            if state.load_state == LoadState.Loading and time.monotonic() >= state.loaded_at:
+                state.load_state = LoadState.Loaded
+            result = {"state": state.load_state}
+            if state.load_state == LoadState.Loading:
+                result["progress"] = 50
+            return result
+
+    def describe_index(self, collection_name: str, index_name: str, **kwargs) -> Optional[Dict]:
+        with self.cluster.rpc("DescribeIndex"):
+            state = self.cluster.get(collection_name)
+            index = state.indexes.get(index_name)
+            if index is None:
+                return None
+            return {"field_name": index_name, "index_name": index_name, "index_type": index["index_type"],
+                    "metric_type": index["metric_type"], "total_rows": state.rows,
+                    "indexed_rows": state.rows - index["pending_index_rows"],
+                    "pending_index_rows": index["pending_index_rows"]}
+
+    def list_partitions(self, collection_name: str, **kwargs) -> List[str]:
+        with self.cluster.rpc("ShowPartitions"):
+            return list(self.cluster.get(collection_name).partitions)
+
+    def load_collection(self, collection_name: str, _async: bool = False, **kwargs):
+        with self.cluster.rpc("LoadCollection"):
+            state = self.cluster.get(collection_name)
+            state.load_state = LoadState.Loading
+            state.loaded_at = time.monotonic() + self.cluster.load_seconds
+
+    def release_collection(self, collection_name: str, **kwargs):
+        with self.cluster.rpc("ReleaseCollection"):
+            self.cluster.get(collection_name).load_state = LoadState.NotLoad
+
+    def drop_collection(self, collection_name: str, **kwargs):
+        with self.cluster.rpc("DropCollection"):
+            with self.cluster.lock:
+                self.cluster.collections.pop(collection_name, None)
+
+    def rename_collection(self, old_name: str, new_name: str, **kwargs):
+        with self.cluster.rpc("RenameCollection"):
+            with self.cluster.lock:
+                if new_name in self.cluster.collections:
+                    raise MilvusException(code=65535, message=f"duplicated new collection name {new_name}")
+                state = self.cluster.get(old_name)
+                state.name = new_name
+                self.cluster.collections[new_name] = self.cluster.collections.pop(old_name)
+
+    def compact(self, collection_name: str, **kwargs) -> int:
+        with self.cluster.rpc("ManualCompaction"):
+            state = self.cluster.get(collection_name)
+            compaction_id = next(self.cluster.ids)
+            segments = max(1, -(-state.rows // SEGMENT_ROWS))
+            self.cluster.compactions[compaction_id] = (time.monotonic() + self.cluster.compaction_seconds, segments)
+            return compaction_id
+
+    def get_compaction_state(self, job_id: int, **kwargs) -> str:
+        with self.cluster.rpc("GetCompactionState"):
+            done_at, _ = self.cluster.compactions[job_id]
+            return "Completed" if time.monotonic() >= done_at else "Executing"
+
+    def _get_connection(self):
+        """The gRPC handler; the fake serves its calls itself."""
+        return self
+
+    def get_compaction_plans(self, compaction_id: int, **kwargs):
+        with self.cluster.rpc("GetCompactionStateWithPlans"):
+            _, segments = self.cluster.compactions[compaction_id]
+            sources = list(range(segments))
+            return SimpleNamespace(plans=[SimpleNamespace(sources=sources, target=next(self.cluster.ids))])
+
+    def query(self, collection_name: str, filter: str = "", output_fields: Optional[List[str]] = None,
+              limit: Optional[int] = None, partition_names: Optional[List[str]] = None, **kwargs) -> List[Dict]:
+        with self.cluster.rpc("Query"):
+            state = self.cluster.get(collection_name)
+            ranges = state.partition_rows()
+            if output_fields == ["count(*)"]:
+                return [{"count(*)": state.rows}]
+            keys = [ranges[p] for p in (partition_names or state.partitions)]
+            match = RANGE_FILTER.match(filter or "")
+            ids = []
+            for r in keys:
+                if match:
+                    bound = int(match.group(3))
+                    r = range(max(r.start, bound), r.stop) if match.group(2) == ">=" \
+                        else range(r.start, min(r.stop, bound + 1))
+                ids.extend(r[:limit] if limit else r)
+            return [{PK_FIELD: i} for i in ids[:limit]]
+
+    def search(self, collection_name: str, data: List, limit: int = 10, **kwargs) -> List[List[Hit]]:
+        with self.cluster.rpc("Search"):
+            rows = self.cluster.get(collection_name).rows
+            # Like pymilvus, hits are keyed by the primary key field
+            return [[Hit({PK_FIELD: i, "distance": float(i), "entity": {}}, pk_name=PK_FIELD)
+                     for i in range(min(limit, rows))] for _ in data]
+
+
+class FakeIndex:
+    def __init__(self, collection: str, field: str, index: Dict):
+        self.field_name = field
+        self.index_name = field
+        self.params = {"index_type": index["index_type"], "metric_type": index["metric_type"], "params": {}}
+        self._collection = collection
+
+    def to_dict(self) -> Dict:
+        return {"collection": self._collection, "field": self.field_name, "index_name": self.index_name,
+                "index_param": self.params}
+
+
+class FakeCollection:
+    """ORM Collection over a FakeCluster; `using` is the alias of a FakeMilvusClient."""
+
+    def __init__(self, name: str, schema: Optional[CollectionSchema] = None, using: str = "default", **kwargs):
+        self.cluster = cluster_of(using)
+        self.name = name
+        if schema is not None:
+            with self.cluster.rpc("CreateCollection"):
+                with self.cluster.lock:
+                    if name not in self.cluster.collections:
+                        state = FakeCollectionState(self.cluster, name, self.cluster.rng)
+                        state.schema, state.rows, state.indexes = schema, 0, {}
+                        state.load_state = LoadState.NotLoad
+                        self.cluster.collections[name] = state
+        else:
+            with self.cluster.rpc("DescribeCollection"):
+                self.cluster.get(name)
+
+    @property
+    def schema(self) -> CollectionSchema:
+        return self.cluster.get(self.name).schema
+
+    @property
+    def indexes(self) -> List[FakeIndex]:
+        with self.cluster.rpc("DescribeIndex"):
+            state = self.cluster.get(self.name)
+            return [FakeIndex(self.name, field, index) for field, index in state.indexes.items()]
+
+    def drop_index(self, index_name: str = VECTOR_FIELD, **kwargs):
+        with self.cluster.rpc("DropIndex"):
+            self.cluster.get(self.name).indexes.pop(index_name, None)
+
+
+class FakeUtility:
+    """The `pymilvus.utility` functions the backend calls."""
+
+    @staticmethod
+    def get_server_version(using: str = "default", timeout: Optional[float] = None) -> str:
+        with cluster_of(using).rpc("GetVersion"):
+            return "v2.5.10-fake"
+
+    @staticmethod
+    def has_collection(collection_name: str, using: str = "default", **kwargs) -> bool:
+        cluster = cluster_of(using)
+        with cluster.rpc("HasCollection"):
+            return collection_name in cluster.collections
+
+    @staticmethod
+    def index_building_progress(collection_name: str, index_name: str = "", using: str = "default",
+                                **kwargs) -> Dict:
+        cluster = cluster_of(using)
+        with cluster.rpc("GetIndexBuildProgress"):
+            state = cluster.get(collection_name)
+            index = state.indexes.get(index_name)
+            if index is None:
+                raise MilvusException(code=700, message=f"index not found[indexName={index_name}]")
+            pending = min(index["pending_index_rows"], state.rows)
+            return {"total_rows": state.rows, "indexed_rows": state.rows - pending, "pending_index_rows": pending,
+                    "state": "InProgress" if pending else "Finished"}
+
+    @staticmethod
+    def get_query_segment_info(collection_name: str, using: str = "default", **kwargs) -> List:
+        cluster = cluster_of(using)
+        with cluster.rpc("GetQuerySegmentInfo"):
+            state = cluster.get(collection_name)
+            if state.load_state != LoadState.Loaded:
+                return []
+            segments, rows = [], state.rows
+            for i in range(max(1, -(-rows // SEGMENT_ROWS)) if rows else 0):
+                num_rows = min(SEGMENT_ROWS, rows - i * SEGMENT_ROWS)
+                segments.append(SimpleNamespace(segmentID=state.id * 10_000 + i, partitionID=state.id,
+                                                mem_size=num_rows * DIM * 4, num_rows=num_rows, nodeIds=[1],
+                                                nodeID=1, state=3, level=2))
+            return segments
+
+
+@contextmanager
+def install(cluster: FakeCluster):
+    """Point the backend's client pool, routes and health checks at `cluster`."""
+    import api.milvus
+    import core.pool
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(core.pool, "MilvusClient",
+                                              lambda **kwargs: FakeMilvusClient(cluster, **kwargs)))
+        # Fake clients have no gRPC channel to intercept
+        stack.enter_context(mock.patch.object(core.pool, "instrument_client", lambda client: None))
+        stack.enter_context(mock.patch.object(core.pool, "utility", FakeUtility))
+        stack.enter_context(mock.patch.object(api.milvus, "utility", FakeUtility))
+        stack.enter_context(mock.patch.object(api.milvus, "Collection", FakeCollection))
+        yield cluster
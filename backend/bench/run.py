@@ -0,0 +1,283 @@
+"""Benchmark backend routes against a simulated cluster and compare with a stored baseline.
+
+    cd backend
+    python -m bench.run                                     # default matrix, table output
+    python -m bench.run --sizes 100,1000,5000 --concurrency 1,8,32 --latency-ms 2
+    python -m bench.run --save-baseline bench/baseline.json
+    python -m bench.run --baseline bench/baseline.json      # exit status 1 on more RPCs or errors
+"""
+import argparse
+import base64
+import itertools
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from bench.fake_milvus import DIM, FakeCluster, install
+
+HOST = "fake-milvus"
+PORT = 19530
+PREFIX = "bench_"
+JOB_DRAIN_TIMEOUT = 60
+
+
+def endpoint(path: str, **params) -> str:
+    query = "&".join(f"{k}={v}" for k, v in {"host": HOST, "port": PORT, **params}.items())
+    return f"/api/milvus{path}?{query}"
+
+
+def rename_request(names: List[str]) -> Callable:
+    """Each worker renames its own collection back and forth."""
+    def build(i: int, worker: int, j: int):
+        name = names[worker % len(names)]
+        old, new = (name, f"{name}_renamed") if j % 2 == 0 else (f"{name}_renamed", name)
+        return "POST", endpoint("/collection/rename"), {"old_name": old, "new_name": new}
+    return build
+
+
+def search_request(names: List[str]) -> Callable:
+    """A 16-vector top-10 search of each collection in turn."""
+    vectors = base64.b64encode(bytes(16 * DIM * 4)).decode()
+
+    def build(i: int, w: int, j: int):
+        return "POST", endpoint("/search"), {"collection": names[i % len(names)], "vectors_b64": vectors,
+                                              "limit": 10}
+    return build
+
+
+def fixed(method: str, url: str, body=None) -> Callable:
+    return lambda names: lambda i, w, j: (method, url, body)
+
+
+def per_collection(method: str, path: str) -> Callable:
+    """Cycles through the collections; `path` may contain {name}, otherwise it is a query parameter."""
+    def scenario(names: List[str]):
+        def build(i: int, w: int, j: int):
+            name = names[i % len(names)]
+            if "{name}" in path:
+                return method, endpoint(path.format(name=name)), None
+            return method, endpoint(path, name=name), None
+        return build
+    return scenario
+
+
+# name -> (names -> (request index, worker, worker's request index) -> (method, url, json body)).
+# Read-only routes come first; mutations run last since they change the simulated cluster.
+SCENARIOS: Dict[str, Callable] = {
+    "collections": fixed("GET", endpoint("/collections")),
+    "collections_page": fixed("GET", endpoint("/collections", sort="-entity_count", limit=50)),
+    "indexing": fixed("GET", endpoint("/indexing")),
+    "indexing_full": fixed("GET", endpoint("/indexing", full="true")),
+    "details": per_collection("GET", "/collections/{name}/details"),
+    "search": search_request,
+    "load": per_collection("POST", "/collections/load"),
+    "release": per_collection("POST", "/collections/release"),
+    "compact": per_collection("POST", "/collections/compact"),
+    "rename": rename_request,
+    "bulk_release": fixed("POST", endpoint("/collections/bulk"),
+                          {"action": "release", "pattern": f"{PREFIX}0*", "concurrency": 8}),
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))]
+
+
+def latency_summary(latencies_ms: List[float]) -> Dict:
+    lat = sorted(latencies_ms)
+    if not lat:
+        return {}
+    return {
+        "mean_ms": round(sum(lat) / len(lat), 3),
+        "p50_ms": round(percentile(lat, 50), 3),
+        "p95_ms": round(percentile(lat, 95), 3),
+        "p99_ms": round(percentile(lat, 99), 3),
+        "max_ms": round(lat[-1], 3),
+    }
+
+
+def wait_for_jobs():
+    """Let background load/compact jobs finish so their RPCs are charged to the scenario that started them."""
+    from core.jobs import job_manager
+
+    deadline = time.monotonic() + JOB_DRAIN_TIMEOUT
+    while time.monotonic() < deadline:
+        stats = job_manager.stats()
+        if not stats["pending"] and not stats["running"]:
+            return
+        time.sleep(0.05)
+
+
+def run_scenario(http, cluster: FakeCluster, build: Callable, requests: int, concurrency: int) -> Dict:
+    latencies, errors = [], []
+    lock = threading.Lock()
+    counter = itertools.count()
+
+    def worker(w: int):
+        per_worker = itertools.count()
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            method, url, body = build(i, w, next(per_worker))
+            started = time.perf_counter()
+            try:
+                response = http.request(method, url, json=body)
+                payload = response.json()
+                failed = response.status_code >= 400 or (isinstance(payload, dict)
+                                                          and payload.get("status") == "error")
+                error = payload.get("message", response.status_code) if failed else None
+            except Exception as e:
+                error = str(e)
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if error is not None:
+                    errors.append(str(error))
+
+    cluster.reset_counters()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+    wait_for_jobs()
+    rpcs = dict(cluster.rpc_counts)
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:3],
+        "req_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        **latency_summary(latencies),
+        "rpcs_per_request": round(sum(rpcs.values()) / max(1, len(latencies)), 2),
+        "peak_inflight_rpcs": cluster.peak_inflight,
+        "rpcs": dict(sorted(rpcs.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def run_matrix(sizes: List[int], levels: List[int], scenarios: List[str], requests: int, cluster_args: Dict,
+               progress=print) -> Dict[str, Dict]:
+    from fastapi.testclient import TestClient
+
+    from core.cache import metadata_cache
+    from core.pool import pool
+    from main import app
+
+    results = {}
+    for size, concurrency in itertools.product(sizes, levels):
+        cluster = FakeCluster(collections=size, prefix=PREFIX, **cluster_args)
+        names = sorted(cluster.collections)
+        with install(cluster), TestClient(app) as http:
+            metadata_cache.clear()
+            pool.close_all()
+            for name in scenarios:
+                build = SCENARIOS[name](names)
+                key = f"{name}/n={size}/c={concurrency}"
+                results[key] = run_scenario(http, cluster, build, requests, concurrency)
+                progress(format_row(key, results[key]))
+            pool.close_all()
+    return results
+
+
+def format_row(key: str, r: Dict) -> str:
+    return (f"{key:<36} p50 {r.get('p50_ms', 0):>9.2f}ms  p95 {r.get('p95_ms', 0):>9.2f}ms  "
+            f"{r['req_per_s']:>8.1f} req/s  {r['rpcs_per_request']:>9.1f} rpc/req  errors {r['errors']}")
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], latency_tolerance: float,
+            rpc_tolerance: float, min_latency_delta_ms: float) -> Tuple[List[str], List[str]]:
+    """Differences of `results` from `baseline`: (regressions, slower latencies).
+
+    RPCs per request and error counts don't depend on the machine or its load, so only they are
+    regressions. Latency percentiles of a few dozen requests vary from run to run and are advisory.
+    """
+    regressions, slower = [], []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            old, new = base.get(metric, 0), r.get(metric, 0)
+            if new > old * (1 + latency_tolerance) and new - old > min_latency_delta_ms:
+                slower.append(f"{key}: {metric} {old} -> {new}")
+        old, new = base["rpcs_per_request"], r["rpcs_per_request"]
+        if new > old * (1 + rpc_tolerance):
+            regressions.append(f"{key}: rpcs_per_request {old} -> {new}")
+        if r["errors"] > base["errors"]:
+            regressions.append(f"{key}: errors {base['errors']} -> {r['errors']}")
+    return regressions, slower
+
+
+def int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend routes against a simulated Milvus cluster.",
+                                     epilog=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int_list, default=[100, 1000], help="Collection counts, e.g. 100,1000")
+    parser.add_argument("--concurrency", type=int_list, default=[1, 8], help="Concurrent clients, e.g. 1,8,32")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("-n", "--requests", type=int, default=20, help="Requests per scenario")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Simulated latency of each RPC")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Latency varies by +/- this fraction")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of RPCs that fail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="Baseline JSON to compare with")
+    parser.add_argument("--save-baseline", default=None, help="Write the results as the new baseline")
+    parser.add_argument("--latency-tolerance", type=float, default=0.25,
+                        help="p50/p95 slowdown reported as advisory")
+    parser.add_argument("--min-latency-delta-ms", type=float, default=2.0,
+                        help="Ignore latency changes smaller than this")
+    parser.add_argument("--rpc-tolerance", type=float, default=0.1, help="Allowed increase in RPCs per request")
+    parser.add_argument("--fail-on-latency", action="store_true",
+                        help="Also fail on slower latencies (only meaningful on a quiet, dedicated machine)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Keep backend logging on")
+    args = parser.parse_args()
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+    from core import log
+    log.configure(level="INFO" if args.verbose else "CRITICAL")
+
+    cluster_args = {"latency_ms": args.latency_ms, "jitter": args.jitter, "failure_rate": args.failure_rate,
+                    "seed": args.seed}
+    results = run_matrix(args.sizes, args.concurrency, scenarios, args.requests, cluster_args)
+    report = {"config": {**cluster_args, "requests": args.requests}, "results": results}
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print(f"Warning: baseline was recorded with {baseline.get('config')}")
+        regressions, slower = compare(results, baseline["results"], args.latency_tolerance, args.rpc_tolerance,
+                                      args.min_latency_delta_ms)
+        if slower:
+            print(f"⚠️  {len(slower)} latencies slower than {args.baseline} (advisory, timings are noisy):")
+            for s in slower:
+                print(f"  {s}")
+        if args.fail_on_latency:
+            regressions += slower
+        if regressions:
+            print(f"❌ {len(regressions)} regressions against {args.baseline}:")
+            for r in regressions:
+                print(f"  {r}")
+            sys.exit(1)
+        print(f"✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
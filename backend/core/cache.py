@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("MILVUS_CACHE_MAX_ENTRIES", "4096"))
+DEFAULT_TTL = float(os.getenv("MILVUS_CACHE_TTL", "300"))
+
+
+class MetadataCache:
+    """Thread-safe TTL + LRU cache for Milvus metadata.
+
+    Keys are tuples that start with `(host, port, kind, collection_name)`, so every entry that
+    belongs to a collection can be dropped with `invalidate(host, port, collection_name)`.
+    Concurrent misses for the same key share one fetch (single flight). An invalidation marks only
+    the in-flight fetches it covers as stale, so their results are returned but not stored.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, default_ttl: float = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        # In-flight keys invalidated since their fetch started
+        self._stale: set = set()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "errors": 0}
+
+    def get_or_fetch(self, key: Tuple, fetch: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self._counters["misses"] += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._stale.discard(key)
+                self._counters["errors"] += 1
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            # Don't store a value fetched across an invalidation of its key: it may already be stale
+            if key in self._stale:
+                self._stale.discard(key)
+            else:
+                self._entries[key] = (time.monotonic() + (self.default_ttl if ttl is None else ttl), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._counters["evictions"] += 1
+        future.set_result(value)
+        return value
+
+    def invalidate(self, host: str, port, collection_name: Optional[str] = None) -> int:
+        """Drop entries for one collection, or for the whole endpoint when no name is given."""
+        port = int(port)
+
+        def matches(k: Tuple) -> bool:
+            return k[0] == host and k[1] == port and (collection_name is None or k[3] == collection_name)
+
+        with self._lock:
+            stale = [k for k in self._entries if matches(k)]
+            for k in stale:
+                del self._entries[k]
+            self._stale.update(k for k in self._inflight if matches(k))
+            self._counters["invalidations"] += 1
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stale.update(self._inflight)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                **self._counters,
+            }
+
+
+metadata_cache = MetadataCache()
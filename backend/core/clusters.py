@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+# JSON file with a list of cluster profiles; clusters added through the API are written back to it
+# (owner read/write only, since it may hold passwords)
+CLUSTERS_FILE = os.getenv("MILVUS_CLUSTERS_FILE", "")
+DEFAULT_SCRAPE_CONCURRENCY = int(os.getenv("MILVUS_INVENTORY_CONCURRENCY", "16"))
+# Per-collection fetches of all running scrapes share one pool of this many threads
+DEFAULT_FETCH_CONCURRENCY = int(os.getenv("MILVUS_INVENTORY_FETCH_CONCURRENCY", "16"))
+DEFAULT_SCRAPE_TIMEOUT = float(os.getenv("MILVUS_INVENTORY_TIMEOUT", "10"))
+DEFAULT_SNAPSHOT_MAX_AGE = float(os.getenv("MILVUS_INVENTORY_MAX_AGE", "60"))
+
+
+@dataclass
+class ClusterProfile:
+    name: str
+    host: str
+    port: int = 19530
+    user: str = ""
+    password: str = ""
+    token: str = ""
+    tags: List[str] = field(default_factory=list)
+    # Environment variables holding the password / token, so the secrets stay out of the file
+    password_env: str = ""
+    token_env: str = ""
+
+    def credentials(self) -> Tuple[str, str]:
+        """Password and token; a `*_env` variable takes precedence over the stored value."""
+        password = os.getenv(self.password_env, "") if self.password_env else self.password
+        token = os.getenv(self.token_env, "") if self.token_env else self.token
+        return password, token
+
+    def to_dict(self, secrets: bool = False) -> Dict:
+        data = asdict(self)
+        if not secrets:
+            data["password"] = "***" if self.password else ""
+            data["token"] = "***" if self.token else ""
+        return data
+
+
+class ClusterRegistry:
+    """Named Milvus cluster profiles, optionally backed by a JSON file."""
+
+    def __init__(self, path: str = CLUSTERS_FILE):
+        self.path = path
+        self._profiles: Dict[str, ClusterProfile] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for entry in json.load(f):
+                    profile = ClusterProfile(**entry)
+                    self._profiles[profile.name] = profile
+
+    def list(self, names: Optional[List[str]] = None, tag: Optional[str] = None) -> List[ClusterProfile]:
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [p for p in profiles if (not names or p.name in names) and (tag is None or tag in p.tags)]
+
+    def get(self, name: str) -> Optional[ClusterProfile]:
+        with self._lock:
+            return self._profiles.get(name)
+
+    def add(self, profile: ClusterProfile):
+        with self._lock:
+            self._profiles[profile.name] = profile
+            self._save_locked()
+
+    def remove(self, name: str) -> Optional[ClusterProfile]:
+        with self._lock:
+            profile = self._profiles.pop(name, None)
+            if profile is not None:
+                self._save_locked()
+            return profile
+
+    def _save_locked(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        # The mode above only applies to new files
+        os.chmod(tmp, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump([p.to_dict(secrets=True) for p in self._profiles.values()], f, indent=2)
+        os.replace(tmp, self.path)
+
+
+@dataclass
+class ClusterSnapshot:
+    rows: List[Dict]
+    scraped_at: float
+    elapsed_ms: float
+
+
+class InventoryScraper:
+    """Scrapes many clusters in parallel and keeps the last good snapshot of each.
+
+    `scrape(profile)` runs in a worker thread and returns the cluster's collection rows; it should
+    fan out on `fetch_executor`, which bounds the threads of all scrapes together. A scrape
+    that doesn't finish within the request timeout is reported as such (with the previous
+    snapshot, if any) and keeps running in the background, so its result is ready for the next
+    request. Only one scrape per cluster is in flight at a time.
+    """
+
+    def __init__(self, scrape: Callable[[ClusterProfile], List[Dict]],
+                 concurrency: int = DEFAULT_SCRAPE_CONCURRENCY, fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY):
+        self.scrape = scrape
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="inventory")
+        self.fetch_executor = ThreadPoolExecutor(max_workers=fetch_concurrency, thread_name_prefix="inventory-fetch")
+        self._snapshots: Dict[str, ClusterSnapshot] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def collect(self, profiles: List[ClusterProfile], timeout: float = DEFAULT_SCRAPE_TIMEOUT,
+                max_age: float = DEFAULT_SNAPSHOT_MAX_AGE) -> Dict[str, Dict]:
+        """Per-cluster result: status (ok, cached, timeout, error), age, rows and error."""
+        now = time.time()
+        futures = {}
+        with self._lock:
+            for p in profiles:
+                snapshot = self._snapshots.get(p.name)
+                if snapshot is not None and now - snapshot.scraped_at <= max_age:
+                    continue
+                future = self._inflight.get(p.name)
+                if future is None:
+                    future = self._executor.submit(self._scrape, p)
+                    self._inflight[p.name] = future
+                futures[p.name] = future
+        if futures:
+            wait(futures.values(), timeout=timeout)
+
+        results = {}
+        with self._lock:
+            for p in profiles:
+                future = futures.get(p.name)
+                snapshot = self._snapshots.get(p.name)
+                if future is None:
+                    status, error = "cached", ""
+                elif not future.done():
+                    status, error = "timeout", f"No response within {timeout}s"
+                elif future.exception() is not None:
+                    status, error = "error", str(future.exception())
+                else:
+                    status, error = "ok", ""
+                results[p.name] = {
+                    "status": status,
+                    "error": error,
+                    "rows": snapshot.rows if snapshot else [],
+                    "scraped_at": snapshot.scraped_at if snapshot else None,
+                    "age_s": round(time.time() - snapshot.scraped_at, 3) if snapshot else None,
+                    "elapsed_ms": snapshot.elapsed_ms if snapshot else None,
+                }
+        return results
+
+    def forget(self, name: str):
+        with self._lock:
+            self._snapshots.pop(name, None)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.fetch_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _scrape(self, profile: ClusterProfile):
+        started = time.perf_counter()
+        try:
+            rows = self.scrape(profile)
+            with self._lock:
+                self._snapshots[profile.name] = ClusterSnapshot(
+                    rows=rows, scraped_at=time.time(), elapsed_ms=round((time.perf_counter() - started) * 1000, 2))
+        finally:
+            with self._lock:
+                self._inflight.pop(profile.name, None)
@@ -0,0 +1,206 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from core.log import fields, get_logger, request_id_var, trace_var
+
+DEFAULT_MAX_WORKERS = int(os.getenv("MILVUS_JOB_WORKERS", "4"))
+DEFAULT_HISTORY_SIZE = int(os.getenv("MILVUS_JOB_HISTORY", "500"))
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+logger = get_logger("jobs")
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+ACTIVE_STATES = (PENDING, RUNNING)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    target: str
+    host: str
+    port: int
+    state: str = PENDING
+    progress: float = 0.0
+    detail: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+# A runner gets its job and a `report(progress=None, **detail)` callback, and may return
+# extra detail to merge into the job when it finishes.
+JobRunner = Callable[[Job, Callable[..., None]], Optional[Dict]]
+
+
+class JobManager:
+    """Runs long Milvus operations (load, release, compact...) on a bounded worker pool.
+
+    Submitting returns a Job right away; its state and progress are updated from the worker
+    thread and every change is pushed to event subscribers. Submitting the same kind of job for
+    a target that already has an active one returns the existing job.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.max_workers = max_workers
+        self.history_size = history_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping = threading.Event()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping.clear()
+
+    async def stop(self):
+        """Cancel queued jobs and make running ones stop at their next `sleep`.
+
+        Queued jobs never start, so they are marked failed here rather than left pending.
+        """
+        self._stopping.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        now = time.time()
+        with self._lock:
+            cancelled = [j for j in self._jobs.values() if j.state == PENDING]
+            for job in cancelled:
+                job.state = FAILED
+                job.error = "Cancelled: the job manager shut down before the job started"
+                job.finished_at = now
+        for job in cancelled:
+            self._emit(job)
+        self._loop = None
+
+    def sleep(self, seconds: float):
+        """Sleep between polls inside a runner; raises JobCancelled when the manager stops."""
+        if self._stopping.wait(seconds):
+            raise JobCancelled("Job manager is shutting down")
+
+    def submit(self, kind: str, target: str, host: str, port: int, runner: JobRunner) -> Job:
+        with self._lock:
+            for job in self._jobs.values():
+                if (job.kind, job.target, job.host, job.port) == (kind, target, host, int(port)) \
+                        and job.state in ACTIVE_STATES:
+                    return job
+            job = Job(id=uuid.uuid4().hex, kind=kind, target=target, host=host, port=int(port))
+            self._jobs[job.id] = job
+            self._trim_locked()
+        self._emit(job)
+        self._get_executor().submit(self._run, job, runner)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, state: Optional[str] = None, kind: Optional[str] = None) -> List[Job]:
+        with self._lock:
+            return [
+                j for j in reversed(self._jobs.values())
+                if (state is None or j.state == state) and (kind is None or j.kind == kind)
+            ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = {s: 0 for s in (PENDING, RUNNING, SUCCEEDED, FAILED)}
+            for j in self._jobs.values():
+                counts[j.state] += 1
+            return {"max_workers": self.max_workers, **counts}
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="milvus-job")
+            return self._executor
+
+    def _run(self, job: Job, runner: JobRunner):
+        def report(progress: Optional[float] = None, **detail):
+            with self._lock:
+                if progress is not None:
+                    job.progress = float(progress)
+                job.detail.update(detail)
+            self._emit(job)
+
+        # RPCs made by the job carry its id instead of the id of the request that submitted it
+        request_id_var.set(f"job-{job.id[:12]}")
+        trace_var.set(None)
+        with self._lock:
+            if job.state != PENDING:  # cancelled by stop() while queued
+                return
+            job.state = RUNNING
+            job.started_at = time.time()
+        self._emit(job)
+        try:
+            result = runner(job, report)
+            with self._lock:
+                job.detail.update(result or {})
+                job.progress = 100.0
+                job.state = SUCCEEDED
+        except Exception as e:
+            logger.exception("job failed", extra=fields(kind=job.kind, target=job.target, job_id=job.id))
+            with self._lock:
+                job.error = str(e)
+                job.state = FAILED
+        finally:
+            with self._lock:
+                job.finished_at = time.time()
+            self._emit(job)
+
+    def _trim_locked(self):
+        finished = [j.id for j in self._jobs.values() if j.state not in ACTIVE_STATES]
+        for job_id in finished[:max(0, len(self._jobs) - self.history_size)]:
+            del self._jobs[job_id]
+
+    def _emit(self, job: Job):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        with self._lock:
+            event = job.to_dict()
+        try:
+            loop.call_soon_threadsafe(self._publish, event)
+        except RuntimeError:  # loop closed during shutdown
+            pass
+
+    def _publish(self, event: Dict):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: drop its oldest event
+                queue.get_nowait()
+                queue.put_nowait(event)
+
+
+job_manager = JobManager()
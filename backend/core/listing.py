@@ -0,0 +1,81 @@
+import base64
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Sortable collection fields and the value used for rows whose info couldn't be fetched
+SORT_FIELDS = {"name": "", "description": "", "index_type": "", "entity_count": 0, "loaded": 0}
+
+SortKey = Tuple
+
+
+def parse_sort(sort: str) -> Tuple[str, bool]:
+    """"entity_count" / "-entity_count" -> (field, descending)."""
+    descending = sort.startswith("-")
+    field = sort.lstrip("-+")
+    if field not in SORT_FIELDS:
+        raise ValueError(f"Unsupported sort field '{field}', expected one of {', '.join(SORT_FIELDS)}")
+    return field, descending
+
+
+def filter_names(names: List[str], prefix: Optional[str] = None, regex: Optional[str] = None) -> List[str]:
+    if prefix:
+        names = [n for n in names if n.startswith(prefix)]
+    if regex:
+        try:
+            pattern = re.compile(regex)
+        except re.error as e:
+            raise ValueError(f"Invalid regex '{regex}': {e}")
+        names = [n for n in names if pattern.search(n)]
+    return names
+
+
+def sort_key(field: str, name: str, value: Any, descending: bool) -> SortKey:
+    """(missing, value, name): ties break on name, and rows without a value sort last either way."""
+    missing = value is None
+    return (int(missing != descending), SORT_FIELDS[field] if missing else value, name)
+
+
+def sort_names(names: List[str], field: str, descending: bool,
+               value_of: Callable[[str], Any]) -> List[Tuple[SortKey, str]]:
+    """Sort names by `value_of(name)` (only called when sorting on something other than the name)."""
+    if field == "name":
+        keys = [(sort_key(field, n, n, descending), n) for n in names]
+    else:
+        keys = [(sort_key(field, n, value_of(n), descending), n) for n in names]
+    keys.sort(key=lambda k: k[0], reverse=descending)
+    return keys
+
+
+def encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    try:
+        return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode())))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def paginate(keys: List[Tuple[SortKey, str]], descending: bool, offset: int = 0, limit: Optional[int] = None,
+             cursor: Optional[str] = None) -> Dict:
+    """Pick one page of sorted names.
+
+    A cursor (the `next_cursor` of the previous page) continues after the last row returned,
+    so pages stay consistent while collections are created or dropped; `offset` is applied
+    after it.
+    """
+    if cursor:
+        after = decode_cursor(cursor)
+        try:
+            start = next((i for i, (k, _) in enumerate(keys) if (k < after if descending else k > after)), len(keys))
+        except TypeError:
+            raise ValueError("Cursor doesn't match the requested sort")
+        keys = keys[start:]
+    page = keys[offset:] if limit is None else keys[offset:offset + limit]
+    has_more = limit is not None and offset + limit < len(keys)
+    return {
+        "names": [n for _, n in page],
+        "next_cursor": encode_cursor(page[-1][0]) if has_more and page else None,
+    }
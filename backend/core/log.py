@@ -0,0 +1,140 @@
+import contextvars
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "json" (one object per line) or "text" for local development
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Share of requests whose timing spans are recorded and logged
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+# Requests slower than this are always logged with their spans
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+# Client supplied request ids end up in logs and gRPC metadata, so only short plain tokens are kept
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+trace_var: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("trace", default=None)
+
+
+class Trace:
+    """Timing spans of one sampled request; spans may be added from worker threads."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, started: float, **attrs):
+        span = {"name": name, "start_ms": round((started - self.started) * 1000, 3),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3), **attrs}
+        with self._lock:
+            self.spans.append(span)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = request_id_var.get()
+        if request_id:
+            entry["request_id"] = request_id
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{self.formatTime(record)} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        request_id = request_id_var.get()
+        if request_id:
+            line += f" request_id={request_id}"
+        fields = getattr(record, "fields", {})
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def configure(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT):
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    root = logging.getLogger("milvus_admin")
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+    root.propagate = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f"milvus_admin.{name}")
+
+
+def fields(**kwargs) -> Dict:
+    """`extra=` for structured fields: logger.info("msg", extra=fields(collection=name))."""
+    return {"fields": kwargs}
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def start_request(request_id: Optional[str] = None, sample_rate: float = TRACE_SAMPLE_RATE):
+    """Bind a request id (and, for sampled requests, a Trace) to the current context.
+
+    An id that doesn't match REQUEST_ID_PATTERN is replaced by a generated one.
+    """
+    if not request_id or not REQUEST_ID_PATTERN.fullmatch(request_id):
+        request_id = new_request_id()
+    request_id_var.set(request_id)
+    trace_var.set(Trace() if random.random() < sample_rate else None)
+    return request_id_var.get()
+
+
+def current_request_id() -> Optional[str]:
+    return request_id_var.get()
+
+
+def current_trace() -> Optional[Trace]:
+    return trace_var.get()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a block as a span of the current request; free when the request isn't sampled."""
+    trace = trace_var.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, started, **attrs)
+
+
+def propagate(fn: Callable) -> Callable:
+    """Wrap `fn` to run in a copy of the caller's context, so executor threads keep the
+    request id and trace."""
+    ctx = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return ctx.copy().run(fn, *args, **kwargs)
+    return run
+
+
+configure()
@@ -0,0 +1,113 @@
+import time
+from typing import Callable, Dict
+
+import grpc
+from prometheus_client import CollectorRegistry, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+from pymilvus import MilvusClient
+from pymilvus.grpc_gen import milvus_pb2_grpc
+
+from core.log import current_request_id, current_trace, get_logger
+
+logger = get_logger("metrics")
+
+registry = CollectorRegistry()
+
+# Buckets from 1ms to 60s: covers metadata RPCs as well as loads and large queries
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+http_request_seconds = Histogram(
+    "milvus_admin_http_request_seconds", "Backend request latency by route",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS, registry=registry
+)
+milvus_rpc_seconds = Histogram(
+    "milvus_admin_rpc_seconds", "Milvus gRPC call latency by method",
+    ["method", "code"], buckets=LATENCY_BUCKETS, registry=registry
+)
+
+
+class RpcMetricsInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Times every unary Milvus RPC (MilvusClient and ORM calls share the channel).
+
+    The current request id is sent as `client-request-id` metadata, which Milvus logs with the
+    call, and sampled requests get a span per RPC.
+    """
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        request_id = current_request_id()
+        metadata = list(client_call_details.metadata or [])
+        if request_id and not any(k == "client-request-id" for k, _ in metadata):
+            client_call_details = client_call_details._replace(metadata=metadata + [("client-request-id", request_id)])
+        trace = current_trace()
+        started = time.perf_counter()
+        response = continuation(client_call_details, request)
+        method = client_call_details.method.rsplit("/", 1)[-1]
+
+        def observe(call):
+            try:
+                code = call.code().name if call.code() is not None else "UNKNOWN"
+            except Exception:
+                code = "UNKNOWN"
+            milvus_rpc_seconds.labels(method, code).observe(time.perf_counter() - started)
+            if trace is not None:
+                trace.add(f"rpc {method}", started, code=code)
+
+        # Blocking calls are already done and run the callback immediately; futures run it on completion
+        response.add_done_callback(observe)
+        return response
+
+
+def instrument_handler(handler) -> bool:
+    """Route a pymilvus GrpcHandler's RPCs through the metrics interceptor, the way pymilvus adds its own.
+
+    pymilvus has no public hook for this: a channel passed to `connections.connect` is deep-copied
+    (which gRPC channels refuse), and wrapping MilvusClient methods would miss ORM calls. So this is
+    the one place that touches the handler's private `_final_channel` and `_stub`;
+    tests/test_metrics.py fails if a pymilvus upgrade drops them. Returns False, leaving the
+    handler as it was, when they are missing.
+    """
+    channel = getattr(handler, "_final_channel", None)
+    if channel is None or not hasattr(handler, "_stub"):
+        logger.warning("pymilvus GrpcHandler has no _final_channel/_stub, Milvus RPCs are not instrumented")
+        return False
+    handler._final_channel = grpc.intercept_channel(channel, RpcMetricsInterceptor())
+    handler._stub = milvus_pb2_grpc.MilvusServiceStub(handler._final_channel)
+    return True
+
+
+def instrument_client(client: MilvusClient) -> bool:
+    return instrument_handler(client._get_connection())
+
+
+class StatsCollector:
+    """Exposes `stats()` dicts of long-lived components as gauges and counters at scrape time."""
+
+    def __init__(self, sources: Dict[str, Callable[[], Dict]], counters: Dict[str, tuple]):
+        self.sources = sources
+        self.counters = counters
+
+    def collect(self):
+        for name, stats in self.sources.items():
+            try:
+                values = stats()
+            except Exception:
+                continue
+            counter_keys = self.counters.get(name, ())
+            for key, value in values.items():
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    continue
+                metric = f"milvus_admin_{name}_{key}"
+                if key in counter_keys:
+                    family = CounterMetricFamily(metric, f"{name} {key}")
+                else:
+                    family = GaugeMetricFamily(metric, f"{name} {key}")
+                family.add_metric([], value)
+                yield family
+
+
+def register_stats(sources: Dict[str, Callable[[], Dict]], counters: Dict[str, tuple]):
+    registry.register(StatsCollector(sources, counters))
+
+
+def render() -> tuple:
+    return generate_latest(registry), CONTENT_TYPE_LATEST
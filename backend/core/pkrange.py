@@ -0,0 +1,69 @@
+from typing import Callable, List, Optional
+
+# Max number of rows a single Milvus query may return
+QUERY_WINDOW = 16384
+INT64_MAX = 2 ** 63 - 1
+# Queries one search may run; covers the worst case over the whole int64 range (~110)
+DEFAULT_MAX_QUERIES = 128
+
+# Also imported by milvus/maxid.py (from the repository checkout), so keep this module dependency free
+
+
+def find_extreme_pk(query_ids: Callable[[str], List[int]], pk: str, largest: bool = True,
+                    max_queries: Optional[int] = DEFAULT_MAX_QUERIES) -> Optional[int]:
+    """Find the max (or min) INT64 primary key with range queries.
+
+    `query_ids(expr)` returns the keys of at most QUERY_WINDOW rows matching `expr`, in any
+    order. A probe `pk >= x` that returns fewer than QUERY_WINDOW rows holds every key >= x,
+    so its max is the answer. A full window raises the lower bound to the largest key seen,
+    so gaps in the key space never hide keys. The min is found the same way on negated keys.
+
+    Cost: each query returns up to QUERY_WINDOW rows. Galloping and bisecting each take up to
+    log2(key span / QUERY_WINDOW) queries, so the worst case is about 2 * log2(max / QUERY_WINDOW):
+    ~45 queries for keys up to 2^30, ~100 across the whole int64 range. Dense keys take about a dozen.
+    More than `max_queries` (None: no limit) raises RuntimeError.
+    """
+    sign = 1 if largest else -1
+    op = ">=" if largest else "<="
+    used = 0
+
+    def query(expr):
+        nonlocal used
+        if max_queries is not None and used >= max_queries:
+            raise RuntimeError(f"Gave up finding the {'max' if largest else 'min'} {pk} after {used} queries")
+        used += 1
+        return query_ids(expr)
+
+    def probe(x):
+        return [sign * i for i in query(f"{pk} {op} {sign * x}")]
+
+    ids = [sign * i for i in query("")]
+    if not ids:
+        return None
+    low = max(ids)
+    if len(ids) < QUERY_WINDOW:
+        return sign * low
+
+    # Gallop up from the largest key seen until a probe comes back short of a full window
+    step = QUERY_WINDOW
+    while True:
+        x = min(low + step, INT64_MAX)
+        ids = probe(x)
+        if not ids:
+            high = x - 1
+            break
+        low = max(low, max(ids))
+        if len(ids) < QUERY_WINDOW or x == INT64_MAX:
+            return sign * low
+        step *= 2
+
+    while low < high:
+        mid = (low + high + 1) // 2
+        ids = probe(mid)
+        if not ids:
+            high = mid - 1
+        elif len(ids) < QUERY_WINDOW:
+            return sign * max(ids)
+        else:
+            low = max(ids)
+    return sign * low
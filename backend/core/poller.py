@@ -0,0 +1,206 @@
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from core.log import fields, get_logger
+
+DEFAULT_POLL_INTERVAL = float(os.getenv("MILVUS_POLL_INTERVAL", "30"))
+SUBSCRIBER_QUEUE_SIZE = 100
+# Pause before the refresh loop carries on after an unexpected error (seconds)
+ERROR_RETRY_SECONDS = 5.0
+
+logger = get_logger("poller")
+
+Endpoint = Tuple[str, int]
+
+
+def diff_snapshots(old: Dict[str, Dict], new: Dict[str, Dict]) -> Dict[str, List]:
+    """Rows added, removed (names only) and changed between two name -> row snapshots."""
+    return {
+        "added": [row for name, row in new.items() if name not in old],
+        "removed": [name for name in old if name not in new],
+        "changed": [row for name, row in new.items() if name in old and old[name] != row],
+    }
+
+
+@dataclass
+class TrackedEndpoint:
+    subscribers: Set[asyncio.Queue] = field(default_factory=set)
+    snapshot: Optional[Dict[str, Dict]] = None
+    refreshed_at: float = 0.0
+    next_refresh: float = 0.0
+    error: Optional[str] = None
+
+
+class CollectionSnapshotPoller:
+    """Refreshes the collection list of every subscribed Milvus endpoint once per interval and
+    pushes the differences to subscribers, so Milvus sees one poller per endpoint no matter how
+    many dashboards are open.
+
+    `fetch_snapshot(host, port)` runs in a worker thread and returns a list of collection rows
+    (dicts with a "name" key).
+    """
+
+    def __init__(self, fetch_snapshot: Callable[[str, int], List[Dict]], interval: float = DEFAULT_POLL_INTERVAL):
+        self.fetch_snapshot = fetch_snapshot
+        self.interval = interval
+        self._endpoints: Dict[Endpoint, TrackedEndpoint] = {}
+        # Guards adding and removing endpoints/subscribers against stats() readers in other threads
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self, host: str, port: int) -> asyncio.Queue:
+        """Register a subscriber; must be called from the event loop."""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            tracked = self._endpoints.setdefault((host, int(port)), TrackedEndpoint())
+            tracked.subscribers.add(queue)
+        if tracked.snapshot is not None:
+            queue.put_nowait(self._snapshot_event(tracked))
+        else:
+            tracked.next_refresh = 0.0
+            self._wake()
+        return queue
+
+    def unsubscribe(self, host: str, port: int, queue: asyncio.Queue):
+        key = (host, int(port))
+        with self._lock:
+            tracked = self._endpoints.get(key)
+            if tracked is None:
+                return
+            tracked.subscribers.discard(queue)
+            if not tracked.subscribers:
+                del self._endpoints[key]
+
+    def request_refresh(self, host: str, port: int):
+        """Ask for an early refresh of an endpoint (e.g. after a mutation). Safe from any thread."""
+        if self._loop is None or self._loop.is_closed():
+            return
+
+        def schedule():
+            tracked = self._endpoints.get((host, int(port)))
+            if tracked is not None:
+                tracked.next_refresh = 0.0
+                self._wake()
+
+        self._loop.call_soon_threadsafe(schedule)
+
+    def stats(self) -> Dict:
+        """Safe from any thread."""
+        with self._lock:
+            endpoints = [
+                {
+                    "host": host,
+                    "port": port,
+                    "subscribers": len(tracked.subscribers),
+                    "collections": len(tracked.snapshot or {}),
+                    "refreshed_at": tracked.refreshed_at,
+                    "error": tracked.error,
+                }
+                for (host, port), tracked in self._endpoints.items()
+            ]
+        return {"interval": self.interval, "endpoints": endpoints}
+
+    def totals(self) -> Dict:
+        endpoints = self.stats()["endpoints"]
+        return {"endpoints": len(endpoints), "subscribers": sum(e["subscribers"] for e in endpoints)}
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await self._refresh_due()
+            except Exception:
+                logger.exception("snapshot poller iteration failed")
+                await asyncio.sleep(ERROR_RETRY_SECONDS)
+                continue
+
+            upcoming = [tracked.next_refresh for tracked in self._endpoints.values()]
+            timeout = max(0.0, min(upcoming) - time.monotonic()) if upcoming else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh_due(self):
+        now = time.monotonic()
+        due = [key for key, tracked in self._endpoints.items() if tracked.next_refresh <= now]
+        results = await asyncio.gather(*(self._refresh(key) for key in due), return_exceptions=True)
+        for (host, port), result in zip(due, results):
+            if isinstance(result, Exception):
+                logger.error("snapshot refresh crashed", exc_info=result, extra=fields(host=host, port=port))
+                tracked = self._endpoints.get((host, port))
+                if tracked is not None:
+                    tracked.next_refresh = time.monotonic() + self.interval
+
+    async def _refresh(self, key: Endpoint):
+        host, port = key
+        try:
+            rows = await asyncio.to_thread(self.fetch_snapshot, host, port)
+            error = None
+        except Exception as e:
+            logger.warning("snapshot refresh failed", exc_info=True, extra=fields(host=host, port=port))
+            rows, error = None, str(e)
+
+        tracked = self._endpoints.get(key)
+        if tracked is None:  # every subscriber left while we were fetching
+            return
+        tracked.next_refresh = time.monotonic() + self.interval
+        if error is not None:
+            if error != tracked.error:
+                self._publish(tracked, {"type": "error", "message": error})
+            tracked.error = error
+            return
+
+        tracked.error = None
+        tracked.refreshed_at = time.time()
+        snapshot = {row["name"]: row for row in rows}
+        previous, tracked.snapshot = tracked.snapshot, snapshot
+        if previous is None:
+            self._publish(tracked, self._snapshot_event(tracked))
+            return
+        diff = diff_snapshots(previous, snapshot)
+        if any(diff.values()):
+            self._publish(tracked, {"type": "diff", "refreshed_at": tracked.refreshed_at, **diff})
+
+    def _publish(self, tracked: TrackedEndpoint, event: Dict):
+        for queue in tracked.subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: drop its backlog and resync it with a full snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                if tracked.snapshot is not None:
+                    queue.put_nowait(self._snapshot_event(tracked))
+
+    @staticmethod
+    def _snapshot_event(tracked: TrackedEndpoint) -> Dict:
+        return {
+            "type": "snapshot",
+            "refreshed_at": tracked.refreshed_at,
+            "collections": list(tracked.snapshot.values()),
+        }
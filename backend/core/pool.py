@@ -0,0 +1,238 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from pymilvus import MilvusClient, utility
+
+from core.log import fields, get_logger, span
+from core.metrics import instrument_client
+
+DEFAULT_MAX_SIZE = int(os.getenv("MILVUS_POOL_MAX_SIZE", "16"))
+DEFAULT_IDLE_TIMEOUT = float(os.getenv("MILVUS_POOL_IDLE_TIMEOUT", "300"))
+DEFAULT_HEALTH_CHECK_INTERVAL = float(os.getenv("MILVUS_POOL_HEALTH_CHECK_INTERVAL", "30"))
+HEALTH_CHECK_TIMEOUT = 5
+
+logger = get_logger("pool")
+
+# (host, port, user, password, token)
+PoolKey = Tuple[str, int, str, str, str]
+
+
+def alias_of(client: MilvusClient) -> str:
+    """ORM connection alias owned by a MilvusClient.
+
+    MilvusClient registers its own alias in `connections`, so `Collection(..., using=...)`
+    and `utility.*(using=...)` can share the client's gRPC channel instead of opening a second one.
+    """
+    return client._using
+
+
+def compaction_plans(client: MilvusClient, compaction_id: int) -> list:
+    """Merge plans of a compaction job: the source segments of each and the segment they become.
+
+    Neither MilvusClient nor `utility` exposes them, and `Collection.get_compaction_plans` only
+    reads a compaction started from that Collection object, so this is the one call that goes to
+    the client's gRPC handler directly; tests/test_pool.py fails if a pymilvus upgrade drops it.
+    """
+    return client._get_connection().get_compaction_plans(compaction_id).plans
+
+
+@dataclass
+class PooledClient:
+    key: PoolKey
+    client: MilvusClient
+    created_at: float
+    last_used: float
+    last_checked: float
+    in_use: int = 0
+    # Removed from the pool while requests still held it; the last release closes it
+    retired: bool = False
+
+    @property
+    def alias(self) -> str:
+        return alias_of(self.client)
+
+
+class MilvusClientPool:
+    """Process-wide cache of long-lived MilvusClient instances keyed by endpoint and credentials.
+
+    A single client is shared by all concurrent requests for the same key (the underlying
+    gRPC channel is thread safe). Idle clients are closed after `idle_timeout` seconds, the
+    least recently used idle client is closed when the pool grows past `max_size`, and a
+    client that has not been used for `health_check_interval` seconds is pinged before reuse.
+    A client dropped while other requests hold it (failed health check, close_all) is closed
+    once the last of them releases it.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+    ):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._entries: "OrderedDict[PoolKey, PooledClient]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[PoolKey, threading.Lock] = {}
+        self._counters = {"created": 0, "reused": 0, "evicted": 0, "health_failures": 0}
+
+    @staticmethod
+    def make_key(host: str, port, user: str = "", password: str = "", token: str = "") -> PoolKey:
+        return host, int(port), user or "", password or "", token or ""
+
+    @contextmanager
+    def client(self, host: str, port, user: str = "", password: str = "", token: str = ""):
+        with span("pool.acquire", host=host):
+            entry = self._acquire(self.make_key(host, port, user, password, token))
+        try:
+            yield entry.client
+        finally:
+            self._release(entry)
+
+    def ping(self, host: str, port, user: str = "", password: str = "", token: str = "") -> bool:
+        with self.client(host, port, user, password, token) as client:
+            utility.get_server_version(using=alias_of(client), timeout=HEALTH_CHECK_TIMEOUT)
+            return True
+
+    def evict_idle(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                e for e in self._entries.values()
+                if e.in_use == 0 and now - e.last_used > self.idle_timeout
+            ]
+            for e in expired:
+                self._remove_locked(e)
+        self._close(expired)
+        return len(expired)
+
+    def close_all(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            for e in entries:
+                self._remove_locked(e)
+            idle = [e for e in entries if e.in_use == 0]
+        self._close(idle)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "in_use": sum(e.in_use for e in self._entries.values()),
+                **self._counters,
+            }
+
+    def _key_lock(self, key: PoolKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _acquire(self, key: PoolKey) -> PooledClient:
+        self.evict_idle()
+        # Per-key lock: concurrent first requests for an endpoint share one handshake
+        with self._key_lock(key):
+            entry = self._checkout(key)
+            if entry is not None and not self._is_healthy(entry):
+                self._discard(entry)
+                entry = None
+            if entry is None:
+                entry = self._connect(key)
+        return entry
+
+    def _checkout(self, key: PoolKey) -> Optional[PooledClient]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.in_use += 1
+            entry.last_used = time.monotonic()
+            self._entries.move_to_end(key)
+            self._counters["reused"] += 1
+            return entry
+
+    def _is_healthy(self, entry: PooledClient) -> bool:
+        now = time.monotonic()
+        if now - entry.last_checked < self.health_check_interval:
+            return True
+        try:
+            utility.get_server_version(using=entry.alias, timeout=HEALTH_CHECK_TIMEOUT)
+        except Exception as e:
+            logger.warning("pooled client failed health check",
+                           extra=fields(host=entry.key[0], port=entry.key[1], error=str(e)))
+            with self._lock:
+                self._counters["health_failures"] += 1
+            return False
+        entry.last_checked = now
+        return True
+
+    def _connect(self, key: PoolKey) -> PooledClient:
+        host, port, user, password, token = key
+        client = MilvusClient(uri=f"http://{host}:{port}", user=user, password=password, token=token)
+        instrument_client(client)
+        now = time.monotonic()
+        entry = PooledClient(key=key, client=client, created_at=now, last_used=now, last_checked=now, in_use=1)
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                # Another thread connected first (its key lock was pruned meanwhile): share its client
+                existing.in_use += 1
+                existing.last_used = now
+                overflow = [entry]
+                entry = existing
+            else:
+                self._entries[key] = entry
+                self._counters["created"] += 1
+                overflow = self._overflow_locked()
+        self._close(overflow)
+        return entry
+
+    def _overflow_locked(self) -> List[PooledClient]:
+        overflow = []
+        for e in list(self._entries.values()):
+            if len(self._entries) <= self.max_size:
+                break
+            if e.in_use == 0:
+                self._remove_locked(e)
+                overflow.append(e)
+        return overflow
+
+    def _remove_locked(self, entry: PooledClient):
+        """Take `entry` out of the pool (it is closed once no request holds it) and prune its key lock."""
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+        entry.retired = True
+        lock = self._key_locks.get(entry.key)
+        if lock is not None and not lock.locked():
+            del self._key_locks[entry.key]
+
+    def _discard(self, entry: PooledClient):
+        with self._lock:
+            self._remove_locked(entry)
+        self._release(entry)
+
+    def _release(self, entry: PooledClient):
+        with self._lock:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            close = entry.retired and entry.in_use == 0
+        if close:
+            self._close([entry])
+
+    def _close(self, entries: List[PooledClient]):
+        for e in entries:
+            try:
+                e.client.close()
+            except Exception as ex:
+                logger.warning("failed to close client", extra=fields(host=e.key[0], port=e.key[1], error=str(ex)))
+        if entries:
+            with self._lock:
+                self._counters["evicted"] += len(entries)
+
+
+pool = MilvusClientPool()
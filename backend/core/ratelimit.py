@@ -0,0 +1,23 @@
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Spaces calls evenly so that at most `rate` of them start per second (None = unlimited).
+    Safe to share between threads."""
+
+    def __init__(self, rate: Optional[float] = None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
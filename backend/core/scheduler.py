@@ -0,0 +1,209 @@
+import asyncio
+import datetime
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.jobs import Job, SUCCEEDED, FAILED
+from core.log import fields, get_logger
+
+DEFAULT_MAX_CONCURRENT = int(os.getenv("MILVUS_COMPACT_MAX_CONCURRENT", "2"))
+# Comma separated local-time windows, e.g. "22:00-06:00,12:30-13:30"; empty = any time
+DEFAULT_WINDOWS = os.getenv("MILVUS_COMPACT_WINDOWS", "")
+DEFAULT_HISTORY_SIZE = int(os.getenv("MILVUS_JOB_HISTORY", "500"))
+DISPATCH_INTERVAL = 1.0
+
+logger = get_logger("scheduler")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED_STATE = "succeeded"
+FAILED_STATE = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+Window = Tuple[int, int]
+
+
+def parse_windows(spec: str) -> List[Window]:
+    """Parse "HH:MM-HH:MM,..." into (start, end) minutes of the day; a window may wrap midnight."""
+    windows = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        try:
+            start, end = (datetime.datetime.strptime(t.strip(), "%H:%M") for t in part.split("-"))
+        except ValueError:
+            raise ValueError(f"Invalid compaction window '{part}', expected HH:MM-HH:MM")
+        windows.append((start.hour * 60 + start.minute, end.hour * 60 + end.minute))
+    return windows
+
+
+def in_window(windows: List[Window], now: Optional[datetime.datetime] = None) -> bool:
+    if not windows:
+        return True
+    now = now or datetime.datetime.now()
+    minute = now.hour * 60 + now.minute
+    for start, end in windows:
+        if start <= end:
+            if start <= minute < end:
+                return True
+        elif minute >= start or minute < end:
+            return True
+    return False
+
+
+@dataclass
+class ScheduledCompaction:
+    id: str
+    target: str
+    host: str
+    port: int
+    state: str = QUEUED
+    job_id: Optional[str] = None
+    queued_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    duration_s: Optional[float] = None
+    segments_before: Optional[int] = None
+    segments_after: Optional[int] = None
+    segments_saved: Optional[int] = None
+    error: str = ""
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class CompactionScheduler:
+    """Queues compactions and hands them to the job manager a few at a time.
+
+    At most `max_concurrent` compactions run per Milvus endpoint, and new ones only start
+    inside the configured time windows (running ones are left to finish). `submit(entry)`
+    starts the compaction job and returns its Job; `get_job(job_id)` looks it up again.
+    """
+
+    def __init__(self, submit: Callable[[ScheduledCompaction], Job], get_job: Callable[[str], Optional[Job]],
+                 max_concurrent: int = DEFAULT_MAX_CONCURRENT, windows: str = DEFAULT_WINDOWS,
+                 history_size: int = DEFAULT_HISTORY_SIZE):
+        self.submit = submit
+        self.get_job = get_job
+        self.max_concurrent = max_concurrent
+        self.windows = parse_windows(windows)
+        self.history_size = history_size
+        self._entries: "OrderedDict[str, ScheduledCompaction]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def schedule(self, host: str, port: int, names: List[str]) -> List[ScheduledCompaction]:
+        """Queue compactions; a collection that is already queued or running keeps its entry."""
+        scheduled = []
+        with self._lock:
+            active = {(e.host, e.port, e.target): e for e in self._entries.values() if e.state in ACTIVE_STATES}
+            for name in names:
+                entry = active.get((host, int(port), name))
+                if entry is None:
+                    entry = ScheduledCompaction(id=uuid.uuid4().hex, target=name, host=host, port=int(port),
+                                                queued_at=time.time())
+                    self._entries[entry.id] = entry
+                    active[(host, int(port), name)] = entry
+                scheduled.append(entry)
+            self._trim_locked()
+        return scheduled
+
+    def cancel(self, entry_id: str) -> Optional[ScheduledCompaction]:
+        """Drop a queued compaction; running ones can't be cancelled in Milvus."""
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is not None and entry.state == QUEUED:
+                entry.state = CANCELLED
+                entry.finished_at = time.time()
+            return entry
+
+    def list(self, state: Optional[str] = None) -> List[ScheduledCompaction]:
+        with self._lock:
+            return [e for e in self._entries.values() if state is None or e.state == state]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = {s: 0 for s in (QUEUED, RUNNING, SUCCEEDED_STATE, FAILED_STATE, CANCELLED)}
+            for e in self._entries.values():
+                counts[e.state] += 1
+        return {
+            "max_concurrent": self.max_concurrent,
+            "windows": [f"{s // 60:02d}:{s % 60:02d}-{e // 60:02d}:{e % 60:02d}" for s, e in self.windows],
+            "in_window": in_window(self.windows),
+            **counts,
+        }
+
+    def dispatch(self):
+        """Collect finished jobs, then start queued compactions within the per-endpoint limit."""
+        with self._lock:
+            running = [e for e in self._entries.values() if e.state == RUNNING]
+        for entry in running:
+            self._collect(entry)
+
+        if not in_window(self.windows):
+            return
+        with self._lock:
+            busy: Dict[Tuple[str, int], int] = {}
+            for e in self._entries.values():
+                if e.state == RUNNING:
+                    busy[(e.host, e.port)] = busy.get((e.host, e.port), 0) + 1
+            ready = []
+            for e in self._entries.values():
+                if e.state == QUEUED and busy.get((e.host, e.port), 0) < self.max_concurrent:
+                    busy[(e.host, e.port)] = busy.get((e.host, e.port), 0) + 1
+                    e.state = RUNNING
+                    e.started_at = time.time()
+                    ready.append(e)
+        for entry in ready:
+            try:
+                entry.job_id = self.submit(entry).id
+            except Exception as e:
+                logger.exception("failed to start compaction", extra=fields(collection=entry.target))
+                with self._lock:
+                    entry.state = FAILED_STATE
+                    entry.error = str(e)
+                    entry.finished_at = time.time()
+
+    def _collect(self, entry: ScheduledCompaction):
+        job = self.get_job(entry.job_id) if entry.job_id else None
+        if job is not None and job.state not in (SUCCEEDED, FAILED):
+            return
+        with self._lock:
+            entry.finished_at = time.time()
+            if job is None:
+                entry.state = FAILED_STATE
+                entry.error = "Compaction job disappeared from the job history"
+                return
+            entry.state = SUCCEEDED_STATE if job.state == SUCCEEDED else FAILED_STATE
+            entry.error = job.error
+            for key in ("duration_s", "segments_before", "segments_after", "segments_saved"):
+                setattr(entry, key, job.detail.get(key))
+
+    def _trim_locked(self):
+        finished = [e.id for e in self._entries.values() if e.state not in ACTIVE_STATES]
+        for entry_id in finished[:max(0, len(self._entries) - self.history_size)]:
+            del self._entries[entry_id]
+
+    async def _run(self):
+        while True:
+            try:
+                self.dispatch()
+            except Exception:
+                logger.exception("compaction dispatch failed")
+            await asyncio.sleep(DISPATCH_INTERVAL)
@@ -0,0 +1,116 @@
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Milvus dataCoord.segment.maxSize; a sealed segment under SMALL_SEGMENT_FRACTION of it is "small"
+SEGMENT_MAX_SIZE_MB = int(os.getenv("MILVUS_SEGMENT_MAX_SIZE_MB", "1024"))
+SMALL_SEGMENT_FRACTION = 0.5
+
+# A collection is worth compacting when at least this share of its segments is small,
+# or this share of its stored rows is deleted
+SMALL_RATIO_THRESHOLD = float(os.getenv("MILVUS_COMPACT_SMALL_RATIO", "0.3"))
+DELETED_RATIO_THRESHOLD = float(os.getenv("MILVUS_COMPACT_DELETED_RATIO", "0.1"))
+MIN_SMALL_SEGMENTS = 2
+L0_SEGMENTS_THRESHOLD = 8
+
+# common_pb2.SegmentLevel.L0: delete-only segments
+SEGMENT_LEVEL_L0 = 1
+
+
+def segment_to_dict(info) -> Dict:
+    """Plain dict of a QuerySegmentInfo message."""
+    return {
+        "segment_id": info.segmentID,
+        "partition_id": info.partitionID,
+        "num_rows": info.num_rows,
+        "mem_size": info.mem_size,
+        "node_ids": list(info.nodeIds) or ([info.nodeID] if info.nodeID else []),
+        "state": int(info.state),
+        "level": int(info.level),
+    }
+
+
+def merge_replicas(segments: List[Dict]) -> List[Dict]:
+    """One entry per segment id; node ids of replicas are merged."""
+    merged = {}
+    for s in segments:
+        seen = merged.get(s["segment_id"])
+        if seen is None:
+            merged[s["segment_id"]] = dict(s, node_ids=list(s["node_ids"]))
+        else:
+            seen["node_ids"] += [n for n in s["node_ids"] if n not in seen["node_ids"]]
+    return list(merged.values())
+
+
+def row_distribution(rows: List[int]) -> Dict:
+    if not rows:
+        return {}
+    arr = np.asarray(rows)
+    p50, p90 = np.percentile(arr, [50, 90])
+    return {"min": int(arr.min()), "p50": int(p50), "p90": int(p90), "max": int(arr.max()),
+            "mean": round(float(arr.mean()), 1)}
+
+
+def summarize_segments(segments: List[Dict], live_rows: Optional[int] = None,
+                       max_size_mb: int = SEGMENT_MAX_SIZE_MB) -> Dict:
+    """Segment statistics of one loaded collection.
+
+    `live_rows` is the collection's count(*). Segment row counts include deleted rows, so the
+    difference is an estimate of rows that compaction would drop.
+    """
+    segments = merge_replicas(segments)
+    small_bytes = max_size_mb * 1024 * 1024 * SMALL_SEGMENT_FRACTION
+    data = [s for s in segments if s["level"] != SEGMENT_LEVEL_L0]
+    small = [s for s in data if s["mem_size"] < small_bytes]
+    rows = sum(s["num_rows"] for s in data)
+
+    partitions = {}
+    for s in data:
+        p = partitions.setdefault(str(s["partition_id"]), {"segments": 0, "rows": 0, "small_segments": 0,
+                                                            "memory_bytes": 0})
+        p["segments"] += 1
+        p["rows"] += s["num_rows"]
+        p["memory_bytes"] += s["mem_size"]
+        p["small_segments"] += s["mem_size"] < small_bytes
+
+    nodes = {}
+    for s in segments:
+        for node in s["node_ids"]:
+            nodes[str(node)] = nodes.get(str(node), 0) + s["mem_size"]
+
+    deleted = max(0, rows - live_rows) if live_rows is not None else None
+    return {
+        "segments": len(data),
+        "l0_segments": len(segments) - len(data),
+        "rows": rows,
+        "live_rows": live_rows,
+        "deleted_rows": deleted,
+        "deleted_ratio": round(deleted / rows, 4) if deleted is not None and rows else 0.0,
+        "small_segments": len(small),
+        "small_segment_ratio": round(len(small) / len(data), 4) if data else 0.0,
+        "memory_bytes": sum(s["mem_size"] for s in segments),
+        "row_distribution": row_distribution([s["num_rows"] for s in data]),
+        "partitions": partitions,
+        "nodes": nodes,
+    }
+
+
+def recommend_compaction(summary: Dict) -> Dict:
+    """Whether compacting pays off, with a score for ranking and the reasons.
+
+    The score approximates how many segments compaction would merge away or rewrite:
+    small segments beyond the first, plus the deleted share of all segments, plus
+    pending L0 delete segments.
+    """
+    reasons = []
+    small, ratio = summary["small_segments"], summary["small_segment_ratio"]
+    if small >= MIN_SMALL_SEGMENTS and ratio >= SMALL_RATIO_THRESHOLD:
+        reasons.append(f"{small} of {summary['segments']} segments are small ({ratio:.0%})")
+    if summary["deleted_ratio"] >= DELETED_RATIO_THRESHOLD:
+        reasons.append(f"{summary['deleted_ratio']:.0%} of stored rows are deleted")
+    if summary["l0_segments"] >= L0_SEGMENTS_THRESHOLD:
+        reasons.append(f"{summary['l0_segments']} L0 delete segments pending")
+
+    score = max(0, small - 1) + summary["deleted_ratio"] * summary["segments"] + summary["l0_segments"] / 2
+    return {"compact": bool(reasons), "score": round(score, 2) if reasons else 0.0, "reasons": reasons}
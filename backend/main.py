@@ -1,11 +1,55 @@
-from fastapi import FastAPI
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from api import milvus
+from api import clusters, jobs, milvus, search
+from core import log, metrics
+from core.cache import metadata_cache
+from core.jobs import job_manager
+from core.pool import pool
+
+STARTED_AT = time.time()
+
+logger = log.get_logger("http")
+
+metrics.register_stats(
+    {
+        "pool": pool.stats,
+        "cache": metadata_cache.stats,
+        "jobs": job_manager.stats,
+        "compactions": milvus.compaction_scheduler.stats,
+        "stream": milvus.poller.totals,
+    },
+    counters={
+        "pool": ("created", "reused", "evicted", "health_failures"),
+        "cache": ("hits", "misses", "evictions", "invalidations", "errors"),
+    },
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await milvus.poller.start()
+    await job_manager.start()
+    await milvus.compaction_scheduler.start()
+    yield
+    await milvus.compaction_scheduler.stop()
+    await job_manager.stop()
+    await milvus.poller.stop()
+    clusters.scraper.close()
+    # Close pooled Milvus clients (and their gRPC channels) on shutdown
+    pool.close_all()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(milvus.router)
+app.include_router(jobs.router)
+app.include_router(clusters.router)
+app.include_router(search.router)
 
 # Enable CORS for frontend calls (important for React to connect later)
 app.add_middleware(
@@ -16,14 +60,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    request_id = log.start_request(request.headers.get("x-request-id"))
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        # Label by route template, not the raw path, to keep the label set bounded
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        metrics.http_request_seconds.labels(request.method, route, str(status)).observe(elapsed)
+
+        # Only sampled, slow and failed requests are logged above debug
+        trace = log.current_trace()
+        duration_ms = round(elapsed * 1000, 3)
+        if status >= 500:
+            level = logging.WARNING
+        elif trace is not None or duration_ms >= log.SLOW_REQUEST_MS:
+            level = logging.INFO
+        else:
+            level = logging.DEBUG
+        if logger.isEnabledFor(level):
+            logger.log(level, "request", extra=log.fields(
+                method=request.method, route=route, path=request.url.path, status=status,
+                duration_ms=duration_ms, spans=trace.spans if trace is not None else None))
+
+
 @app.get("/")
 def read_root():
     return {"msg": "Milvus Admin Panel backend running"}
 
 @app.get("/health")
-def health_check():
+def health_check(
+    host: str = Query("localhost"),
+    port: int = Query(19530)
+):
+    try:
+        connected = pool.ping(host, port)
+        error = ""
+    except Exception as e:
+        connected, error = False, str(e)
     return {
         "status": "ok",
-        "uptime": "not implemented",  # you can add a timer later if needed
-        "milvus_connected": False     # placeholder until we wire it up
+        "uptime": round(time.time() - STARTED_AT, 3),
+        "milvus_connected": connected,
+        "milvus_error": error,
     }
+
+@app.get("/metrics")
+def prometheus_metrics():
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,31 @@
+"""Run from backend/: python -m pytest tests"""
+import grpc
+import pytest
+from pymilvus.client.grpc_handler import GrpcHandler
+from pymilvus.grpc_gen import milvus_pb2
+
+from core.metrics import instrument_handler, registry
+
+
+def rpc_count(method):
+    return sum(sample.value for metric in registry.collect() if metric.name == "milvus_admin_rpc_seconds"
+               for sample in metric.samples
+               if sample.name.endswith("_count") and sample.labels["method"] == method)
+
+
+def test_instrument_handler_times_rpcs():
+    # Nothing listens on port 1: the channel is created lazily and the call fails fast
+    handler = GrpcHandler(address="127.0.0.1:1")
+    try:
+        # Fails when pymilvus renames or drops GrpcHandler._final_channel/_stub
+        assert instrument_handler(handler)
+        before = rpc_count("GetVersion")
+        with pytest.raises(grpc.RpcError):
+            handler._stub.GetVersion(milvus_pb2.GetVersionRequest(), timeout=1)
+        assert rpc_count("GetVersion") == before + 1
+    finally:
+        handler.close()
+
+
+def test_instrument_handler_without_channel():
+    assert not instrument_handler(object())
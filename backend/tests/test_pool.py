@@ -0,0 +1,10 @@
+import inspect
+
+from pymilvus import MilvusClient
+from pymilvus.client.grpc_handler import GrpcHandler
+
+
+def test_compaction_plans_handler_call():
+    # core.pool.compaction_plans reaches past MilvusClient to its gRPC handler
+    assert callable(getattr(MilvusClient, "_get_connection", None))
+    assert "compaction_id" in inspect.signature(GrpcHandler.get_compaction_plans).parameters
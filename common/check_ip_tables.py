@@ -1,39 +1,186 @@
+import argparse
 import ipaddress
+import json
+import shlex
 import subprocess
-import argparse
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# iptables -S options carrying an address, and the side of the packet they match
+ADDRESS_OPTIONS = {"-s": "source", "--source": "source", "--src": "source",
+                   "-d": "destination", "--destination": "destination", "--dst": "destination"}
+SIDE_LABELS = {"source": "src", "destination": "dst"}
+
+
+@dataclass
+class Rule:
+    index: int
+    line: str
+    chain: str
+    target: str = ""
+    # Networks per side; an empty list means the rule doesn't restrict that side
+    source: List = field(default_factory=list)
+    destination: List = field(default_factory=list)
+    negated: Dict[str, bool] = field(default_factory=dict)
+
+
+def parse_rules(text):
+    """Parse `iptables -S` / `iptables-save` output into Rules (policy and table lines are skipped)."""
+    rules = []
+    for index, line in enumerate(text.splitlines()):
+        tokens = shlex.split(line, comments=False) if line.strip() else []
+        if len(tokens) < 2 or tokens[0] not in ("-A", "--append"):
+            continue
+        rule = Rule(index=index, line=line.strip(), chain=tokens[1])
+        i, negate = 2, False
+        while i < len(tokens):
+            token = tokens[i]
+            if token == "!":
+                negate = True
+                i += 1
+                continue
+            if token in ADDRESS_OPTIONS and i + 1 < len(tokens):
+                side = ADDRESS_OPTIONS[token]
+                getattr(rule, side).extend(ipaddress.ip_network(a, strict=False) for a in tokens[i + 1].split(","))
+                rule.negated[side] = negate
+                i += 1
+            elif token in ("-j", "--jump", "-g", "--goto") and i + 1 < len(tokens):
+                rule.target = tokens[i + 1]
+                i += 1
+            negate = False
+            i += 1
+        rules.append(rule)
+    return rules
+
+
+class PrefixTrie:
+    """Binary trie over address bits; a lookup walks at most 32 (128 for IPv6) nodes and returns
+    the values of every prefix containing the address."""
+
+    def __init__(self):
+        self.roots = {4: {}, 6: {}}
+
+    def insert(self, network, value):
+        node = self.roots[network.version]
+        bits = int(network.network_address)
+        width = network.max_prefixlen
+        for depth in range(network.prefixlen):
+            node = node.setdefault((bits >> (width - 1 - depth)) & 1, {})
+        node.setdefault("values", []).append(value)
+
+    def lookup(self, address):
+        node = self.roots[address.version]
+        bits = int(address)
+        width = address.max_prefixlen
+        found = list(node.get("values", ()))
+        for depth in range(width):
+            node = node.get((bits >> (width - 1 - depth)) & 1)
+            if node is None:
+                break
+            found.extend(node.get("values", ()))
+        return found
+
+
+class RuleIndex:
+    """Rules indexed by source and destination network for fast many-address lookups."""
+
+    def __init__(self, rules, include_any=False):
+        self.rules = rules
+        self.tries = {"source": PrefixTrie(), "destination": PrefixTrie()}
+        # `! -s net` rules match everything outside net; there are few, so they are checked one by one
+        self.negated = defaultdict(list)
+        for rule in rules:
+            for side, trie in self.tries.items():
+                networks = getattr(rule, side)
+                if rule.negated.get(side):
+                    self.negated[side].append(rule)
+                elif networks:
+                    for net in networks:
+                        trie.insert(net, rule.index)
+                elif include_any:
+                    trie.insert(ipaddress.ip_network("0.0.0.0/0"), rule.index)
+                    trie.insert(ipaddress.ip_network("::/0"), rule.index)
+        self.by_index = {rule.index: rule for rule in rules}
+
+    def match(self, address, sides=("source", "destination"), chain: Optional[str] = None):
+        """Rules matching `address` on the given sides, in rule order, as (rule, [sides]) pairs."""
+        hits = defaultdict(list)
+        for side in sides:
+            for index in self.tries[side].lookup(address):
+                hits[index].append(side)
+            for rule in self.negated[side]:
+                networks = [net for net in getattr(rule, side) if net.version == address.version]
+                if networks and not any(address in net for net in networks):
+                    hits[rule.index].append(side)
+        matched = [(self.by_index[i], sorted(set(s))) for i, s in sorted(hits.items())]
+        return [(rule, s) for rule, s in matched if chain is None or rule.chain == chain]
+
+
+def read_addresses(values):
+    for value in values:
+        value = value.strip()
+        if not value or value.startswith("#"):
+            continue
+        try:
+            yield value, ipaddress.ip_address(value)
+        except ValueError:
+            yield value, None
+
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Check if an IP address is affected by any iptables rules (direct match or subnet match)."
+        description="Check which iptables rules match IP addresses (direct match or subnet match)."
     )
-    parser.add_argument("ip", help="Target IP address to check")
+    parser.add_argument("ips", nargs="*", help="IP addresses to check ('-' or none: read them from stdin)")
+    parser.add_argument("-f", "--file", help="Saved `iptables -S` output to use instead of running iptables")
+    parser.add_argument("--direction", choices=["src", "dst", "any"], default="any",
+                        help="Match the address against rule sources, destinations or both")
+    parser.add_argument("--chain", help="Only rules of this chain")
+    parser.add_argument("--include-any", action="store_true",
+                        help="Also report rules without a source/destination restriction")
+    parser.add_argument("--ip6", action="store_true", help="Read rules with ip6tables")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
     args = parser.parse_args()
 
-    try:
-        target_ip = ipaddress.ip_address(args.ip)
-    except ValueError:
-        print(f"Invalid IP address: {args.ip}")
-        return
+    if args.file:
+        with open(args.file) as f:
+            text = f.read()
+    else:
+        try:
+            text = subprocess.check_output(["sudo", "ip6tables" if args.ip6 else "iptables", "-S"], text=True)
+        except subprocess.CalledProcessError as e:
+            print(f"Failed to get iptables rules: {e}")
+            return
 
-    try:
-        rules = subprocess.check_output(["sudo", "iptables", "-S"], text=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to get iptables rules: {e}")
-        return
+    index = RuleIndex(parse_rules(text), include_any=args.include_any)
+    sides = [side for side, label in SIDE_LABELS.items() if args.direction in (label, "any")]
+    values = args.ips if args.ips and args.ips != ["-"] else sys.stdin
 
-    found = False
-    for line in rules.splitlines():
-        for token in line.split():
-            try:
-                net = ipaddress.ip_network(token, strict=False)
-                if target_ip in net:
-                    print(f"Match: {line}")
-                    found = True
-            except ValueError:
-                continue
+    results = []
+    for value, address in read_addresses(values):
+        if address is None:
+            results.append({"ip": value, "error": "Invalid IP address"})
+            continue
+        results.append({"ip": value, "matches": [
+            {"chain": rule.chain, "target": rule.target, "sides": s, "rule": rule.line}
+            for rule, s in index.match(address, sides, args.chain)
+        ]})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        if "error" in result:
+            print(f"Invalid IP address: {result['ip']}")
+        elif not result["matches"]:
+            print(f"No iptables rules found that match or include {result['ip']}")
+        else:
+            print(f"{result['ip']}: {len(result['matches'])} matching rules")
+            for m in result["matches"]:
+                print(f"  Match [{'/'.join(SIDE_LABELS[s] for s in m['sides'])}]: {m['rule']}")
 
-    if not found:
-        print(f"No iptables rules found that match or include {target_ip}")
 
 if __name__ == "__main__":
     main()
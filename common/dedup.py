@@ -1,64 +1,214 @@
-import os
+import argparse
 import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# Partial hashes cover the first and last PARTIAL_BLOCK bytes; smaller files are hashed whole in that pass
+PARTIAL_BLOCK = 64 * 1024
+READ_SIZE = 4 * 1024 * 1024
+DEFAULT_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "dedup-hashes.sqlite")
+MODE_LABELS = {"report": "Duplicate", "hardlink": "Hardlinked", "delete": "Deleted"}
+
 
 def file_hash(path):
     """Compute SHA256 hash of a file."""
     hasher = hashlib.sha256()
+    buf = bytearray(READ_SIZE)
+    view = memoryview(buf)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+def partial_hash(path, size):
+    """SHA256 of the first and last PARTIAL_BLOCK bytes (the whole file when it is smaller than two blocks)."""
+    if size <= 2 * PARTIAL_BLOCK:
+        return file_hash(path)
+    hasher = hashlib.sha256()
     with open(path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            hasher.update(chunk)
+        hasher.update(f.read(PARTIAL_BLOCK))
+        f.seek(size - PARTIAL_BLOCK)
+        hasher.update(f.read(PARTIAL_BLOCK))
     return hasher.hexdigest()
 
-def find_txt_files(root_dir):
-    """Find all .txt files under root_dir and its subdirectories."""
-    txt_files = defaultdict(list)
+
+def _hash_job(job):
+    kind, path, size = job
+    try:
+        return path, partial_hash(path, size) if kind == "partial" else file_hash(path)
+    except OSError as e:
+        return path, e
+
+
+class HashCache:
+    """Hashes keyed by (path, size, mtime); a changed file simply misses the cache."""
+
+    def __init__(self, path):
+        self.db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS hashes (path TEXT, size INTEGER, mtime INTEGER, "
+                            "kind TEXT, digest TEXT, PRIMARY KEY (path, kind))")
+
+    def get(self, kind, f):
+        if self.db is None:
+            return None
+        row = self.db.execute("SELECT size, mtime, digest FROM hashes WHERE path = ? AND kind = ?",
+                              (f["path"], kind)).fetchone()
+        if row and row[0] == f["size"] and row[1] == f["mtime"]:
+            return row[2]
+        return None
+
+    def put(self, kind, f, digest):
+        if self.db is not None:
+            self.db.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)",
+                            (f["path"], f["size"], f["mtime"], kind, digest))
+
+    def close(self):
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+
+
+def find_files(root_dir, extensions=None, min_size=1):
+    """Regular files under root_dir, one entry per inode (hardlinked copies are already deduplicated)."""
+    files, seen = [], set()
     for dirpath, _, filenames in os.walk(root_dir):
         for fname in filenames:
-            if fname.lower().endswith(".txt"):
-                full_path = os.path.join(dirpath, fname)
-                txt_files[fname].append(full_path)
-    return txt_files
-
-def deduplicate(txt_files):
-    """Delete duplicate files with same name and same content."""
-    for fname, paths in txt_files.items():
-        if len(paths) == 1:
-            continue  # Unique file, skip
-
-        # Compute hash of each file
-        hashes = {}
-        for path in paths:
-            hashes[path] = file_hash(path)
-
-        unique_hashes = set(hashes.values())
-
-        if len(unique_hashes) == 1:
-            # All files are identical – keep one, delete the rest
-            print(f"Duplicate identical files found for '{fname}'. Keeping one, deleting the rest.")
-            paths_to_delete = paths[1:]  # Keep the first
-            for p in paths_to_delete:
-                os.remove(p)
-                print(f"  Deleted: {p}")
-        else:
-            # Conflicting content, warn and keep all
-            print(f"WARNING: Duplicate filename with different content: '{fname}'")
-            for path, h in hashes.items():
-                print(f"  {path} (hash: {h})")
+            if extensions and not fname.lower().endswith(extensions):
+                continue
+            path = os.path.join(dirpath, fname)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            if not os.path.isfile(path) or os.path.islink(path) or st.st_size < min_size:
+                continue
+            if (st.st_dev, st.st_ino) in seen:
+                continue
+            seen.add((st.st_dev, st.st_ino))
+            files.append({"path": path, "size": st.st_size, "mtime": st.st_mtime_ns, "dev": st.st_dev})
+    return files
+
+
+def group_by(files, key):
+    groups = defaultdict(list)
+    for f in files:
+        groups[key(f)].append(f)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def hash_files(files, kind, cache, executor):
+    """Fill f[kind] for every file, hashing cache misses in the process pool. Unreadable files are dropped."""
+    todo = []
+    for f in files:
+        f[kind] = cache.get(kind, f)
+        if f[kind] is None:
+            todo.append(f)
+    by_path = {f["path"]: f for f in todo}
+    jobs = [(kind, f["path"], f["size"]) for f in todo]
+    for path, digest in executor.map(_hash_job, jobs, chunksize=16):
+        if isinstance(digest, OSError):
+            print(f"WARNING: can't read {path}: {digest}", file=sys.stderr)
+            continue
+        by_path[path][kind] = digest
+        cache.put(kind, by_path[path], digest)
+    return [f for f in files if f[kind] is not None]
+
+
+def find_duplicates(files, cache, workers=None, same_name=False):
+    """Groups of identical files: same size, then same partial hash, then same full hash."""
+    def key(f, *digests):
+        return (f["size"], os.path.basename(f["path"]) if same_name else None) + tuple(f[d] for d in digests)
+
+    candidates = group_by(files, key)
+    duplicates = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        flat = hash_files([f for g in candidates for f in g], "partial", cache, executor)
+        candidates = group_by(flat, lambda f: key(f, "partial"))
+        # Small files were hashed whole by the partial pass
+        duplicates += [g for g in candidates if g[0]["size"] <= 2 * PARTIAL_BLOCK]
+        large = [f for g in candidates if g[0]["size"] > 2 * PARTIAL_BLOCK for f in g]
+        large = hash_files(large, "full", cache, executor)
+        duplicates += group_by(large, lambda f: key(f, "full"))
+    return [sorted(g, key=lambda f: f["path"]) for g in duplicates]
+
+
+def hardlink(keep, path):
+    """Replace `path` by a hardlink to `keep`, atomically."""
+    tmp = f"{path}.dedup-tmp"
+    os.link(keep, tmp)
+    os.replace(tmp, path)
+
+
+def apply(groups, mode):
+    """Keep the first file of each group; report, hardlink or delete the rest."""
+    reclaimed = 0
+    for group in groups:
+        keep = group[0]
+        print(f"{len(group)} identical files ({keep['size']} bytes), keeping {keep['path']}")
+        for f in group[1:]:
+            try:
+                if mode == "delete":
+                    os.remove(f["path"])
+                elif mode == "hardlink":
+                    if f["dev"] != keep["dev"]:
+                        print(f"  Skipped (other filesystem): {f['path']}")
+                        continue
+                    hardlink(keep["path"], f["path"])
+            except OSError as e:
+                print(f"  Failed: {f['path']}: {e}", file=sys.stderr)
+                continue
+            reclaimed += f["size"]
+            print(f"  {MODE_LABELS[mode]}: {f['path']}")
+    return reclaimed
+
 
 def main():
-    import sys
-    if len(sys.argv) != 2:
-        print("Usage: python dedup_txt_by_name.py /path/to/target-directory")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Find files with identical content and report, hardlink or delete the copies.")
+    parser.add_argument("root_dir", help="Directory to scan")
+    parser.add_argument("--mode", choices=["report", "hardlink", "delete"], default="report",
+                        help="What to do with duplicates (the first path of each group is kept)")
+    parser.add_argument("--ext", action="append", default=None,
+                        help="Only files with this extension, e.g. --ext .txt (repeatable; default: all files)")
+    parser.add_argument("--same-name", action="store_true", help="Only treat files with the same name as duplicates")
+    parser.add_argument("--min-size", type=int, default=1, help="Ignore files smaller than this many bytes")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="Hash cache (sqlite); '' to disable")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Hashing processes (default: CPU count)")
+    parser.add_argument("--json", default=None, help="Also write the duplicate groups to this JSON file")
+    args = parser.parse_args()
 
-    root_dir = sys.argv[1]
-    if not os.path.isdir(root_dir):
-        print(f"Error: '{root_dir}' is not a valid directory.")
+    if not os.path.isdir(args.root_dir):
+        print(f"Error: '{args.root_dir}' is not a valid directory.")
         sys.exit(1)
 
-    txt_files = find_txt_files(root_dir)
-    deduplicate(txt_files)
+    started = time.perf_counter()
+    extensions = tuple(e.lower() for e in args.ext) if args.ext else None
+    files = find_files(args.root_dir, extensions, args.min_size)
+    cache = HashCache(args.cache)
+    try:
+        groups = find_duplicates(files, cache, args.workers, args.same_name)
+    finally:
+        cache.close()
+    reclaimed = apply(groups, args.mode)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([{"size": g[0]["size"], "paths": [x["path"] for x in g]} for g in groups], f, indent=2)
+    verb = "reclaimable" if args.mode == "report" else "reclaimed"
+    print(f"Scanned {len(files)} files in {time.perf_counter() - started:.1f}s: "
+          f"{len(groups)} duplicate groups, {reclaimed / 1e6:,.1f} MB {verb}")
+
 
 if __name__ == "__main__":
     main()
@@ -17,9 +17,14 @@ export async function getHealthStatus() {
   }
 }
 
-export async function getCollections(host = 'localhost', port = 19530) {
+// `options` may hold prefix, regex, sort, offset, limit and cursor for server-side filtering and paging.
+export async function getCollections(host = 'localhost', port = 19530, options = {}) {
   try {
-    const response = await fetch(`${getBackendUrl()}/api/milvus/collections?host=${host}&port=${port}`);
+    const params = new URLSearchParams({ host, port });
+    Object.entries(options).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') params.append(key, value);
+    });
+    const response = await fetch(`${getBackendUrl()}/api/milvus/collections?${params}`);
     if (!response.ok) throw new Error("Failed to fetch collections");
     const json = await response.json();
     return json;
@@ -29,6 +34,23 @@ export async function getCollections(host = 'localhost', port = 19530) {
   }
 }
 
+// Subscribe to server-pushed collection list updates (Server-Sent Events).
+// onSnapshot receives the full list, onDiff receives { added, removed, changed }.
+// Returns a function that closes the stream.
+export function subscribeCollections(host, port, { onSnapshot, onDiff, onError }) {
+  const source = new EventSource(`${getBackendUrl()}/api/milvus/collections/stream?host=${host}&port=${port}`);
+  source.addEventListener('snapshot', (e) => onSnapshot(JSON.parse(e.data).collections));
+  source.addEventListener('diff', (e) => onDiff(JSON.parse(e.data)));
+  source.addEventListener('error', (e) => {
+    if (e.data) {
+      onError(JSON.parse(e.data).message);
+    } else if (source.readyState === EventSource.CLOSED) {
+      onError(null);
+    }
+  });
+  return () => source.close();
+}
+
 export async function getIsIndexing(host = 'localhost', port = 19530) {
   try {
     const response = await fetch(`${getBackendUrl()}/api/milvus/indexing?host=${host}&port=${port}`);
@@ -1,6 +1,6 @@
 // src/components/CollectionsPanel.jsx
-import { useEffect, useState, useContext, useRef } from 'react';
-import { getCollections, postMilvusAction } from '../api/backend';
+import { useEffect, useState, useContext, useRef, useMemo } from 'react';
+import { getCollections, postMilvusAction, subscribeCollections } from '../api/backend';
 import { ConnectionContext } from '../context/ConnectionContext';
 import { OverlayTrigger, Tooltip } from 'react-bootstrap';
 import 'bootstrap-icons/font/bootstrap-icons.css';
@@ -9,6 +9,7 @@ import { postMilvusRenameCollection } from '../api/backend';
 import ToastManager from './ToastManager';
 import LoadingOverlay from './LoadingOverlay';
 import CreateCollectionModal from './CreateCollectionModal'
+import { CONFIG } from '../utils/config';
 
 export default function CollectionsPanel() {
   const { host, port } = useContext(ConnectionContext);
@@ -25,19 +26,30 @@ export default function CollectionsPanel() {
   const [renameTarget, setRenameTarget] = useState(null);
   const [showCreateModal, setShowCreateModal] = useState(false);
 
+  const sortCollections = (list) => {
+    let sorted = [...list];
+    sorted.sort((a, b) => {
+      const primary = sortAsc
+        ? a[sortKey] > b[sortKey]
+        : a[sortKey] < b[sortKey];
+      if (a[sortKey] !== b[sortKey]) return primary ? 1 : -1;
+      return a.name.localeCompare(b.name);
+    });
+    return sorted;
+  };
+
+  const applyDiff = (list, { added, removed, changed }) => {
+    const byName = new Map(list.map((c) => [c.name, c]));
+    removed.forEach((name) => byName.delete(name));
+    [...added, ...changed].forEach((c) => byName.set(c.name, c));
+    return [...byName.values()];
+  };
+
   const fetchCollections = async () => {
     try {
       const json = await getCollections(host, port);
       if (json.status === 'success') {
-        let sorted = [...json.collections];
-        sorted.sort((a, b) => {
-          const primary = sortAsc
-            ? a[sortKey] > b[sortKey]
-            : a[sortKey] < b[sortKey];
-          if (a[sortKey] !== b[sortKey]) return primary ? 1 : -1;
-          return a.name.localeCompare(b.name);
-        });
-        setCollections(sorted);
+        setCollections(json.collections);
       } else {
         setError('Failed to load collections');
       }
@@ -49,12 +61,35 @@ export default function CollectionsPanel() {
     }
   };
 
+  // Updates are pushed by the backend poller; fall back to polling if the stream is unavailable
   useEffect(() => {
     if (!isReady) return;
-    fetchCollections();
-    pollingRef.current = setInterval(fetchCollections, 5000);
-    return () => clearInterval(pollingRef.current);
-  }, [host, port, sortKey, sortAsc]);
+    const unsubscribe = subscribeCollections(host, port, {
+      onSnapshot: (list) => {
+        setCollections(list);
+        setError(null);
+        setLoading(false);
+      },
+      onDiff: (diff) => {
+        setCollections((prev) => applyDiff(prev, diff));
+        setError(null);
+      },
+      onError: (message) => {
+        if (message) {
+          setError('Failed to load collections');
+          return;
+        }
+        fetchCollections();
+        pollingRef.current = setInterval(fetchCollections, CONFIG.POLL_INTERVAL_MS);
+      },
+    });
+    return () => {
+      unsubscribe();
+      clearInterval(pollingRef.current);
+    };
+  }, [host, port]);
+
+  const sortedCollections = useMemo(() => sortCollections(collections), [collections, sortKey, sortAsc]);
 
   const handleSort = (key) => {
     const newAsc = key === sortKey ? !sortAsc : true;
@@ -187,7 +222,7 @@ const renderLoadStateButton = (col, handleAction) => {
               </tr>
             </thead>
             <tbody>
-              {collections.map((col) => (
+              {sortedCollections.map((col) => (
                 <tr key={col.name}>
                   <td>
                    <a href={`/collections/${encodeURIComponent(col.name)}`} className="text-decoration-none">
@@ -0,0 +1,317 @@
+"""One entry point for the collection scripts in this directory.
+
+    python cli.py -H 10.0.0.5 stats my_collection
+    python cli.py -H 10.0.0.5 --json load 'prod_*'
+    python cli.py -H 10.0.0.5 batch nightly.txt     # one command per line, one connection
+
+pymilvus (~0.5s to import) is only imported once a command talks to Milvus, and every command
+of a run shares a single connection.
+"""
+import argparse
+import fnmatch
+import json
+import shlex
+import sys
+import time
+
+COMPACTION_POLL_MIN = 1
+COMPACTION_POLL_MAX = 30
+
+
+class Session:
+    """Lazily opened connection shared by every command of a run."""
+
+    def __init__(self, host_name, port="19530", token=""):
+        self.host_name = host_name
+        self.port = port
+        self.token = token
+        self._client = None
+        self._names = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from pymilvus import MilvusClient
+            self._client = MilvusClient(uri=f"http://{self.host_name}:{self.port}", token=self.token)
+        return self._client
+
+    @property
+    def alias(self):
+        """ORM connection alias of the client, for Collection / utility calls."""
+        return self.client._using
+
+    def collection(self, name):
+        from pymilvus import Collection
+        return Collection(name, using=self.alias)
+
+    def expand(self, patterns):
+        """Collection names; glob patterns ('prod_*') are matched against the collection list."""
+        names = []
+        for pattern in patterns:
+            if not any(c in pattern for c in "*?["):
+                names.append(pattern)
+                continue
+            if self._names is None:
+                self._names = self.client.list_collections()
+            names += sorted(n for n in self._names if fnmatch.fnmatchcase(n, pattern))
+        return list(dict.fromkeys(names))
+
+    def invalidate(self):
+        self._names = None
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+# Commands. Per-collection commands take (session, name, args) and return a JSON-able result;
+# the others take (session, args).
+
+def cmd_version(session, args):
+    from pymilvus import utility
+    return {"server_version": utility.get_server_version(using=session.alias)}
+
+
+def cmd_list(session, args):
+    session.invalidate()
+    return session.expand([args.pattern]) if args.pattern else session.client.list_collections()
+
+
+def cmd_stats(session, name, args):
+    client = session.client
+    return {
+        "row_count": client.get_collection_stats(collection_name=name).get("row_count", -1),
+        "load_state": client.get_load_state(collection_name=name)["state"].name,
+        "partitions": client.list_partitions(collection_name=name),
+    }
+
+
+def cmd_describe(session, name, args):
+    return session.client.describe_collection(collection_name=name)
+
+
+def cmd_index(session, name, args):
+    client = session.client
+    index_names = [args.index_name] if args.index_name else client.list_indexes(collection_name=name)
+    return {i: client.describe_index(collection_name=name, index_name=i) for i in index_names}
+
+
+def cmd_load(session, name, args):
+    started = time.perf_counter()
+    session.client.load_collection(collection_name=name, timeout=args.timeout)
+    return {"loaded": True, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def cmd_release(session, name, args):
+    session.client.release_collection(collection_name=name)
+    return {"released": True}
+
+
+def cmd_segments(session, name, args):
+    from pymilvus import utility
+    segments = utility.get_query_segment_info(name, using=session.alias)
+    rows = [{"segment_id": s.segmentID, "partition_id": s.partitionID, "num_rows": s.num_rows,
+             "mem_size": s.mem_size, "node_ids": list(s.nodeIds), "state": s.state, "level": s.level}
+            for s in segments]
+    return {"segments": len(rows), "rows": sum(r["num_rows"] for r in rows), "detail": rows}
+
+
+def cmd_compact(session, name, args):
+    client = session.client
+    job_id = client.compact(collection_name=name)
+    if args.no_wait:
+        return {"job_id": job_id}
+    delay = COMPACTION_POLL_MIN
+    started = time.perf_counter()
+    while True:
+        time.sleep(delay)
+        delay = min(delay * 2, COMPACTION_POLL_MAX)
+        state = client.get_compaction_state(job_id)
+        if state == "Completed":
+            break
+        # Milvus reports UndefiedState for unknown or expired compaction ids
+        if state != "Executing":
+            raise RuntimeError(f"Compaction {job_id} is in state {state}")
+        if args.timeout is not None and time.perf_counter() - started >= args.timeout:
+            raise TimeoutError(f"Compaction {job_id} not completed after {args.timeout:g}s")
+    return {"job_id": job_id, "state": state, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def cmd_compaction_state(session, args):
+    return {"job_id": args.job_id, "state": session.client.get_compaction_state(job_id=args.job_id)}
+
+
+def cmd_rename(session, args):
+    session.client.rename_collection(old_name=args.old_name, new_name=args.new_name)
+    session.invalidate()
+    return {"renamed": args.old_name, "to": args.new_name}
+
+
+def cmd_maxid(session, name, args):
+    from maxid import get_pk_range
+    return get_pk_range(session.collection(name), workers=args.workers)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Milvus collection tools.", epilog=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-H", "--host", default="localhost", help="Milvus host")
+    parser.add_argument("-p", "--port", default="19530", help="Milvus port")
+    parser.add_argument("--token", default="", help="Milvus token (user:password)")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per result")
+    parser.add_argument("--stop-on-error", action="store_true", help="Stop at the first failing command")
+    add_commands(parser.add_subparsers(dest="command", required=True), batch=True)
+    return parser
+
+
+def add_commands(sub, batch=False):
+    def per_collection(name, fn, help, **kwargs):
+        p = sub.add_parser(name, help=help, **kwargs)
+        p.add_argument("collections", nargs="+", help="Collection names or glob patterns")
+        p.set_defaults(fn=fn, per_collection=True)
+        return p
+
+    sub.add_parser("version", help="Server version").set_defaults(fn=cmd_version)
+    p = sub.add_parser("list", help="Collection names")
+    p.add_argument("pattern", nargs="?", default=None, help="Glob pattern")
+    p.set_defaults(fn=cmd_list)
+    per_collection("stats", cmd_stats, "Row count, load state and partitions")
+    per_collection("describe", cmd_describe, "Collection description")
+    p = per_collection("index", cmd_index, "Index descriptions")
+    p.add_argument("--index-name", default=None, help="Only this index")
+    p = per_collection("load", cmd_load, "Load collections and wait until they are ready")
+    p.add_argument("--timeout", type=float, default=None, help="Seconds to wait for each load")
+    per_collection("release", cmd_release, "Release collections")
+    per_collection("segments", cmd_segments, "Query segment info")
+    p = per_collection("compact", cmd_compact, "Compact collections (waits for completion)")
+    p.add_argument("--no-wait", action="store_true", help="Only start the compaction")
+    p.add_argument("--timeout", type=float, default=None, help="Seconds to wait for each compaction")
+    p = sub.add_parser("compaction-state", help="State of a compaction job")
+    p.add_argument("job_id", type=int)
+    p.set_defaults(fn=cmd_compaction_state)
+    p = sub.add_parser("rename", help="Rename a collection")
+    p.add_argument("old_name")
+    p.add_argument("new_name")
+    p.set_defaults(fn=cmd_rename)
+    p = per_collection("maxid", cmd_maxid, "Min and max primary key")
+    p.add_argument("-w", "--workers", type=int, default=8, help="Partitions probed in parallel")
+    if batch:
+        p = sub.add_parser("batch", help="Run commands from a file ('-' for stdin), one per line")
+        p.add_argument("file")
+
+
+class BatchArgumentParser(argparse.ArgumentParser):
+    """Raises ValueError with argparse's message instead of printing usage and exiting."""
+
+    def error(self, message):
+        raise ValueError(message)
+
+
+def command_parser():
+    """Parser for one batch line (no global options, no nested batch)."""
+    parser = BatchArgumentParser(prog="batch")
+    add_commands(parser.add_subparsers(dest="command", required=True, parser_class=BatchArgumentParser))
+    return parser
+
+
+def command_line(parser, args):
+    """The command part of a parsed command line, rebuilt from `args` (global options left out)."""
+    sub = next(a for a in parser._actions if isinstance(a, argparse._SubParsersAction))
+    parts = [args.command]
+    for action in sub.choices[args.command]._actions:
+        value = getattr(args, action.dest, None)
+        if isinstance(action, argparse._HelpAction) or value is None or value == action.default:
+            continue
+        if not action.option_strings:
+            parts += value if isinstance(value, list) else [str(value)]
+        elif action.nargs == 0:
+            parts.append(action.option_strings[-1])
+        else:
+            parts += [action.option_strings[-1], str(value)]
+    return shlex.join(parts)
+
+
+def emit(out, line, result=None, error=None, collection=None):
+    if out["json"]:
+        entry = {"command": line}
+        if collection is not None:
+            entry["collection"] = collection
+        entry.update({"error": error} if error is not None else {"result": result})
+        print(json.dumps(entry, default=str))
+        return
+    prefix = f"[{collection}] " if collection is not None else ""
+    if error is not None:
+        print(f"❌ {line}: {prefix}{error}")
+    elif isinstance(result, (dict, list)):
+        print(f"==> {line}: {prefix}{json.dumps(result, indent=2, default=str)}")
+    else:
+        print(f"==> {line}: {prefix}{result}")
+
+
+def run(session, args, line, out):
+    """Run one parsed command; returns the number of failures."""
+    failures = 0
+    try:
+        if not getattr(args, "per_collection", False):
+            emit(out, line, args.fn(session, args))
+            return 0
+        names = session.expand(args.collections)
+        if not names:
+            emit(out, line, error="No matching collections")
+            return 1
+    except Exception as e:
+        emit(out, line, error=str(e))
+        return 1
+    for name in names:
+        try:
+            emit(out, line, args.fn(session, name, args), collection=name)
+        except Exception as e:
+            emit(out, line, error=str(e), collection=name)
+            failures += 1
+            if out["stop_on_error"]:
+                break
+    return failures
+
+
+def run_batch(session, path, out):
+    parser = command_parser()
+    f = sys.stdin if path == "-" else open(path)
+    failures = 0
+    try:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                args = parser.parse_args(shlex.split(line))
+            except ValueError as e:
+                emit(out, line, error=f"Invalid command: {e}")
+                failures += 1
+            else:
+                failures += run(session, args, line, out)
+            if failures and out["stop_on_error"]:
+                break
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    return failures
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    session = Session(args.host, args.port, args.token)
+    out = {"json": args.json, "stop_on_error": args.stop_on_error}
+    try:
+        if args.command == "batch":
+            failures = run_batch(session, args.file, out)
+        else:
+            failures = run(session, args, command_line(parser, args), out)
+    finally:
+        session.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
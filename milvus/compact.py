@@ -15,8 +15,10 @@ def stats(host_name, collection_name, port="19530", alias="default"):
     comp_res = client.compact(collection_name=collection_name)
     print(f"==> Collection Job ID: {comp_res}")
 
+    delay = 1
     while True:
-        time.sleep(5)
+        time.sleep(delay)
+        delay = min(delay * 2, 30)
         state_res = client.get_compaction_state(comp_res)
         print(f"==> Collection Compaction State: {state_res}")
         if state_res == -1 or state_res == 'Completed':
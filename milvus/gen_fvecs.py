@@ -1,36 +1,116 @@
 import numpy as np
 import argparse
 import os
-import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-def generate_fvecs(filename, dim, n):
+from vecs import vecs_dtype
+
+DISTRIBUTIONS = ["uniform", "normal", "unit", "clustered"]
+# Target size of one generated block; bounds memory per worker
+CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def make_centroids(seed, dim, clusters):
+    rng = np.random.default_rng([seed, 2 ** 32])
+    return rng.uniform(-1, 1, size=(clusters, dim)).astype(np.float32)
+
+
+def generate_block(rng, count, dim, distribution, centroids=None, cluster_std=0.1):
+    if distribution == "uniform":
+        return rng.random((count, dim), dtype=np.float32)
+    if distribution == "normal":
+        return rng.standard_normal((count, dim), dtype=np.float32)
+    if distribution == "unit":
+        block = rng.standard_normal((count, dim), dtype=np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        return block
+    if distribution == "clustered":
+        block = rng.standard_normal((count, dim), dtype=np.float32)
+        block *= cluster_std
+        block += centroids[rng.integers(0, len(centroids), size=count)]
+        return block
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+
+def fill_range(filename, dim, n, first_chunk, last_chunk, chunk_size, distribution, seed,
+               centroids=None, cluster_std=0.1):
+    """Write chunks [first_chunk, last_chunk) of the file in place.
+
+    Each chunk has its own RNG stream seeded by (seed, chunk index), so the output depends
+    only on the seed and chunk size, not on how chunks are split between workers.
+    """
+    out = np.memmap(filename, dtype=vecs_dtype(dim), mode="r+", shape=(n,))
+    for chunk in range(first_chunk, last_chunk):
+        start = chunk * chunk_size
+        stop = min(start + chunk_size, n)
+        rng = np.random.default_rng([seed, chunk])
+        block = out[start:stop]
+        block["dim"] = dim
+        block["vec"] = generate_block(rng, stop - start, dim, distribution, centroids, cluster_std)
+    out.flush()
+    del out
+    return last_chunk - first_chunk
+
+
+def generate_fvecs(filename, dim, n, seed=None, workers=1, distribution="uniform", chunk_size=None,
+                   clusters=100, cluster_std=0.1, force=False):
     if not filename.endswith(".fvecs"):
         filename += ".fvecs"
 
-    if os.path.exists(filename):
+    if os.path.exists(filename) and not force:
         choice = input(f"File '{filename}' already exists. Overwrite? [Y/n]: ").strip().lower()
         if choice and choice not in ["y", "yes"]:
             print("Aborted.")
             return
 
-    vectors = np.random.uniform(0, 1, size=(n, dim)).astype(np.float32)
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % 2 ** 63)
+    record = vecs_dtype(dim)
+    chunk_size = chunk_size or max(1, CHUNK_BYTES // record.itemsize)
+    chunks = (n + chunk_size - 1) // chunk_size
+    centroids = make_centroids(seed, dim, clusters) if distribution == "clustered" else None
 
+    started = time.perf_counter()
+    # Pre-size the file; workers then fill disjoint record ranges through their own memmaps
     with open(filename, "wb") as f:
-        for vec in vectors:
-            f.write(struct.pack("i", dim))        # Write dimension as int32
-            f.write(vec.tobytes())                # Write vector as float32s
+        f.truncate(n * record.itemsize)
+
+    workers = max(1, min(workers, chunks))
+    bounds = np.linspace(0, chunks, workers + 1).astype(int)
+    args = [(filename, dim, n, int(lo), int(hi), chunk_size, distribution, seed, centroids, cluster_std)
+            for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+    if workers == 1:
+        for a in args:
+            fill_range(*a)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(fill_range, *zip(*args)))
+
+    elapsed = time.perf_counter() - started
+    size_mb = n * record.itemsize / 1024 ** 2
+    print(f"Generated {n} {distribution} vectors of dimension {dim} (seed {seed}) and saved to '{filename}'.")
+    print(f"{size_mb:.1f} MB in {elapsed:.2f}s ({size_mb / elapsed if elapsed else 0:.1f} MB/s)")
 
-    print(f"Generated {n} vectors of dimension {dim} and saved to '{filename}'.")
 
 def main():
     parser = argparse.ArgumentParser(description="Generate an fvecs file with random vectors.")
     parser.add_argument("name", type=str, help="Name of the output .fvecs file")
     parser.add_argument("dim", type=int, help="Dimension of each vector")
     parser.add_argument("n", type=int, help="Number of vectors to generate")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Random seed (output is reproducible)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Processes filling the file in parallel")
+    parser.add_argument("-d", "--distribution", choices=DISTRIBUTIONS, default="uniform",
+                        help="uniform [0, 1), standard normal, unit-normalised normal, or gaussian clusters")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Vectors generated per block")
+    parser.add_argument("--clusters", type=int, default=100, help="Number of clusters (clustered only)")
+    parser.add_argument("--cluster-std", type=float, default=0.1, help="Cluster spread (clustered only)")
+    parser.add_argument("-y", "--yes", action="store_true", help="Overwrite an existing file without asking")
 
     args = parser.parse_args()
-    generate_fvecs(args.name, args.dim, args.n)
+    generate_fvecs(args.name, args.dim, args.n, seed=args.seed, workers=args.workers,
+                   distribution=args.distribution, chunk_size=args.chunk_size, clusters=args.clusters,
+                   cluster_std=args.cluster_std, force=args.yes)
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,189 @@
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+from pymilvus import connections, Collection, DataType
+
+from vecs import read_vecs
+
+# Per-process state, set up once by init_worker
+_worker = {}
+
+SCALAR_DEFAULTS = {
+    DataType.BOOL: False,
+    DataType.INT8: 0,
+    DataType.INT16: 0,
+    DataType.INT32: 0,
+    DataType.INT64: 0,
+    DataType.FLOAT: 0.0,
+    DataType.DOUBLE: 0.0,
+    DataType.VARCHAR: "",
+    DataType.JSON: {},
+}
+
+
+def init_worker(host_name, port, collection_name, path, batch_size, start_id, content_template):
+    alias = f"ingest-{os.getpid()}"
+    connections.connect(alias=alias, host=host_name, port=port)
+    _worker.update(
+        collection=Collection(collection_name, using=alias),
+        vectors=read_vecs(path),
+        batch_size=batch_size,
+        start_id=start_id,
+        content_template=content_template,
+    )
+
+
+def build_columns(collection, vectors, ids, content_template):
+    """Column-based insert payload in schema order (auto_id primary keys are left out)."""
+    columns = []
+    for field in collection.schema.fields:
+        if field.is_primary:
+            if not field.auto_id:
+                columns.append(ids.tolist())
+        elif field.dtype == DataType.FLOAT_VECTOR:
+            # pymilvus flattens vectors in Python either way; nested lists from one C-level tolist()
+            # are the fastest input it takes (a list of ndarray rows is ~4x slower to encode)
+            columns.append(vectors.astype(np.float32, copy=False).tolist())
+        elif field.dtype == DataType.VARCHAR and content_template:
+            columns.append([content_template.format(id=i) for i in ids.tolist()])
+        elif field.dtype in SCALAR_DEFAULTS:
+            columns.append([SCALAR_DEFAULTS[field.dtype]] * len(ids))
+        else:
+            raise ValueError(f"Don't know how to fill field '{field.name}' ({field.dtype.name})")
+    return columns
+
+
+def insert_batch(batch, replace=False):
+    """Insert one batch of the input file; runs in a worker process.
+
+    `replace` upserts instead, for batches an interrupted run may already have inserted. The
+    primary keys are fixed by the batch number, so this can't duplicate rows (auto_id
+    collections excepted: their keys are new on every insert).
+    """
+    started = time.perf_counter()
+    lo = batch * _worker["batch_size"]
+    vectors = _worker["vectors"][lo:lo + _worker["batch_size"]]
+    ids = np.arange(lo, lo + len(vectors), dtype=np.int64) + _worker["start_id"]
+    collection = _worker["collection"]
+    columns = build_columns(collection, vectors, ids, _worker["content_template"])
+    if replace and not collection.schema.auto_id:
+        collection.upsert(columns)
+    else:
+        collection.insert(columns)
+    return batch, len(vectors), vectors.nbytes, time.perf_counter() - started
+
+
+def load_checkpoint(path, params):
+    """Finished batches, and batches that were submitted but never confirmed."""
+    if not path or not os.path.exists(path):
+        return set(), set()
+    with open(path) as f:
+        state = json.load(f)
+    if state.get("params") != params:
+        raise ValueError(f"Checkpoint '{path}' was written for different parameters: {state.get('params')}")
+    done = set(state.get("done", []))
+    return done, set(state.get("submitted", [])) - done
+
+
+def save_checkpoint(path, params, done, submitted=()):
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"params": params, "done": sorted(done), "submitted": sorted(submitted)}, f)
+    os.replace(tmp, path)
+
+
+def ingest(host_name, collection_name, path, port="19530", batch_size=10000, workers=4, max_pending=None,
+           start_id=0, content_template="", checkpoint=None, flush=True):
+    vectors = read_vecs(path)
+    total = len(vectors)
+    batches = (total + batch_size - 1) // batch_size
+    params = {"file": os.path.abspath(path), "collection": collection_name, "batch_size": batch_size,
+              "start_id": start_id}
+    done, unconfirmed = load_checkpoint(checkpoint, params)
+    # Unconfirmed batches go first, so they are settled even if this run is interrupted too
+    todo = sorted(unconfirmed) + [b for b in range(batches) if b not in done and b not in unconfirmed]
+    print(f"Ingesting {total} vectors (dim {vectors.shape[1]}) from '{path}' into '{collection_name}': "
+          f"{len(todo)} of {batches} batches to go ({len(unconfirmed)} upserted), {workers} workers")
+
+    # Backpressure: never more than max_pending batches submitted but not finished
+    max_pending = max_pending or workers * 2
+    rows = nbytes = 0
+    started = last_report = time.perf_counter()
+    pending = set()
+    # Batches handed to workers and not finished yet; they are checkpointed before they are submitted
+    submitted = set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(host_name, port, collection_name, path, batch_size, start_id,
+                                       content_template)) as executor:
+        queue = iter(todo)
+        try:
+            while True:
+                new = list(itertools.islice(queue, max_pending - len(pending)))
+                if new:
+                    submitted.update(new)
+                    save_checkpoint(checkpoint, params, done, submitted)
+                    for batch in new:
+                        pending.add(executor.submit(insert_batch, batch, batch in unconfirmed))
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batch, n, b, _ = future.result()
+                    done.add(batch)
+                    submitted.discard(batch)
+                    rows += n
+                    nbytes += b
+                save_checkpoint(checkpoint, params, done, submitted)
+                now = time.perf_counter()
+                if now - last_report >= 10:
+                    last_report = now
+                    print(f"  {len(done)}/{batches} batches, {rows / (now - started):,.0f} rows/s")
+        finally:
+            for future in pending:
+                future.cancel()
+            save_checkpoint(checkpoint, params, done, submitted)
+
+    if flush:
+        connections.connect(alias="default", host=host_name, port=port)
+        Collection(collection_name).flush()
+        connections.disconnect("default")
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Inserted {rows} rows ({nbytes / 1024 ** 2:.1f} MB of vectors) in {elapsed:.2f}s: "
+          f"{rows / elapsed if elapsed else 0:,.0f} rows/s, {nbytes / 1024 ** 2 / elapsed if elapsed else 0:.1f} MB/s")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream an .fvecs/.bvecs/.ivecs file into a Milvus collection.")
+    parser.add_argument("-a", "--host", required=True, help="Milvus host (e.g., 127.0.0.1)")
+    parser.add_argument("-p", "--port", default="19530", help="Milvus port")
+    parser.add_argument("-c", "--collection", required=True, help="Collection name")
+    parser.add_argument("-f", "--file", required=True, help="Input .fvecs/.bvecs/.ivecs file")
+    parser.add_argument("-b", "--batch-size", type=int, default=10000, help="Rows per insert")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Insert worker processes")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="Max batches in flight (default: 2 x workers)")
+    parser.add_argument("--start-id", type=int, default=0, help="Primary key of the first vector")
+    parser.add_argument("--content-template", default="",
+                        help="Value for VARCHAR fields, e.g. 'doc-{id}' (default: empty string)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="JSON file recording finished batches; re-run with the same file to resume. "
+                             "Batches that may have been inserted when the run stopped are upserted")
+    parser.add_argument("--no-flush", action="store_true", help="Don't flush the collection at the end")
+
+    args = parser.parse_args()
+    ingest(args.host, args.collection, args.file, port=args.port, batch_size=args.batch_size,
+           workers=args.workers, max_pending=args.max_pending, start_id=args.start_id,
+           content_template=args.content_template, checkpoint=args.checkpoint, flush=not args.no_flush)
+
+
+if __name__ == "__main__":
+    main()
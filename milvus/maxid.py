@@ -1,49 +1,91 @@
-from pymilvus import connections, Collection, exceptions, utility
+from pymilvus import connections, Collection, DataType, utility
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
 import sys
+import threading
+import time
+
+# The search itself is shared with the backend's /pk-range endpoint
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "backend"))
+from core.pkrange import DEFAULT_MAX_QUERIES, QUERY_WINDOW, find_extreme_pk  # noqa: E402
 
-ASSUME_MAX_VECTOR_ID = 10000000000
 
 def get_collection(host_name, collection_name, port="19530", alias="default"):
     print(f"Connecting to Milvus at {host_name}:{port}...")
     connections.connect(alias=alias, host=host_name, port=port)
 
-    print(f"Collection {collection_name} exists {utility.has_collection(collection_name)}")
+    print(f"Collection {collection_name} exists {utility.has_collection(collection_name, using=alias)}")
 
-    print(f"Attempting to get max id in collection {collection_name}")
+    print(f"Attempting to get primary key range in collection {collection_name}")
     collection = Collection(collection_name, using=alias)
     return collection
 
 
-def is_valid_vector_id(collection: Collection, vector_id: int) -> bool:
-    expr = f"id == {vector_id}"
-    return collection.query(expr=expr, output_fields=["id"])
+def primary_field_name(collection: Collection) -> str:
+    field = collection.schema.primary_field
+    if field.dtype != DataType.INT64:
+        raise ValueError(f"Primary key '{field.name}' is {field.dtype.name}; only INT64 keys are supported")
+    return field.name
+
+
+def get_pk_range(collection: Collection, workers=8, max_queries=DEFAULT_MAX_QUERIES):
+    """Min/max primary key per partition (probed in parallel) and overall."""
+    pk = primary_field_name(collection)
+    partitions = [p.name for p in collection.partitions]
+    query_count = [0]
+    count_lock = threading.Lock()
+
+    def partition_range(partition):
+        def query_ids(expr):
+            with count_lock:
+                query_count[0] += 1
+            rows = collection.query(expr=expr, output_fields=[pk], limit=QUERY_WINDOW,
+                                    partition_names=[partition])
+            return [r[pk] for r in rows]
+        return (partition, find_extreme_pk(query_ids, pk, largest=False, max_queries=max_queries),
+                find_extreme_pk(query_ids, pk, max_queries=max_queries))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(partitions)))) as executor:
+        per_partition = {p: {"min": lo, "max": hi} for p, lo, hi in executor.map(partition_range, partitions)}
+
+    mins = [r["min"] for r in per_partition.values() if r["min"] is not None]
+    maxs = [r["max"] for r in per_partition.values() if r["max"] is not None]
+    return {
+        "primary_field": pk,
+        "min": min(mins) if mins else None,
+        "max": max(maxs) if maxs else None,
+        "partitions": per_partition,
+        "queries": query_count[0],
+    }
+
 
 def get_max_id(collection):
-    low = 0
-    high = ASSUME_MAX_VECTOR_ID
-    while is_valid_vector_id(collection, high):
-        high *= 2
-    while low < high:
-        mid = (low + high + 1) // 2  # Use upper midpoint to avoid infinite loop
-        if is_valid_vector_id(collection, mid):
-            low = mid  # The max ID is at least mid
-        else:
-            high = mid - 1  # The max ID must be less than mid
-    print(f"Max ID found: {low}")
-    return low
+    max_id = get_pk_range(collection)["max"]
+    print(f"Max ID found: {max_id}")
+    return max_id
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python maxid.py <host_name> <collection_name>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Find the min and max primary key of a Milvus collection.")
+    parser.add_argument("host_name", help="Milvus host")
+    parser.add_argument("collection_name", help="Collection name")
+    parser.add_argument("-p", "--port", default="19530", help="Milvus port")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="Partitions probed in parallel")
+    parser.add_argument("--max-queries", type=int, default=DEFAULT_MAX_QUERIES,
+                        help="Give up on a partition's min or max after this many queries")
+    args = parser.parse_args()
 
-    host_name = sys.argv[1]
-    collection_name = sys.argv[2]
     alias = "default"
     try:
-            collection = get_collection(host_name=host_name, collection_name=collection_name)
-            get_max_id(collection)
-            
+        collection = get_collection(host_name=args.host_name, collection_name=args.collection_name,
+                                    port=args.port, alias=alias)
+        started = time.perf_counter()
+        res = get_pk_range(collection, workers=args.workers, max_queries=args.max_queries)
+        for partition, r in res["partitions"].items():
+            print(f"  {partition}: min={r['min']} max={r['max']}")
+        print(f"Min ID found: {res['min']}")
+        print(f"Max ID found: {res['max']}")
+        print(f"({res['queries']} queries in {time.perf_counter() - started:.2f}s)")
     finally:
         connections.disconnect(alias=alias)
@@ -0,0 +1,161 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pymilvus import MilvusClient
+
+from search import generate_random_queries, resolve_fields
+from vecs import read_vecs, write_vecs
+
+METRICS = ["L2", "IP", "COSINE"]
+# Bytes hashed from each sampled region of the base file for the ground-truth cache key
+HASH_SAMPLE_BYTES = 1024 * 1024
+
+
+def dataset_hash(base_path, queries, k, metric):
+    """Cache key for ground truth: base file size and sampled regions, the full query set, k and metric.
+
+    Hashing a multi-GB base file fully would cost more than some ground-truth runs, so only the
+    first, middle and last MB are hashed together with the file size.
+    """
+    h = hashlib.sha256()
+    size = os.path.getsize(base_path)
+    h.update(f"{size}:{k}:{metric}".encode())
+    with open(base_path, "rb") as f:
+        for offset in sorted({0, max(0, size // 2 - HASH_SAMPLE_BYTES // 2), max(0, size - HASH_SAMPLE_BYTES)}):
+            f.seek(offset)
+            h.update(f.read(HASH_SAMPLE_BYTES))
+    h.update(np.ascontiguousarray(queries, dtype=np.float32).tobytes())
+    return h.hexdigest()
+
+
+def normalize(x):
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return x / norms
+
+
+def exact_topk(base, queries, k, metric="L2", base_block=16384, query_block=1024, workers=None):
+    """Exact top-k base row indices for every query, best first.
+
+    The base is read once, one block at a time. For each block the query blocks are scored in
+    parallel with a matrix product (NumPy releases the GIL there) and merged into running top-k
+    arrays, so the full distance matrix never exists: peak extra memory is about
+    workers * query_block * base_block floats.
+    """
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    if metric == "COSINE":
+        queries = normalize(queries)
+    nq, n = len(queries), len(base)
+    k = min(k, n)
+    best_d = np.full((nq, k), np.inf, dtype=np.float32)
+    best_i = np.full((nq, k), -1, dtype=np.int64)
+    q_ranges = [(s, min(s + query_block, nq)) for s in range(0, nq, query_block)]
+
+    def merge(block, offset, qs, qe):
+        scores = queries[qs:qe] @ block.T
+        if metric == "L2":
+            # ||q - x||^2 without the per-query ||q||^2 term, which doesn't change the order
+            dist = (block * block).sum(axis=1)[None, :] - 2 * scores
+        else:
+            dist = -scores
+        kk = min(k, dist.shape[1])
+        idx = np.argpartition(dist, kk - 1, axis=1)[:, :kk]
+        cand_d = np.concatenate([best_d[qs:qe], np.take_along_axis(dist, idx, axis=1)], axis=1)
+        cand_i = np.concatenate([best_i[qs:qe], idx + offset], axis=1)
+        keep = np.argpartition(cand_d, k - 1, axis=1)[:, :k]
+        best_d[qs:qe] = np.take_along_axis(cand_d, keep, axis=1)
+        best_i[qs:qe] = np.take_along_axis(cand_i, keep, axis=1)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for offset in range(0, n, base_block):
+            block = np.asarray(base[offset:offset + base_block], dtype=np.float32)
+            if metric == "COSINE":
+                block = normalize(block)
+            list(executor.map(lambda r: merge(block, offset, *r), q_ranges))
+
+    order = np.argsort(best_d, axis=1)
+    return np.take_along_axis(best_i, order, axis=1)
+
+
+def ground_truth(base_path, queries, k, metric, cache_dir=".gt_cache", **kwargs):
+    key = dataset_hash(base_path, queries, k, metric)
+    path = os.path.join(cache_dir, f"gt-{key[:16]}-k{k}-{metric}.ivecs")
+    if os.path.exists(path):
+        print(f"==> Using cached ground truth '{path}'")
+        return np.asarray(read_vecs(path), dtype=np.int64)
+    started = time.perf_counter()
+    gt = exact_topk(read_vecs(base_path), queries, k, metric, **kwargs)
+    print(f"==> Computed exact top-{k} for {len(queries)} queries in {time.perf_counter() - started:.2f}s")
+    os.makedirs(cache_dir, exist_ok=True)
+    write_vecs(path, gt.astype(np.int32))
+    return gt
+
+
+def recall_at_k(ann_ids, gt_ids, k):
+    hits = sum(len(set(a[:k]) & set(g[:k])) for a, g in zip(ann_ids, gt_ids))
+    return hits / (len(gt_ids) * k)
+
+
+def measure_recall(client, collection_name, queries, gt, k, metric, params, nq=100, start_id=0):
+    v_field_name, _, _ = resolve_fields(client, collection_name)
+    search_params = {"metric_type": metric, "params": params}
+    ann_ids = []
+    started = time.perf_counter()
+    for i in range(0, len(queries), nq):
+        res = client.search(collection_name=collection_name, anns_field=v_field_name, limit=k,
+                            data=queries[i:i + nq].tolist(), search_params=search_params)
+        ann_ids += [[hit.id - start_id for hit in hits] for hits in res]
+    elapsed = time.perf_counter() - started
+    return {
+        "params": params,
+        f"recall@{k}": round(recall_at_k(ann_ids, gt, k), 4),
+        "qps": round(len(queries) / elapsed, 2) if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure recall@k of Milvus search against brute-force ground truth.")
+    parser.add_argument("host_name", help="Milvus host")
+    parser.add_argument("collection_name", help="Collection filled from the base file (see ingest.py)")
+    parser.add_argument("--base", required=True, help="Base .fvecs file the collection was loaded from")
+    parser.add_argument("--queries", default=None, help="Query .fvecs file (default: random queries)")
+    parser.add_argument("--num-queries", type=int, default=1000, help="Number of random queries")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for random queries")
+    parser.add_argument("-k", type=int, default=10, help="k of recall@k")
+    parser.add_argument("--metric", choices=METRICS, default="L2")
+    parser.add_argument("--params", type=json.loads, action="append", default=None,
+                        help='Search params to evaluate, repeatable, e.g. --params \'{"ef": 64}\'')
+    parser.add_argument("--nq", type=int, default=100, help="Query vectors per search request")
+    parser.add_argument("--start-id", type=int, default=0, help="Primary key of base row 0")
+    parser.add_argument("-p", "--port", default="19530", help="Milvus port")
+    parser.add_argument("--cache-dir", default=".gt_cache", help="Directory for cached ground truth")
+    parser.add_argument("--workers", type=int, default=None, help="Ground-truth threads (default: all cores)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    args = parser.parse_args()
+    base = read_vecs(args.base)
+    if args.queries:
+        queries = np.ascontiguousarray(read_vecs(args.queries), dtype=np.float32)
+    else:
+        queries = generate_random_queries(args.num_queries, base.shape[1], np.random.default_rng(args.seed))
+
+    gt = ground_truth(args.base, queries, args.k, args.metric, cache_dir=args.cache_dir, workers=args.workers)
+    client = MilvusClient(uri=f"http://{args.host_name}:{args.port}")
+    results = [measure_recall(client, args.collection_name, queries, gt, args.k, args.metric, params,
+                              nq=args.nq, start_id=args.start_id)
+               for params in (args.params or [{}])]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"==> {json.dumps(r['params'])}: recall@{args.k} {r[f'recall@{args.k}']}  ({r['qps']} queries/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,76 +1,238 @@
-import sys
 from pymilvus import MilvusClient, utility
+import argparse
 import json
-import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from jsonpath_rw_ext import parse
+import numpy as np
+
+from vecs import read_vecs
 
 
 
 
 def extract_field_info(data, type_id):
-    # Print the entire data structure to inspect
-    # print(json.dumps(data, indent=2))
+    """Name and dim of the first field of the given type in describe_collection output."""
+    field = next((f for f in data.get("fields", []) if int(f.get("type", -1)) == type_id), None)
+    if field is None:
+        print(f"Warning: no fields with type equals {type_id} in {data.get('collection_name')}")
+        return None, None
+    return field['name'], field.get('params', {}).get('dim', 0)
 
-    # Define the JSONPath expression to filter the field where 'type' == 101
-    jsonpath_expr = parse(f'$.fields[?(@.type=={type_id})]')
 
-    # Use the expression to find the matching field
-    matches = [match.value for match in jsonpath_expr.find(data)]
+def generate_random_queries(count, dim, rng=None):
+    """`count` random float32 vectors in [-1, 1] with no zero components."""
+    rng = rng or np.random.default_rng()
+    queries = rng.uniform(-1, 1, size=(count, dim)).astype(np.float32)
+    zeros = queries == 0
+    while zeros.any():
+        queries[zeros] = rng.uniform(-1, 1, size=int(zeros.sum()))
+        zeros = queries == 0
+    return queries
 
-    # Check if we found a matching field
-    if not matches:
-        print(f"Warning: no fields with type equals {type_id} in {json.dumps(data, indent=2)}")
-        return None, None
 
-    # Assuming the result contains exactly one match, we can extract the 'name' and 'dim'
-    field = matches[0]
-    return field['name'], field['params'].get('dim', 0)
+def generate_random_floats(n):
+    return generate_random_queries(1, n)[0].tolist()
 
 
-def generate_random_floats(n):
-    random_floats = []
-    for _ in range(n):
-        # Generate a random float in the range [-1, 1], excluding 0
-        rand_float = random.uniform(-1, 1)
-        while rand_float == 0:
-            rand_float = random.uniform(-1, 1)
-        random_floats.append(rand_float)
-    return random_floats
+def resolve_fields(client, collection_name):
+    c_desc = client.describe_collection(collection_name=collection_name)
+    v_field_name, dim = extract_field_info(c_desc, 101)
+    content_field_name, _ = extract_field_info(c_desc, 21)
+    return v_field_name, dim, content_field_name
+
+
+def resolve_metric(client, collection_name, field_name, default="L2"):
+    """Metric type the vector field's index was built with."""
+    for index_name in client.list_indexes(collection_name=collection_name, field_name=field_name):
+        metric = client.describe_index(collection_name=collection_name, index_name=index_name).get("metric_type")
+        if metric:
+            return metric
+    return default
+
 
 def search(host_name, collection_name, limit, port="19530", alias="default"):
     # 1. Set up a milvus client
     client = MilvusClient(
-        uri=f"http://{host_name}:19530",
+        uri=f"http://{host_name}:{port}",
         # token="root:Milvus"
     )
 
-    c_desc = client.describe_collection(collection_name=collection_name)
-    v_field_name, dim = extract_field_info(c_desc, 101)
+    v_field_name, dim, content_field_name = resolve_fields(client, collection_name)
 
     print(f"===> ===> {dim}")
-    content_field_name, _ = extract_field_info(c_desc, 21)
     if not v_field_name or not dim:
         exit(1)
     request = generate_random_floats(dim)
     res =  client.search(
-        collection_name=collection_name, 
-        anns_field=v_field_name, 
-        limit=limit, 
-        data=[request], 
-        search_params={"metric_type": "L2"}, 
+        collection_name=collection_name,
+        anns_field=v_field_name,
+        limit=limit,
+        data=[request],
+        search_params={"metric_type": resolve_metric(client, collection_name, v_field_name)},
         output_fields=[content_field_name] if content_field_name else [])
     for hits in res:
         for hit in hits:
             print(hit)
-    
+
+
+def latency_summary(latencies_ms):
+    if not latencies_ms:
+        return {}
+    lat = np.asarray(latencies_ms)
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+    return {
+        "mean_ms": round(float(lat.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(lat.max()), 3),
+    }
+
+
+def run_benchmark(search_batch, batches, duration, concurrency=1, qps=None, warmup=0.0):
+    """Drive `search_batch(batch)` for `duration` seconds and collect latencies.
+
+    Without `qps` this is a closed loop: `concurrency` threads issue requests back to back.
+    With `qps` requests are started on a fixed schedule (open loop) by up to `concurrency`
+    threads, and latency is measured from the scheduled start, so a saturated server shows up
+    as queueing delay instead of a quietly lower request rate.
+    """
+    lock = threading.Lock()
+    latencies, errors = [], []
+    counter = [0]
+
+    def next_batch():
+        with lock:
+            counter[0] += 1
+            return batches[counter[0] % len(batches)]
+
+    def timed(batch, scheduled, record):
+        try:
+            search_batch(batch)
+        except Exception as e:
+            if record:
+                with lock:
+                    errors.append(str(e))
+            return
+        if record:
+            with lock:
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    if qps:
+        interval = 1.0 / qps
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            i = 0
+            while True:
+                scheduled = started + i * interval
+                if scheduled >= deadline:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(timed, next_batch(), scheduled, scheduled >= measure_from)
+                i += 1
+    else:
+        def worker():
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    return
+                timed(next_batch(), now, now >= measure_from)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    elapsed = max(time.perf_counter() - measure_from, 1e-9)
+    nq = len(batches[0])
+    return {
+        "mode": "open_loop" if qps else "closed_loop",
+        "target_qps": qps,
+        "concurrency": concurrency,
+        "nq": nq,
+        "duration_s": round(elapsed, 3),
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "achieved_qps": round(len(latencies) / elapsed, 2),
+        "vectors_per_s": round(len(latencies) * nq / elapsed, 2),
+        **latency_summary(latencies),
+    }
+
+
+def benchmark(host_name, collection_name, limit, port="19530", queries_file=None, pool_size=1000, nq=1,
+              concurrency=1, qps=None, duration=30.0, warmup=2.0, search_params=None, seed=None):
+    client = MilvusClient(uri=f"http://{host_name}:{port}")
+    v_field_name, dim, _ = resolve_fields(client, collection_name)
+    if not v_field_name or not dim:
+        exit(1)
+
+    if queries_file:
+        queries = np.ascontiguousarray(read_vecs(queries_file)[:pool_size], dtype=np.float32)
+    else:
+        queries = generate_random_queries(pool_size, dim, np.random.default_rng(seed))
+    # Pre-build request payloads so the timed loop only calls search
+    batches = [queries[i:i + nq].tolist() for i in range(0, len(queries) - nq + 1, nq)]
+    if not batches:
+        raise ValueError(f"{len(queries)} query vectors are fewer than nq={nq}")
+    search_params = search_params or {"metric_type": resolve_metric(client, collection_name, v_field_name)}
+
+    def search_batch(batch):
+        client.search(collection_name=collection_name, anns_field=v_field_name, limit=limit,
+                      data=batch, search_params=search_params)
+
+    result = run_benchmark(search_batch, batches, duration, concurrency=concurrency, qps=qps, warmup=warmup)
+    result.update(collection=collection_name, limit=limit, search_params=search_params)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a random vector search, or benchmark search latency.")
+    parser.add_argument("host_name", help="Milvus host")
+    parser.add_argument("collection_name", help="Collection name")
+    parser.add_argument("limit", nargs="?", type=int, default=4, help="Top-k (default: 4)")
+    parser.add_argument("-p", "--port", default="19530", help="Milvus port")
+    parser.add_argument("--bench", action="store_true", help="Run the load generator instead of a single search")
+    parser.add_argument("--queries", default=None, help=".fvecs file with query vectors (default: random)")
+    parser.add_argument("--pool-size", type=int, default=1000, help="Number of pre-generated query vectors")
+    parser.add_argument("--nq", type=int, default=1, help="Query vectors per search request")
+    parser.add_argument("-c", "--concurrency", type=int, default=1, help="Concurrent requests")
+    parser.add_argument("--qps", type=float, default=None, help="Target requests/s (open loop)")
+    parser.add_argument("-d", "--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--search-params", type=json.loads, default=None,
+                        help='JSON search params, e.g. \'{"metric_type": "L2", "params": {"ef": 64}}\'')
+    parser.add_argument("--seed", type=int, default=None, help="Seed for random queries")
+    parser.add_argument("--json", action="store_true", help="Print the benchmark result as JSON")
+
+    args = parser.parse_args()
+    if args.nq < 1 or args.pool_size < args.nq:
+        parser.error(f"--pool-size ({args.pool_size}) must be at least --nq ({args.nq}), which must be >= 1")
+    if not args.bench:
+        search(args.host_name, args.collection_name, limit=args.limit, port=args.port)
+        return
+
+    result = benchmark(args.host_name, args.collection_name, args.limit, port=args.port,
+                       queries_file=args.queries, pool_size=args.pool_size, nq=args.nq,
+                       concurrency=args.concurrency, qps=args.qps, duration=args.duration,
+                       warmup=args.warmup, search_params=args.search_params, seed=args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"==> {result['requests']} requests ({result['errors']} errors) in {result['duration_s']}s: "
+          f"{result['achieved_qps']} req/s, {result['vectors_per_s']} vectors/s")
+    if result["requests"]:
+        print(f"==> latency ms: p50 {result['p50_ms']}  p95 {result['p95_ms']}  p99 {result['p99_ms']}  "
+              f"max {result['max_ms']}")
+
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python search.py <collection_name> [limit]")
-        sys.exit(1)
-
-    host_name = sys.argv[1]
-    collection_name = sys.argv[2]
-    limit = sys.argv[3] if len(sys.argv) > 2 else 4
-    search(host_name, collection_name, limit=int(limit))
+    main()
@@ -0,0 +1,338 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from pymilvus import connections, utility, Collection, CollectionSchema, DataType, FieldSchema
+
+from vecs import read_vecs, to_records
+
+# Field types that round-trip; their lower-case names are the `type` values /collection/create accepts
+SCALAR_TYPES = {DataType.BOOL, DataType.INT8, DataType.INT16, DataType.INT32, DataType.INT64, DataType.FLOAT,
+                DataType.DOUBLE, DataType.VARCHAR, DataType.JSON, DataType.ARRAY}
+# Vector type -> vecs file extension (binary vectors are stored as dim / 8 bytes per row)
+VECTOR_FILES = {DataType.FLOAT_VECTOR: ".fvecs", DataType.BINARY_VECTOR: ".bvecs"}
+# Column holding dynamic-field values (JSON text) of collections with enable_dynamic_field
+DYNAMIC_COLUMN = "$meta"
+SCHEMA_FILE = "schema.json"
+
+
+def field_definition(field):
+    """Field as a /collection/create field definition."""
+    if field.dtype not in SCALAR_TYPES and field.dtype not in VECTOR_FILES:
+        raise ValueError(f"Field '{field.name}' has unsupported type {field.dtype.name}")
+    definition = {"name": field.name, "type": field.dtype.name.lower(), "is_primary": field.is_primary,
+                  "auto_id": bool(field.auto_id), "description": field.description}
+    for key in ("dim", "max_length", "max_capacity"):
+        if key in field.params:
+            definition[key] = int(field.params[key])
+    if field.dtype == DataType.ARRAY:
+        definition["element_type"] = DataType(int(field.element_type)).name.lower()
+    return definition
+
+
+def field_schema(definition):
+    kwargs = {k: definition[k] for k in ("dim", "max_length", "max_capacity") if definition.get(k) is not None}
+    if definition.get("element_type"):
+        kwargs["element_type"] = DataType[definition["element_type"].upper()]
+    return FieldSchema(name=definition["name"], dtype=DataType[definition["type"].upper()],
+                       is_primary=bool(definition.get("is_primary")), auto_id=bool(definition.get("auto_id")),
+                       description=definition.get("description", ""), **kwargs)
+
+
+def is_vector(definition):
+    return DataType[definition["type"].upper()] in VECTOR_FILES
+
+
+def vector_file(part_dir, definition):
+    return os.path.join(part_dir, definition["name"] + VECTOR_FILES[DataType[definition["type"].upper()]])
+
+
+def vector_block(definition, values):
+    """Query results of a vector field as an (n, dim) array in vecs element layout."""
+    if DataType[definition["type"].upper()] == DataType.BINARY_VECTOR:
+        # Binary vectors come back as bytes (or a one-element list of bytes) per row
+        rows = [v[0] if isinstance(v, list) else v for v in values]
+        return np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), definition["dim"] // 8)
+    return np.asarray(values, dtype=np.float32)
+
+
+def arrow_type(definition):
+    import pyarrow as pa
+    types = {"bool": pa.bool_(), "int8": pa.int8(), "int16": pa.int16(), "int32": pa.int32(), "int64": pa.int64(),
+             "float": pa.float32(), "double": pa.float64(), "varchar": pa.string(), "json": pa.string()}
+    if definition["type"] == "array":
+        return pa.list_(types[definition["element_type"]])
+    return types[definition["type"]]
+
+
+class JsonlWriter:
+    def __init__(self, path, definitions, dynamic):
+        self.f = open(path, "w")
+
+    def write(self, rows):
+        self.f.writelines(json.dumps(row) + "\n" for row in rows)
+
+    def close(self):
+        self.f.close()
+
+
+class ParquetWriter:
+    """Writes each batch as a Parquet row group; JSON and dynamic fields are stored as JSON text."""
+
+    def __init__(self, path, definitions, dynamic):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.json_columns = [d["name"] for d in definitions if d["type"] == "json"]
+        columns = [pa.field(d["name"], arrow_type(d)) for d in definitions]
+        if dynamic:
+            columns.append(pa.field(DYNAMIC_COLUMN, pa.string()))
+            self.json_columns.append(DYNAMIC_COLUMN)
+        self.schema = pa.schema(columns)
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        for row in rows:
+            for name in self.json_columns:
+                row[name] = json.dumps(row[name])
+        self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+SCALAR_WRITERS = {"parquet": (ParquetWriter, "scalars.parquet"), "jsonl": (JsonlWriter, "scalars.jsonl")}
+
+
+def read_scalar_batches(part_dir, batch_size):
+    """Scalar columns (name -> values) of an exported partition, `batch_size` rows at a time, in
+    export order, and whether JSON values are stored as text."""
+    path = os.path.join(part_dir, "scalars.parquet")
+    if os.path.exists(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pydict(), True
+        return
+
+    def columns(rows):
+        return {name: [row[name] for row in rows] for name in rows[0]}
+
+    with open(os.path.join(part_dir, "scalars.jsonl")) as f:
+        rows = []
+        for line in f:
+            rows.append(json.loads(line))
+            if len(rows) == batch_size:
+                yield columns(rows), False
+                rows = []
+        if rows:
+            yield columns(rows), False
+
+
+def connect(host_name, port):
+    alias = f"snapshot-{os.getpid()}"
+    connections.connect(alias=alias, host=host_name, port=port)
+    return alias
+
+
+def export_partition(host_name, port, collection_name, partition, part_dir, definitions, dynamic, batch_size,
+                     scalar_format):
+    """Stream one partition to disk; runs in a worker process. Memory is bounded by one batch."""
+    alias = connect(host_name, port)
+    os.makedirs(part_dir, exist_ok=True)
+    vectors = [d for d in definitions if is_vector(d)]
+    scalars = [d for d in definitions if not is_vector(d)]
+    writer_class, scalar_file = SCALAR_WRITERS[scalar_format]
+    scalar_writer = writer_class(os.path.join(part_dir, scalar_file), scalars, dynamic)
+    vector_files = {d["name"]: open(vector_file(part_dir, d), "wb") for d in vectors}
+    known = {d["name"] for d in definitions}
+    rows = 0
+    try:
+        iterator = Collection(collection_name, using=alias).query_iterator(
+            batch_size=batch_size, expr="", output_fields=["*"], partition_names=[partition])
+        while True:
+            batch = iterator.next()
+            if not batch:
+                iterator.close()
+                break
+            for d in vectors:
+                kind = VECTOR_FILES[DataType[d["type"].upper()]]
+                to_records(vector_block(d, [row[d["name"]] for row in batch]), kind).tofile(vector_files[d["name"]])
+            scalar_rows = []
+            for row in batch:
+                out = {d["name"]: row[d["name"]] for d in scalars}
+                if dynamic:
+                    out[DYNAMIC_COLUMN] = {k: v for k, v in row.items() if k not in known}
+                scalar_rows.append(out)
+            scalar_writer.write(scalar_rows)
+            rows += len(batch)
+    finally:
+        scalar_writer.close()
+        for f in vector_files.values():
+            f.close()
+        connections.disconnect(alias)
+    return partition, rows
+
+
+def export_collection(host_name, collection_name, out_dir, port="19530", batch_size=5000, workers=4,
+                      scalar_format="parquet"):
+    started = time.perf_counter()
+    alias = connect(host_name, port)
+    try:
+        collection = Collection(collection_name, using=alias)
+        schema = collection.schema
+        definitions = [field_definition(f) for f in schema.fields]
+        partitions = [p.name for p in collection.partitions]
+        indexes = [{"field_name": i.field_name, "index_name": i.index_name, "params": i.params}
+                   for i in collection.indexes]
+    finally:
+        connections.disconnect(alias)
+
+    os.makedirs(out_dir, exist_ok=True)
+    dynamic = bool(schema.enable_dynamic_field)
+    dirs = {p: os.path.join(out_dir, f"p{i:04d}") for i, p in enumerate(partitions)}
+    print(f"Exporting '{collection_name}' ({len(partitions)} partitions) to '{out_dir}' with {workers} workers")
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(partitions)))) as executor:
+        futures = [executor.submit(export_partition, host_name, port, collection_name, p, dirs[p], definitions,
+                                   dynamic, batch_size, scalar_format) for p in partitions]
+        counts = dict(f.result() for f in futures)
+
+    # Written last: a snapshot without schema.json is incomplete
+    snapshot = {
+        "name": collection_name,
+        "description": schema.description,
+        "fields": definitions,
+        "enable_dynamic_field": dynamic,
+        "partitions": [{"name": p, "dir": os.path.basename(dirs[p]), "rows": counts[p]} for p in partitions],
+        "indexes": indexes,
+        "scalar_format": scalar_format,
+    }
+    with open(os.path.join(out_dir, SCHEMA_FILE), "w") as f:
+        json.dump(snapshot, f, indent=2)
+    rows = sum(counts.values())
+    elapsed = time.perf_counter() - started
+    print(f"✅ Exported {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+    return rows
+
+
+def vector_column(vecs):
+    """A batch of vectors as an insert column: bytes per row for binary vectors, float lists otherwise."""
+    if vecs.dtype == np.uint8:
+        return [row.tobytes() for row in vecs]
+    return vecs.astype(np.float32, copy=False).tolist()
+
+
+def import_partition(host_name, port, collection_name, partition, part_dir, definitions, batch_size):
+    """Insert one exported partition; runs in a worker process.
+
+    Batches are inserted column by column, in schema order. A batch that carries dynamic field
+    values goes in row by row: column inserts have no place for them.
+    """
+    alias = connect(host_name, port)
+    collection = Collection(collection_name, using=alias)
+    vectors = {d["name"]: read_vecs(vector_file(part_dir, d)) for d in definitions if is_vector(d)}
+    # auto_id keys are assigned again by the target collection
+    names = [d["name"] for d in definitions if not (d.get("is_primary") and d.get("auto_id"))]
+    json_columns = {d["name"] for d in definitions if d["type"] == "json"} | {DYNAMIC_COLUMN}
+    offset = 0
+    try:
+        for scalars, json_as_text in read_scalar_batches(part_dir, batch_size):
+            if json_as_text:
+                for name in json_columns & scalars.keys():
+                    scalars[name] = [json.loads(v) for v in scalars[name]]
+            n = len(next(iter(scalars.values()))) if scalars else 0
+            for name, vecs in vectors.items():
+                scalars[name] = vector_column(vecs[offset:offset + n])
+            columns = [scalars[name] for name in names]
+            dynamic = scalars.get(DYNAMIC_COLUMN) or []
+            if any(dynamic):
+                rows = [dict(zip(names, values)) for values in zip(*columns)]
+                for row, extra in zip(rows, dynamic):
+                    row.update(extra or {})
+                collection.insert(rows, partition_name=partition)
+            else:
+                collection.insert(columns, partition_name=partition)
+            offset += n
+    finally:
+        connections.disconnect(alias)
+    return partition, offset
+
+
+def import_collection(host_name, in_dir, port="19530", collection_name=None, batch_size=5000, workers=4,
+                      create_indexes=True):
+    started = time.perf_counter()
+    with open(os.path.join(in_dir, SCHEMA_FILE)) as f:
+        snapshot = json.load(f)
+    collection_name = collection_name or snapshot["name"]
+    definitions = snapshot["fields"]
+
+    alias = connect(host_name, port)
+    try:
+        if utility.has_collection(collection_name, using=alias):
+            raise ValueError(f"Collection '{collection_name}' already exists on {host_name}")
+        schema = CollectionSchema(fields=[field_schema(d) for d in definitions],
+                                  description=snapshot.get("description", ""),
+                                  enable_dynamic_field=snapshot.get("enable_dynamic_field", False))
+        collection = Collection(name=collection_name, schema=schema, using=alias)
+        for p in snapshot["partitions"]:
+            if not collection.has_partition(p["name"]):
+                collection.create_partition(p["name"])
+    finally:
+        connections.disconnect(alias)
+
+    partitions = snapshot["partitions"]
+    print(f"Importing {sum(p['rows'] for p in partitions)} rows into '{collection_name}' with {workers} workers")
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(partitions)))) as executor:
+        futures = [executor.submit(import_partition, host_name, port, collection_name, p["name"],
+                                   os.path.join(in_dir, p["dir"]), definitions, batch_size) for p in partitions]
+        rows = sum(f.result()[1] for f in futures)
+
+    alias = connect(host_name, port)
+    try:
+        collection = Collection(collection_name, using=alias)
+        collection.flush()
+        if create_indexes:
+            for index in snapshot.get("indexes", []):
+                collection.create_index(index["field_name"], index["params"], index_name=index["index_name"])
+    finally:
+        connections.disconnect(alias)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Imported {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a collection to disk or import it into a cluster.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    exp = sub.add_parser("export", help="Stream a collection (which must be loaded) to a directory")
+    exp.add_argument("host_name", help="Milvus host")
+    exp.add_argument("collection_name", help="Collection to export")
+    exp.add_argument("out_dir", help="Output directory")
+    exp.add_argument("--scalar-format", choices=sorted(SCALAR_WRITERS), default="parquet",
+                     help="File format of scalar fields (parquet needs pyarrow)")
+
+    imp = sub.add_parser("import", help="Create a collection from an exported directory and insert its rows")
+    imp.add_argument("host_name", help="Milvus host")
+    imp.add_argument("in_dir", help="Directory written by export")
+    imp.add_argument("-c", "--collection", default=None, help="Target collection name (default: exported name)")
+    imp.add_argument("--no-index", action="store_true", help="Don't recreate the exported indexes")
+
+    for p in (exp, imp):
+        p.add_argument("-p", "--port", default="19530", help="Milvus port")
+        p.add_argument("-b", "--batch-size", type=int, default=5000, help="Rows per query/insert batch")
+        p.add_argument("-w", "--workers", type=int, default=4, help="Partitions processed in parallel")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export_collection(args.host_name, args.collection_name, args.out_dir, port=args.port,
+                          batch_size=args.batch_size, workers=args.workers, scalar_format=args.scalar_format)
+    else:
+        import_collection(args.host_name, args.in_dir, port=args.port, collection_name=args.collection,
+                          batch_size=args.batch_size, workers=args.workers, create_indexes=not args.no_index)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+from pymilvus import MilvusClient, connections, utility
+
+from recall import dataset_hash, ground_truth, measure_recall
+from search import generate_random_queries, resolve_fields, run_benchmark
+from vecs import read_vecs
+
+# Objectives of the Pareto frontier: +1 = higher is better, -1 = lower is better
+OBJECTIVES = {"recall": 1, "qps": 1, "build_s": -1, "memory_bytes": -1}
+CSV_COLUMNS = ["index_type", "metric_type", "build_params", "search_params", "recall", "qps", "p50_ms",
+               "p99_ms", "build_s", "load_s", "memory_bytes", "segments", "pareto"]
+
+
+def expand(params):
+    """Cartesian product of a {name: value or [values]} dict."""
+    names = list(params)
+    values = [v if isinstance(v, list) else [v] for v in params.values()]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def build_configs(grid):
+    """Expand grid entries into (build config, [search params]) pairs.
+
+    Each entry looks like
+    {"index_type": "HNSW", "metric_type": "L2", "build": {"M": [8, 16]}, "search": {"ef": [32, 64]}}.
+    """
+    for entry in grid:
+        searches = expand(entry.get("search", {}))
+        for build in expand(entry.get("build", {})):
+            yield {"index_type": entry["index_type"], "metric_type": entry.get("metric_type", "L2"),
+                   "params": build}, searches
+
+
+def config_key(collection_name, dataset, k, build, search_params):
+    raw = json.dumps([collection_name, dataset, k, build, search_params], sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def load_results(path):
+    results = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    r = json.loads(line)
+                    results[r["key"]] = r
+    return results
+
+
+def append_result(path, result):
+    with open(path, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+
+def rebuild_index(client, alias, collection_name, field_name, build, poll_interval=2.0, timeout=None):
+    """Replace the vector index with `build` and wait until every row is indexed; returns seconds."""
+    client.release_collection(collection_name=collection_name)
+    for index_name in client.list_indexes(collection_name=collection_name, field_name=field_name):
+        client.drop_index(collection_name=collection_name, index_name=index_name)
+
+    index_params = client.prepare_index_params()
+    index_params.add_index(field_name=field_name, index_name=field_name, index_type=build["index_type"],
+                           metric_type=build["metric_type"], params=build["params"])
+    started = time.perf_counter()
+    client.create_index(collection_name=collection_name, index_params=index_params, sync=False)
+    while True:
+        progress = utility.index_building_progress(collection_name, index_name=field_name, using=alias)
+        if progress["state"] == "Failed":
+            raise RuntimeError(f"Index build failed for {build}")
+        if progress["state"] == "Finished" and not progress.get("pending_index_rows"):
+            return time.perf_counter() - started
+        if timeout and time.perf_counter() - started > timeout:
+            raise TimeoutError(f"Index build did not finish in {timeout}s ({progress})")
+        print(f"  indexed {progress['indexed_rows']}/{progress['total_rows']} rows")
+        time.sleep(poll_interval)
+
+
+def segment_memory(alias, collection_name):
+    """Total in-memory size and count of the loaded segments."""
+    segments = utility.get_query_segment_info(collection_name, using=alias)
+    return sum(s.mem_size for s in segments), len(segments)
+
+
+def dominates(a, b):
+    better = False
+    for name, sign in OBJECTIVES.items():
+        if a[name] is None or b[name] is None:
+            continue
+        if sign * a[name] < sign * b[name]:
+            return False
+        if sign * a[name] > sign * b[name]:
+            better = True
+    return better
+
+
+def pareto_frontier(results):
+    return [r for r in results if not any(dominates(other, r) for other in results if other is not r)]
+
+
+def write_csv(path, results):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for r in results:
+            writer.writerow({**r, "build_params": json.dumps(r["build_params"]),
+                             "search_params": json.dumps(r["search_params"])})
+
+
+def sweep(host_name, collection_name, grid, base_path, port="19530", queries_file=None, num_queries=1000,
+          seed=0, k=10, nq=10, concurrency=4, duration=10.0, start_id=0, results_path="sweep_results.jsonl",
+          cache_dir=".gt_cache", build_timeout=None):
+    client = MilvusClient(uri=f"http://{host_name}:{port}")
+    alias = "sweep"
+    connections.connect(alias=alias, host=host_name, port=port)
+    v_field_name, dim, _ = resolve_fields(client, collection_name)
+    if queries_file:
+        queries = np.ascontiguousarray(read_vecs(queries_file), dtype=np.float32)
+    else:
+        queries = generate_random_queries(num_queries, dim, np.random.default_rng(seed))
+    batches = [queries[i:i + nq].tolist() for i in range(0, len(queries) - nq + 1, nq)]
+    dataset = dataset_hash(base_path, queries, k, "")
+
+    done = load_results(results_path)
+    measured = []
+    try:
+        for build, searches in build_configs(grid):
+            keys = [config_key(collection_name, dataset, k, build, s) for s in searches]
+            if all(key in done for key in keys):
+                print(f"==> Skipping {build['index_type']} {json.dumps(build['params'])}: already measured")
+                measured += [done[key] for key in keys]
+                continue
+
+            print(f"==> Building {build['index_type']} {json.dumps(build['params'])}")
+            build_s = rebuild_index(client, alias, collection_name, v_field_name, build, timeout=build_timeout)
+            started = time.perf_counter()
+            client.load_collection(collection_name=collection_name)
+            load_s = time.perf_counter() - started
+            memory_bytes, segments = segment_memory(alias, collection_name)
+            gt = ground_truth(base_path, queries, k, build["metric_type"], cache_dir=cache_dir)
+
+            for params, key in zip(searches, keys):
+                if key in done:
+                    measured.append(done[key])
+                    continue
+                search_params = {"metric_type": build["metric_type"], "params": params}
+                quality = measure_recall(client, collection_name, queries, gt, k, build["metric_type"], params,
+                                         nq=nq, start_id=start_id)
+
+                def search_batch(batch):
+                    client.search(collection_name=collection_name, anns_field=v_field_name, limit=k,
+                                  data=batch, search_params=search_params)
+
+                bench = run_benchmark(search_batch, batches, duration, concurrency=concurrency, warmup=1.0)
+                result = {
+                    "key": key,
+                    "collection": collection_name,
+                    "index_type": build["index_type"],
+                    "metric_type": build["metric_type"],
+                    "build_params": build["params"],
+                    "search_params": params,
+                    "recall": quality[f"recall@{k}"],
+                    "qps": bench["achieved_qps"],
+                    "p50_ms": bench.get("p50_ms"),
+                    "p99_ms": bench.get("p99_ms"),
+                    "build_s": round(build_s, 3),
+                    "load_s": round(load_s, 3),
+                    "memory_bytes": memory_bytes,
+                    "segments": segments,
+                }
+                print(f"  {json.dumps(params)}: recall@{k} {result['recall']}, {result['qps']} req/s, "
+                      f"p99 {result['p99_ms']} ms")
+                append_result(results_path, result)
+                done[key] = result
+                measured.append(result)
+    finally:
+        connections.disconnect(alias)
+
+    frontier = pareto_frontier(measured)
+    for r in measured:
+        r["pareto"] = any(r is f for f in frontier)
+    return measured, frontier
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sweep index build/search parameters and report the recall/QPS/build time/memory Pareto frontier.")
+    parser.add_argument("host_name", help="Milvus host")
+    parser.add_argument("collection_name", help="Collection filled from the base file (see ingest.py)")
+    parser.add_argument("grid", help="JSON file with a list of {index_type, metric_type, build, search} grids")
+    parser.add_argument("--base", required=True, help="Base .fvecs file the collection was loaded from")
+    parser.add_argument("-p", "--port", default="19530", help="Milvus port")
+    parser.add_argument("--queries", default=None, help="Query .fvecs file (default: random queries)")
+    parser.add_argument("--num-queries", type=int, default=1000, help="Number of random queries")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for random queries")
+    parser.add_argument("-k", type=int, default=10, help="Top-k searched and k of recall@k")
+    parser.add_argument("--nq", type=int, default=10, help="Query vectors per search request")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Concurrent requests for the QPS run")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Seconds of QPS measurement per config")
+    parser.add_argument("--start-id", type=int, default=0, help="Primary key of base row 0")
+    parser.add_argument("--results", default="sweep_results.jsonl",
+                        help="Per-configuration result cache; re-run with the same file to resume")
+    parser.add_argument("--cache-dir", default=".gt_cache", help="Directory for cached ground truth")
+    parser.add_argument("--build-timeout", type=float, default=None, help="Give up on an index build after N seconds")
+    parser.add_argument("-o", "--output", default="sweep", help="Prefix of the .json/.csv reports")
+
+    args = parser.parse_args()
+    with open(args.grid) as f:
+        grid = json.load(f)
+    results, frontier = sweep(args.host_name, args.collection_name, grid, args.base, port=args.port,
+                              queries_file=args.queries, num_queries=args.num_queries, seed=args.seed, k=args.k,
+                              nq=args.nq, concurrency=args.concurrency, duration=args.duration,
+                              start_id=args.start_id, results_path=args.results, cache_dir=args.cache_dir,
+                              build_timeout=args.build_timeout)
+
+    with open(f"{args.output}.json", "w") as f:
+        json.dump({"results": results, "pareto": frontier}, f, indent=2)
+    write_csv(f"{args.output}.csv", results)
+    print(f"==> {len(results)} configurations, {len(frontier)} on the Pareto frontier; "
+          f"wrote {args.output}.json and {args.output}.csv")
+    for r in sorted(frontier, key=lambda r: -r["recall"]):
+        print(f"  {r['index_type']} {json.dumps(r['build_params'])} {json.dumps(r['search_params'])}: "
+              f"recall {r['recall']}, {r['qps']} req/s, build {r['build_s']}s, {r['memory_bytes'] / 1024 ** 2:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+
+# Element type of each TEXMEX vector format; every record is an int32 dimension + `dim` elements
+VECS_ELEMENT_TYPES = {
+    ".fvecs": "<f4",
+    ".ivecs": "<i4",
+    ".bvecs": "u1",
+}
+
+
+def vecs_kind(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in VECS_ELEMENT_TYPES:
+        raise ValueError(f"Unsupported vector file '{path}'; expected one of {', '.join(VECS_ELEMENT_TYPES)}")
+    return ext
+
+
+def vecs_dtype(dim, kind=".fvecs"):
+    """Structured dtype of one record: int32 dimension followed by `dim` elements."""
+    return np.dtype([("dim", "<i4"), ("vec", VECS_ELEMENT_TYPES[kind], (dim,))])
+
+
+def read_vecs(path, mode="r"):
+    """Memory-map a .fvecs/.ivecs/.bvecs file and return an (n, dim) view of its vectors.
+
+    Nothing is read up front: the view is strided over the file (skipping the per-record
+    headers), so slicing it only touches the pages that are used.
+    """
+    kind = vecs_kind(path)
+    size = os.path.getsize(path)
+    if size == 0:
+        return np.empty((0, 0), dtype=VECS_ELEMENT_TYPES[kind])
+    dim = int(np.fromfile(path, dtype="<i4", count=1)[0])
+    record = vecs_dtype(dim, kind)
+    if dim <= 0 or size % record.itemsize:
+        raise ValueError(f"'{path}' is not a valid {kind} file (dim {dim}, {size} bytes)")
+    records = np.memmap(path, dtype=record, mode=mode)
+    if records["dim"][-1] != dim:
+        raise ValueError(f"'{path}' has inconsistent record dimensions")
+    return records["vec"]
+
+
+def to_records(vectors, kind=".fvecs"):
+    """Records (dimension header + vector) of an (n, dim) array, ready to be written to a vecs file."""
+    vectors = np.asarray(vectors)
+    records = np.empty(len(vectors), dtype=vecs_dtype(vectors.shape[1], kind))
+    records["dim"] = vectors.shape[1]
+    records["vec"] = vectors
+    return records
+
+
+def write_vecs(path, vectors):
+    """Write an (n, dim) array as .fvecs/.ivecs/.bvecs (chosen by the file extension)."""
+    to_records(vectors, vecs_kind(path)).tofile(path)